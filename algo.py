@@ -1,10 +1,27 @@
-from uiobjects import Node, Weight
+import heapq
+from collections import deque
+from typing import Iterator
+from graph import GraphNode, GraphWeight
+
+# NumPy is optional, and only used to compute heuristics for all nodes in one batch
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class Path:
-    """ Object to store a path and all related information """
+    """
+    Object to store a path and all related information.
+
+    Paths are persistent and linked to their parent path, such that extending a path
+    only stores the new node and weight. The full lists of nodes and weights are
+    materialized on demand.
+    """
 
-    def __init__(self, new_node: Node, new_weight: Weight = None, prev_path=None, heu_length: float = None):
+    __slots__ = ("curr_node", "curr_weight", "prev_path", "length", "heu_length")
+
+    def __init__(self, new_node: GraphNode, new_weight: GraphWeight = None, prev_path=None, heu_length: float = None):
         """
         Initialize an instance of the Path class.
 
@@ -14,22 +31,15 @@ class Path:
         :param heu_length: Heuristic distance to target (if any)
         """
 
-        # Initialize based on parent path if exists
-        if prev_path:
-            self.nodes = prev_path.nodes[:]
-            self.weights = prev_path.weights[:]
-            self.length = prev_path.length
-        else:
-            self.nodes = []
-            self.weights = []
-            self.length = 0
-
         self.curr_node = new_node
-        self.nodes.append(new_node)
+        self.curr_weight = new_weight
+        self.prev_path = prev_path
 
-        # Add new weight and calculate length if exists
+        # Initialize length based on parent path if exists
+        self.length = prev_path.length if prev_path else 0
+
+        # Add length of new weight if exists
         if new_weight is not None:
-            self.weights.append(new_weight)
             self.length += int(new_weight.length)
 
         # Save heuristic distance if exists
@@ -37,24 +47,41 @@ class Path:
         if heu_length:
             self.heu_length = heu_length
 
-    def length_to_node(self, search_node: Node) -> int | None:
+    def iter_paths(self):
+        """
+        Iterate this path and all of its parent paths, from the last node to the first.
+
+        :return: Generator of paths
+        """
+
+        path = self
+        while path is not None:
+            yield path
+            path = path.prev_path
+
+    @property
+    def nodes(self) -> list[GraphNode]:
         """
-        Calculate length from nodes[0] to given node.
+        Nodes in the path, from first to last.
 
-        :param search_node: Node to find length to
-        :return: Length to node or None
+        :return: List of nodes
         """
 
-        n = 0
+        nodes = [path.curr_node for path in self.iter_paths()]
+        nodes.reverse()
+        return nodes
 
-        if search_node == self.nodes[0]:
-            return 0
+    @property
+    def weights(self) -> list[GraphWeight]:
+        """
+        Weights in the path, from first to last.
 
-        for i in range(1, len(self.nodes)):
-            n += int(self.weights[i - 1].length)
+        :return: List of weights
+        """
 
-            if self.nodes[i] == search_node:
-                return n
+        weights = [path.curr_weight for path in self.iter_paths() if path.curr_weight is not None]
+        weights.reverse()
+        return weights
 
     @property
     def estimated_length(self) -> float:
@@ -67,10 +94,441 @@ class Path:
         return self.length + self.heu_length
 
 
+def find_solution(recording: list[Path]) -> Path | None:
+    """
+    Find the fastest path to the end node in a recording.
+
+    :param recording: Recording from a solver
+    :return: Fastest path to the end node or None
+    """
+
+    end_paths = [path for path in recording if path.curr_node.is_end]
+
+    if end_paths:
+        return min(end_paths, key=lambda path: path.length)
+
+    return None
+
+
+class PathQueue:
+    """
+    Priority queue of candidate paths, backed by a binary heap.
+
+    A candidate is stored as the node and weight (by index) extending a parent path,
+    such that Path objects are only created for candidates that are popped.
+    Candidates are popped in order of lowest key. Among candidates with equal keys,
+    the most recently pushed candidate is popped first.
+    """
+
+    def __init__(self):
+        """ Initialize an instance of the PathQueue class. """
+
+        self.heap = []
+
+        # Counter breaks ties between equal keys, and keeps paths from being compared
+        self.counter = 0
+
+    def __len__(self) -> int:
+        """
+        Get the number of queued candidates.
+
+        :return: Number of queued candidates
+        """
+
+        return len(self.heap)
+
+    def push(self, key: float, node: int, weight: int, prev_path: Path) -> None:
+        """
+        Push a candidate to the queue.
+
+        :param key: Priority of the candidate (lowest first)
+        :param node: Index of the node added to the path
+        :param weight: Index of the weight added to the path
+        :param prev_path: Path to extend
+        :return: None
+        """
+
+        self.counter += 1
+        heapq.heappush(self.heap, (key, -self.counter, node, weight, prev_path))
+
+    def pop(self) -> tuple[float, int, int, Path]:
+        """
+        Pop the candidate with the lowest key from the queue.
+
+        :return: Key, node index, weight index and parent path of the candidate
+        """
+
+        key, _, node, weight, prev_path = heapq.heappop(self.heap)
+        return key, node, weight, prev_path
+
+    def peek(self) -> float:
+        """
+        Get the lowest key in the queue, without popping.
+
+        :return: Lowest key
+        """
+
+        return self.heap[0][0]
+
+    def clear(self) -> None:
+        """
+        Remove all candidates from the queue.
+
+        :return: None
+        """
+
+        self.heap.clear()
+        self.counter = 0
+
+
+class CompiledGraph:
+    """
+    Snapshot of a graph compiled to integer-indexed arrays in compressed sparse row (CSR) form.
+
+    Nodes and weights are identified by their index in nodes and weights.
+    The neighbours of node i are stored at positions offsets[i] to offsets[i + 1] in the arrays:
+        targets: Index of the neighbouring node
+        lengths: Length of the weight to the neighbour
+        edges: Index of the weight to the neighbour
+    The order of neighbours follows the order of the weights of each node.
+    """
+
+    __slots__ = ("nodes", "weights", "index", "offsets", "targets", "lengths", "edges", "xs", "ys")
+
+    def __init__(self, nodes: list[GraphNode], weights: list[GraphWeight]):
+        """
+        Initialize an instance of the CompiledGraph class, compiling the given graph.
+
+        :param nodes: Nodes in graph
+        :param weights: Weights in graph
+        """
+
+        self.nodes = list(nodes)
+        self.weights = list(weights)
+
+        # Map nodes and weights to their indices
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        weight_index = {weight: i for i, weight in enumerate(self.weights)}
+
+        self.offsets = [0]
+        self.targets = []
+        self.lengths = []
+        self.edges = []
+
+        for node in self.nodes:
+            for weight in node.weights:
+                self.targets.append(self.index[weight.get_other_node(node)])
+                self.lengths.append(int(weight.length))
+                self.edges.append(weight_index[weight])
+
+            self.offsets.append(len(self.targets))
+
+        # Coordinates of nodes, used by heuristics
+        self.xs = [node.pos[0] for node in self.nodes]
+        self.ys = [node.pos[1] for node in self.nodes]
+
+    @classmethod
+    def from_arrays(cls, offsets: list[int], targets: list[int], lengths: list[int], edges: list[int],
+                    xs: list[float], ys: list[float]):
+        """
+        Create a compiled graph directly from its arrays, without node and weight objects.
+        Nodes and weights are then represented by their indices.
+
+        :param offsets: Start of the neighbours of each node in the other arrays
+        :param targets: Index of the neighbouring node
+        :param lengths: Length of the weight to the neighbour
+        :param edges: Index of the weight to the neighbour
+        :param xs: Horizontal coordinate of each node
+        :param ys: Vertical coordinate of each node
+        :return: Compiled graph
+        """
+
+        graph = cls.__new__(cls)
+        graph.nodes = range(len(offsets) - 1)
+        graph.weights = range(max(edges, default=-1) + 1)
+        graph.index = graph.nodes
+        graph.offsets = offsets
+        graph.targets = targets
+        graph.lengths = lengths
+        graph.edges = edges
+        graph.xs = xs
+        graph.ys = ys
+        return graph
+
+    def detached(self):
+        """
+        Copy of the compiled graph without references to node and weight objects.
+        Can be sent to other processes, unlike graphs referencing UI-objects.
+
+        :return: Detached compiled graph
+        """
+
+        graph = CompiledGraph.from_arrays(self.offsets, self.targets, self.lengths, self.edges, self.xs, self.ys)
+        graph.weights = range(len(self.weights))
+        return graph
+
+    def same_structure(self, other) -> bool:
+        """
+        Check whether another compiled graph has identical nodes, weights and lengths (by index).
+        Used to reuse preprocessed data between runs on an unchanged graph.
+
+        :param other: Compiled graph to compare with
+        :return: Whether the graphs are identical
+        """
+
+        return (
+            self.offsets == other.offsets
+            and self.targets == other.targets
+            and self.lengths == other.lengths
+            and self.edges == other.edges
+        )
+
+
+def shortest_lengths(graph: CompiledGraph, source: int) -> list[int | None]:
+    """
+    Find the lengths of the fastest paths from a node to all nodes in a compiled graph (Dijkstra).
+
+    :param graph: Compiled graph
+    :param source: Index of the node to search from
+    :return: Length to each node (by index), None if unreachable
+    """
+
+    lengths = [None] * len(graph.nodes)
+    lengths[source] = 0
+    queue = [(0, source)]
+
+    while queue:
+        length, node = heapq.heappop(queue)
+
+        if length > lengths[node]:
+            continue
+
+        for i in range(graph.offsets[node], graph.offsets[node + 1]):
+            other = graph.targets[i]
+            new_length = length + graph.lengths[i]
+
+            if lengths[other] is None or new_length < lengths[other]:
+                lengths[other] = new_length
+                heapq.heappush(queue, (new_length, other))
+
+    return lengths
+
+
+def shortest_path(graph: CompiledGraph, start: int, end: int) -> tuple[int | None, list[int], int]:
+    """
+    Find the fastest path between two nodes in a compiled graph (Dijkstra), without node and weight objects.
+    Explores the graph in the same order as Dijkstra.stream, such that the number of steps is the same.
+
+    :param graph: Compiled graph
+    :param start: Index of the start node
+    :param end: Index of the end node
+    :return: Length of the path (None if unreachable), nodes in the path (by index) and number of paths explored
+    """
+
+    # lengths stores the fastest path length to each settled node, parents the node it was reached from
+    lengths = [None] * len(graph.nodes)
+    parents = [None] * len(graph.nodes)
+    lengths[start] = 0
+
+    # Among candidates of equal length, the most recently pushed is popped first (see PathQueue)
+    queue = []
+    counter = 0
+    steps = 0
+    node, length = start, 0
+
+    while True:
+        for i in range(graph.offsets[node], graph.offsets[node + 1]):
+            other = graph.targets[i]
+            new_length = length + graph.lengths[i]
+
+            if lengths[other] is None or new_length < lengths[other]:
+                counter += 1
+                heapq.heappush(queue, (new_length, -counter, other, node))
+
+        # Select the next node to settle, discarding paths longer than the known path
+        while lengths[end] is None and queue:
+            length, _, node, parent = heapq.heappop(queue)
+            steps += 1
+
+            if lengths[node] is None or length < lengths[node]:
+                lengths[node] = length
+                parents[node] = parent
+                break
+        else:
+            break
+
+    path = []
+
+    if lengths[end] is not None:
+        node = end
+        while node is not None:
+            path.append(node)
+            node = parents[node]
+        path.reverse()
+
+    return lengths[end], path, steps
+
+
+def euclidean_estimates(xs: list[float], ys: list[float], target: int, scale: float) -> list[float]:
+    """
+    Compute the straight-line distance from every node to a target node in one batch.
+
+    :param xs: Horizontal coordinate of each node
+    :param ys: Vertical coordinate of each node
+    :param target: Index of the target node
+    :param scale: Divisor converting coordinates to lengths
+    :return: Scaled distance from each node (by index) to the target
+    """
+
+    if numpy is not None:
+        diff_x = numpy.asarray(xs, dtype=float) - xs[target]
+        diff_y = numpy.asarray(ys, dtype=float) - ys[target]
+        return (numpy.sqrt(diff_x * diff_x + diff_y * diff_y) / scale).tolist()
+
+    target_x = xs[target]
+    target_y = ys[target]
+    return [(((x - target_x) ** 2 + (y - target_y) ** 2) ** 0.5) / scale for x, y in zip(xs, ys)]
+
+
+class Landmarks:
+    """
+    Landmark distance tables for the ALT (A-Star, Landmarks, Triangle inequality) heuristic.
+
+    For any landmark L, the triangle inequality gives |d(L, t) - d(L, v)| <= d(v, t).
+    Taking the largest bound over a few well-spread landmarks gives an admissible and consistent estimate,
+    which is usually much tighter than a geometric one.
+
+    Estimates to a target are computed for all nodes in one batch (vectorized if NumPy is installed),
+    and kept for the most recently used targets, such that searches only look them up.
+
+    Attributes:
+        count: Default number of landmarks
+        cache_size: Number of targets to keep estimates for
+    """
+
+    count = 8
+    cache_size = 16
+
+    def __init__(self, graph: CompiledGraph, count: int = None):
+        """
+        Initialize an instance of the Landmarks class, selecting landmarks and computing their tables.
+
+        :param graph: Compiled graph
+        :param count: Number of landmarks (defaults to Landmarks.count)
+        """
+
+        self.graph = graph
+        self.landmarks = []
+        self.tables = []
+
+        # Estimates to each cached target, ordered from least to most recently used
+        self.estimates = {}
+
+        # Tables as a matrix (landmark by node, -1 if unreachable), created on first use if NumPy is installed
+        self.matrix = None
+
+        if not graph.nodes:
+            return
+
+        count = min(self.count if count is None else count, len(graph.nodes))
+
+        # Farthest-point selection: each landmark is the node farthest from all previous landmarks.
+        # Unreachable nodes count as infinitely far, such that every component gets a landmark.
+        nearest = shortest_lengths(graph, 0)
+
+        for k in range(count):
+            landmark = max(
+                range(len(graph.nodes)),
+                key=lambda node: float("inf") if nearest[node] is None else nearest[node]
+            )
+
+            if landmark in self.landmarks:
+                break
+
+            table = shortest_lengths(graph, landmark)
+            self.landmarks.append(landmark)
+            self.tables.append(table)
+
+            # The first search only served to find the first landmark, and is discarded
+            if k == 0:
+                nearest = table
+            else:
+                nearest = [b if a is None or (b is not None and b < a) else a for a, b in zip(nearest, table)]
+
+    @classmethod
+    def reuse(cls, landmarks, graph: CompiledGraph):
+        """
+        Get landmarks for a compiled graph, reusing the given landmarks if they were built for an identical graph.
+
+        :param landmarks: Previously built landmarks (or None)
+        :param graph: Compiled graph
+        :return: Landmarks for the graph
+        """
+
+        if landmarks is not None and graph.same_structure(landmarks.graph):
+            return landmarks
+
+        return cls(graph)
+
+    def estimate_all(self, target: int) -> list[int]:
+        """
+        Estimate (lower bound) the distance from every node to a target node, cached by target.
+
+        :param target: Index of the target node
+        :return: Estimated distance from each node (by index) to the target
+        """
+
+        estimates = self.estimates.pop(target, None)
+
+        if estimates is None:
+            estimates = self.compute_estimates(target)
+
+            if len(self.estimates) >= self.cache_size:
+                del self.estimates[next(iter(self.estimates))]
+
+        self.estimates[target] = estimates
+        return estimates
+
+    def compute_estimates(self, target: int) -> list[int]:
+        """
+        Compute the estimates from every node to a target node in one batch.
+
+        :param target: Index of the target node
+        :return: Estimated distance from each node (by index) to the target
+        """
+
+        if not self.tables:
+            return [0] * len(self.graph.nodes)
+
+        if numpy is not None:
+            if self.matrix is None:
+                self.matrix = numpy.array([[-1 if length is None else length for length in table] for table in self.tables])
+
+            target_lengths = self.matrix[:, target:target + 1]
+
+            # Only landmarks reaching both nodes give a bound
+            valid = (self.matrix >= 0) & (target_lengths >= 0)
+            return numpy.where(valid, numpy.abs(self.matrix - target_lengths), 0).max(axis=0).tolist()
+
+        estimates = [0] * len(self.graph.nodes)
+
+        for table in self.tables:
+            target_length = table[target]
+            if target_length is None:
+                continue
+
+            estimates = [
+                best if length is None or abs(target_length - length) <= best else abs(target_length - length)
+                for best, length in zip(estimates, table)
+            ]
+
+        return estimates
+
+
 class Algorithm:
     """ Abstract class to derive algorithm classes from. Holds standard functions and properties. """
 
-    def __init__(self, nodes: list[Node], weights: list[Weight]):
+    def __init__(self, nodes: list[GraphNode], weights: list[GraphWeight]):
         """
         Initialize an instance of the Algorithm class.
 
@@ -81,11 +539,23 @@ class Algorithm:
         self.nodes = nodes
         self.weights = weights
 
+        # Compiled snapshot of the graph, created once per run
+        self.graph = None
+
         # Recording stores a list of paths from the pathfinding process.
         # This is used to depict a timeline over the pathfinding process.
         self.recording = []
 
-    def find_start(self) -> Node | None:
+        # Number of times a node has been expanded (its weights explored)
+        self.expanded = 0
+
+        # Whether the last run found a path to the end node
+        self.found = False
+
+        # Component index of the graph (see components.py), if maintained by the owner of the graph
+        self.components = None
+
+    def find_start(self) -> GraphNode | None:
         """
         Find start node among nodes.
 
@@ -96,7 +566,7 @@ class Algorithm:
             if node.is_start:
                 return node
 
-    def find_end(self) -> Node | None:
+    def find_end(self) -> GraphNode | None:
         """
         Find end node among nodes.
 
@@ -107,6 +577,16 @@ class Algorithm:
             if node.is_end:
                 return node
 
+    def compile(self) -> CompiledGraph:
+        """
+        Compile the nodes and weights to a snapshot for the solver to run on.
+
+        :return: Compiled graph
+        """
+
+        self.graph = CompiledGraph(self.nodes, self.weights)
+        return self.graph
+
     def clear(self) -> None:
         """
         Clear properties to init-state.
@@ -114,13 +594,56 @@ class Algorithm:
         :return: None
         """
 
+        self.graph = None
         self.recording.clear()
+        self.expanded = 0
+        self.found = False
+
+    def stream(self) -> Iterator[Path]:
+        """
+        Run the pathfinding algorithm, yielding paths as they are explored.
+        The algorithm only progresses as paths are consumed, and sets found once exhausted.
+
+        :return: Generator of explored paths
+        """
+
+        raise NotImplementedError
+
+    def is_reachable(self) -> bool:
+        """
+        Check whether the end node can be reached from the start node, without searching.
+        Always true without a component index.
+
+        :return: Whether the start and end node are connected
+        """
+
+        if self.components is None:
+            return True
+
+        return self.components.connected(self.find_start(), self.find_end())
+
+    def run(self) -> list[Path] | None:
+        """
+        Run the pathfinding algorithm to completion.
+        If a component index shows the end node is unreachable, no search is made.
+
+        :return: Recording of pathfinding or None
+        """
+
+        if not self.is_reachable():
+            self.clear()
+            return None
+
+        self.recording = list(self.stream())
+
+        if self.found:
+            return self.recording
 
 
 class Dijkstra(Algorithm):
     """ Class to perform the Dijkstra pathfinding algorithm on a graph of nodes. """
 
-    def __init__(self, nodes: list[Node], weights: list[Weight]):
+    def __init__(self, nodes: list[GraphNode], weights: list[GraphWeight]):
         """
         Initialize an instance of the Dijkstra class.
 
@@ -128,11 +651,11 @@ class Dijkstra(Algorithm):
         :param weights: Weights in graph
         """
 
-        # fastest_paths stores fastest found paths to all nodes in graph
-        self.fastest_paths = {}
+        # fastest_paths stores fastest found paths to all nodes in graph (by index)
+        self.fastest_paths = []
 
-        # cand_paths stores all currently queued paths
-        self.cand_paths = []
+        # cand_paths stores all currently queued paths, ordered by length
+        self.cand_paths = PathQueue()
 
         super().__init__(nodes, weights)
 
@@ -143,71 +666,84 @@ class Dijkstra(Algorithm):
         :return: None
         """
 
-        self.fastest_paths = {}
+        self.fastest_paths = []
         self.cand_paths.clear()
 
         Algorithm.clear(self)
 
-    def find_candidates(self, path: Path) -> None:
+    def find_candidates(self, node: int, path: Path) -> None:
         """
         Explore path to find candidate paths.
 
+        :param node: Index of the last node in path
         :param path: Path to explore
         :return: None
         """
 
-        for weight in path.curr_node.weights:
-            other = weight.get_other_node(path.curr_node)
-            new_path = Path(other, weight, path)
+        graph = self.graph
+        self.expanded += 1
+
+        for i in range(graph.offsets[node], graph.offsets[node + 1]):
+            other = graph.targets[i]
+            length = path.length + graph.lengths[i]
 
             # If path is longer than known path, discard
-            if new_path.curr_node in self.fastest_paths:
-                if new_path.length >= self.fastest_paths[new_path.curr_node].length:
-                    continue
+            fastest = self.fastest_paths[other]
+            if fastest is not None and length >= fastest.length:
+                continue
 
-            self.cand_paths.append(new_path)
+            self.cand_paths.push(length, other, graph.edges[i], path)
 
-    def run(self) -> list[Path] | None:
+    def stream(self) -> Iterator[Path]:
         """
-        Run the pathfinding algorithm.
+        Run the pathfinding algorithm, yielding paths as they are explored.
 
-        :return: Recording of pathfinding or None
+        :return: Generator of explored paths
         """
 
         self.clear()
 
-        start_node = self.find_start()
-        end_node = self.find_end()
+        graph = self.compile()
+        start = graph.index[self.find_start()]
+        end = graph.index[self.find_end()]
+
+        self.fastest_paths = [None] * len(graph.nodes)
 
-        start_path = Path(start_node)
-        self.find_candidates(start_path)
-        self.fastest_paths[start_node] = start_path
+        start_path = Path(graph.nodes[start])
+        self.fastest_paths[start] = start_path
+        self.find_candidates(start, start_path)
 
-        # Repeat until end-node is found
-        while end_node not in self.fastest_paths:
+        # Repeat until end-node is found or no candidates remain
+        while self.fastest_paths[end] is None and self.cand_paths:
 
             # Select node with lowest length
-            self.cand_paths = sorted(self.cand_paths, key=lambda path: path.length, reverse=True)
-            optimal_candidate = self.cand_paths.pop()
-            self.recording.append(optimal_candidate)
+            length, node, weight, prev_path = self.cand_paths.pop()
+            optimal_candidate = Path(graph.nodes[node], graph.weights[weight], prev_path)
+            yield optimal_candidate
 
             # If path is longer than known path, discard
-            if optimal_candidate.curr_node in self.fastest_paths:
-                if optimal_candidate.length >= self.fastest_paths[optimal_candidate.curr_node].length:
-                    continue
+            fastest = self.fastest_paths[node]
+            if fastest is not None and length >= fastest.length:
+                continue
 
             # Save path and find candidates
-            self.fastest_paths[optimal_candidate.curr_node] = optimal_candidate
-            self.find_candidates(optimal_candidate)
+            self.fastest_paths[node] = optimal_candidate
+            self.find_candidates(node, optimal_candidate)
 
-        if end_node in self.fastest_paths:
-            return self.recording
+        self.found = self.fastest_paths[end] is not None
 
 
 class BFS(Algorithm):
-    """ Class to perform the BFS pathfinding algorithm on a graph of nodes. """
+    """
+    Class to perform the BFS pathfinding algorithm on a graph of nodes.
+
+    Label-correcting search (SPFA): nodes are expanded breadth first from a queue, and a node whose fastest path
+    improves is queued again, unless it is already waiting in the queue (it is then expanded with its newest path).
+    Paths that are not faster than the fastest known path to the end node are never queued, as they cannot lead to
+    a faster path. The algorithm is therefore guaranteed to return the fastest path.
+    """
 
-    def __init__(self, nodes: list[Node], weights: list[Weight]):
+    def __init__(self, nodes: list[GraphNode], weights: list[GraphWeight]):
         """
         Initialize an instance of the BFS class.
 
@@ -215,14 +751,14 @@ class BFS(Algorithm):
         :param weights: Weights in graph
         """
 
-        # fastest_paths stores fastest found paths to all nodes in graph
-        self.fastest_paths = {}
+        # fastest_paths stores fastest found paths to all nodes in graph (by index)
+        self.fastest_paths = []
 
-        # curr_paths stores all currently queued paths
-        self.curr_paths = []
+        # queue stores the indices of nodes to expand, in_queue whether each node (by index) is in the queue
+        self.queue = deque()
+        self.in_queue = bytearray()
 
-        # new_paths stores all paths generated during current round of exploration
-        self.new_paths = []
+        self.end = None
 
         super().__init__(nodes, weights)
 
@@ -233,90 +769,110 @@ class BFS(Algorithm):
         :return: None
         """
 
-        self.fastest_paths = {}
-        self.curr_paths.clear()
-        self.new_paths.clear()
+        self.fastest_paths = []
+        self.queue.clear()
+        self.in_queue = bytearray()
+
+        self.end = None
 
         Algorithm.clear(self)
 
-    def explore_weight(self, path: Path, weight: Weight) -> None:
+    def explore_weight(self, node: int, path: Path, i: int) -> Path | None:
         """
         Explore a path and weight for a new path.
 
+        :param node: Index of the last node in path
         :param path: Path to explore
-        :param weight: Weight to explore
-        :return: None
+        :param i: Position of the weight in the compiled graph arrays
+        :return: Explored path (to record) or None
         """
 
-        # If the last node is the end node, no gain will be found by further exploration
-        if path.nodes[-1].is_end:
-            return
+        graph = self.graph
 
         # Get path corresponding to path + weight
-        other = weight.get_other_node(path.curr_node)
-
-        # If third to last node is equal to current node, the path has repeated, discard
-        if len(path.nodes) > 1 and path.nodes[-2] == other:
-            return
+        other = graph.targets[i]
+        other_node = graph.nodes[other]
 
-        new_path = Path(other, weight, path)
-        self.recording.append(new_path)
+        # If second to last node is equal to the other node, the path has repeated, discard
+        if path.prev_path is not None and path.prev_path.curr_node == other_node:
+            return None
 
-        if other in self.fastest_paths:
+        new_path = Path(other_node, graph.weights[graph.edges[i]], path)
 
-            # If a faster path to the current node exists, discard
-            if new_path.length >= self.fastest_paths[other].length:
-                return
+        # If a faster path to the other node exists, discard
+        fastest = self.fastest_paths[other]
+        if fastest is not None and new_path.length >= fastest.length:
+            return new_path
 
-            # New path is the fastest, remove redundant paths from curr_paths
-            self.curr_paths = list(filter(lambda path: path.nodes[-1] != other, self.curr_paths))
+        # If the path is no faster than the fastest path to the end node, it cannot lead to a faster one, discard
+        best = self.fastest_paths[self.end]
+        if best is not None and new_path.length >= best.length:
+            return new_path
 
-        # New paths passes checks, add it to list
+        # New path is the fastest, queue the other node unless already queued.
+        # If the other node is the end node, no gain will be found by further exploration
         self.fastest_paths[other] = new_path
-        self.new_paths.append(new_path)
 
-    def run(self) -> list[Path] | None:
+        if other != self.end and not self.in_queue[other]:
+            self.in_queue[other] = True
+            self.queue.append(other)
+
+        return new_path
+
+    def stream(self) -> Iterator[Path]:
         """
-        Run the pathfinding algorithm.
+        Run the pathfinding algorithm, yielding paths as they are explored.
 
-        :return: Recording of pathfinding or None
+        :return: Generator of explored paths
         """
 
         self.clear()
 
-        start_node = self.find_start()
-        end_node = self.find_end()
+        graph = self.compile()
+        start = graph.index[self.find_start()]
+        self.end = graph.index[self.find_end()]
 
-        start_path = Path(start_node)
-        self.new_paths.append(start_path)
+        self.fastest_paths = [None] * len(graph.nodes)
+        self.in_queue = bytearray(len(graph.nodes))
 
-        self.fastest_paths[start_node] = start_path
+        self.fastest_paths[start] = Path(graph.nodes[start])
 
-        # While new and faster paths are being found
-        while self.new_paths:
+        if start != self.end:
+            self.queue.append(start)
+            self.in_queue[start] = True
 
-            # Transfer new paths to current paths (breadth first)
-            self.curr_paths = self.new_paths[:]
-            self.new_paths.clear()
+        # While nodes with new and faster paths are queued
+        while self.queue:
+            node = self.queue.popleft()
+            self.in_queue[node] = False
 
-            # Explore all weights of all paths
-            for path in self.curr_paths:
-                for weight in path.curr_node.weights:
-                    self.explore_weight(path, weight)
+            # Expand the fastest path to the node, unless a path as fast to the end node has been found since
+            path = self.fastest_paths[node]
+            best = self.fastest_paths[self.end]
+            if best is not None and path.length >= best.length:
+                continue
 
-        if end_node in self.fastest_paths:
-            return self.recording
+            self.expanded += 1
+
+            for i in range(graph.offsets[node], graph.offsets[node + 1]):
+                new_path = self.explore_weight(node, path, i)
+
+                if new_path is not None:
+                    yield new_path
+
+        self.found = self.fastest_paths[self.end] is not None
 
 
 class AStar(Algorithm):
     """
     Class to perform the A-Star pathfinding algorithm on a graph of nodes.
 
-    Important note: This algorithm is not guaranteed (though usually expected) to return the fastest path.
-    This is because, the heuristic in use is imperfect and can be deceived.
+    Uses the ALT landmark heuristic, which never overestimates the distance to the end node.
+    The algorithm is therefore guaranteed to return the fastest path.
+    The landmark tables are computed on the first run, and reused as long as the graph is unchanged.
     """
 
-    def __init__(self, nodes: list[Node], weights: list[Weight]):
+    def __init__(self, nodes: list[GraphNode], weights: list[GraphWeight]):
         """
         Initialize an instance of the AStar class.
 
@@ -324,30 +880,23 @@ class AStar(Algorithm):
         :param weights: Weights in graph
         """
 
-        # fastest_paths stores fastest found paths to all nodes in graph
-        self.fastest_paths = {}
+        # fastest_paths stores fastest found paths to all nodes in graph (by index)
+        self.fastest_paths = []
 
-        # cand_paths stores candidate paths in the queue
-        self.cand_paths = []
+        # cand_paths stores candidate paths in the queue, ordered by estimated length
+        self.cand_paths = PathQueue()
 
         self.start_node = None
         self.end_node = None
+        self.end = None
 
-        super().__init__(nodes, weights)
-
-    @staticmethod
-    def estimate_distance(node1: Node, node2: Node) -> float:
-        """
-        Estimate distance between two nodes. Basic heuristic function.
+        # Landmark tables, kept between runs
+        self.landmarks = None
 
-        :param node1: Node 1
-        :param node2: Node 2
-        :return: Estimated distance between nodes
-        """
+        # estimates stores the estimated distance from each node (by index) to the end node
+        self.estimates = []
 
-        diff_x = abs(node1.pos[1] - node2.pos[1])
-        diff_y = abs(node1.pos[0] - node2.pos[0])
-        return ((diff_x**2 + diff_y**2)**0.5) / 120
+        super().__init__(nodes, weights)
 
     def clear(self) -> None:
         """
@@ -357,37 +906,45 @@ class AStar(Algorithm):
         """
 
         self.cand_paths.clear()
-        self.fastest_paths = {}
+        self.fastest_paths = []
 
         self.start_node = None
         self.end_node = None
+        self.end = None
+
+        self.estimates = []
 
         Algorithm.clear(self)
 
-    def find_candidates(self, path: Path) -> None:
+    def find_candidates(self, node: int, path: Path) -> None:
         """
         Explore path to find candidate paths.
 
+        :param node: Index of the last node in path
         :param path: Path to explore
         :return: None
         """
 
-        for weight in path.curr_node.weights:
-            other = weight.get_other_node(path.curr_node)
-            new_path = Path(other, weight, path, self.estimate_distance(other, self.end_node))
+        graph = self.graph
+        estimates = self.estimates
+        self.expanded += 1
+
+        for i in range(graph.offsets[node], graph.offsets[node + 1]):
+            other = graph.targets[i]
+            length = path.length + graph.lengths[i]
 
             # If path is longer than known path, discard
-            if new_path.curr_node in self.fastest_paths:
-                if new_path.length >= self.fastest_paths[new_path.curr_node].length:
-                    continue
+            fastest = self.fastest_paths[other]
+            if fastest is not None and length >= fastest.length:
+                continue
 
-            self.cand_paths.append(new_path)
+            self.cand_paths.push(length + estimates[other], other, graph.edges[i], path)
 
-    def run(self) -> list[Path] | None:
+    def stream(self) -> Iterator[Path]:
         """
-        Run the pathfinding algorithm.
+        Run the pathfinding algorithm, yielding paths as they are explored.
 
-        :return: Recording of pathfinding or None
+        :return: Generator of explored paths
         """
 
         self.clear()
@@ -395,29 +952,36 @@ class AStar(Algorithm):
         self.start_node = self.find_start()
         self.end_node = self.find_end()
 
-        start_path = Path(self.start_node, heu_length=self.estimate_distance(self.start_node, self.end_node))
-        self.find_candidates(start_path)
-        self.fastest_paths[self.start_node] = start_path
+        graph = self.compile()
+        start = graph.index[self.start_node]
+        self.end = graph.index[self.end_node]
 
-        # Repeat until end-node is found
-        while self.end_node not in self.fastest_paths:
+        self.landmarks = Landmarks.reuse(self.landmarks, graph)
+        self.fastest_paths = [None] * len(graph.nodes)
+        self.estimates = self.landmarks.estimate_all(self.end)
+
+        start_path = Path(self.start_node, heu_length=self.estimates[start])
+        self.find_candidates(start, start_path)
+        self.fastest_paths[start] = start_path
+
+        # Repeat until end-node is found or no candidates remain
+        while self.fastest_paths[self.end] is None and self.cand_paths:
 
             # Select node with lowest estimated length
-            self.cand_paths = sorted(self.cand_paths, key=lambda path: path.estimated_length, reverse=True)
-            optimal_candidate = self.cand_paths.pop()
-            self.recording.append(optimal_candidate)
+            _, node, weight, prev_path = self.cand_paths.pop()
+            optimal_candidate = Path(graph.nodes[node], graph.weights[weight], prev_path, self.estimates[node])
+            yield optimal_candidate
 
             # If path is longer than known path, discard
-            if optimal_candidate.curr_node in self.fastest_paths:
-                if optimal_candidate.length >= self.fastest_paths[optimal_candidate.curr_node].length:
-                    continue
+            fastest = self.fastest_paths[node]
+            if fastest is not None and optimal_candidate.length >= fastest.length:
+                continue
 
             # Save path and find candidates
-            self.fastest_paths[optimal_candidate.curr_node] = optimal_candidate
-            self.find_candidates(optimal_candidate)
+            self.fastest_paths[node] = optimal_candidate
+            self.find_candidates(node, optimal_candidate)
 
-        if self.end_node in self.fastest_paths:
-            return self.recording
+        self.found = self.fastest_paths[self.end] is not None
 
 
 class DFS(Algorithm):
@@ -427,23 +991,30 @@ class DFS(Algorithm):
     Important note: This algorithm is not guaranteed (or expected) to find the fastest path.
     It will return the first path to the end-node it finds. This is the case,
     because a depth-first search gives no good exit-condition to go by.
-    As such, the algorithm would have to exhaust all possible paths to find the fastest.
+    As such, the algorithm would have to exhaust all possible paths to find the fastest (see BranchAndBoundDFS).
+
+    Attributes:
+        branch_and_bound: Whether to keep searching after reaching the end node, pruning slower branches
     """
 
-    def __init__(self, nodes: list[Node], weights: list[Weight]):
+    branch_and_bound = False
+
+    def __init__(self, nodes: list[GraphNode], weights: list[GraphWeight]):
         """
-        Initialize an instance of the AStar class.
+        Initialize an instance of the DFS class.
 
         :param nodes: Nodes in graph
         :param weights: Weights in graph
         """
 
-        # fastest_paths stores fastest found paths to all nodes in graph
-        self.fastest_paths = {}
+        # fastest_paths stores fastest found paths to all nodes in graph (by index)
+        self.fastest_paths = []
 
-        # curr_paths stores all currently queued paths
+        # cand_paths stores all currently queued paths, along with the index of their last node (top is last)
         self.cand_paths = []
 
+        self.end = None
+
         super().__init__(nodes, weights)
 
     def clear(self) -> None:
@@ -454,72 +1025,136 @@ class DFS(Algorithm):
         """
 
         self.cand_paths.clear()
-        self.fastest_paths = {}
+        self.fastest_paths = []
+
+        self.end = None
 
         Algorithm.clear(self)
 
-    def explore_path(self, path: Path, weight: Weight) -> None:
+    def is_pruned(self, node: int, path: Path) -> bool:
+        """
+        Check whether a path is no faster than the known path to its last node, or to the end node.
+
+        :param node: Index of the last node in path
+        :param path: Path to check
+        :return: Whether the path cannot lead to a faster path to the end node
+        """
+
+        fastest = self.fastest_paths[node]
+        if fastest is not None and path.length >= fastest.length:
+            return True
+
+        best = self.fastest_paths[self.end]
+        return best is not None and path.length >= best.length
+
+    def explore_path(self, path: Path, i: int) -> None:
         """
         Explore a path and weight.
 
         :param path: Path to explore
-        :param weight: Weight to explore
+        :param i: Position of the weight in the compiled graph arrays
         :return: None
         """
 
+        graph = self.graph
+
         # Get path corresponding to path + weight
-        other = weight.get_other_node(path.curr_node)
+        other = graph.targets[i]
+        other_node = graph.nodes[other]
 
-        # If third to last node is equal to current node, the path has repeated, discard
-        if len(path.nodes) > 1 and path.nodes[-2] == other:
+        # If second to last node is equal to the other node, the path has repeated, discard
+        if path.prev_path is not None and path.prev_path.curr_node == other_node:
             return
 
-        new_path = Path(other, weight, path)
+        new_path = Path(other_node, graph.weights[graph.edges[i]], path)
+
+        # When searching for the fastest path, branches that cannot be faster are not kept on the stack
+        if self.branch_and_bound and self.is_pruned(other, new_path):
+            return
 
         # Push new path to top of stack (depth first)
-        self.cand_paths.insert(0, new_path)
+        self.cand_paths.append((other, new_path))
 
-    def run(self) -> list[Path] | None:
+    def stream(self) -> Iterator[Path]:
         """
-        Run the pathfinding algorithm.
+        Run the pathfinding algorithm, yielding paths as they are explored.
 
-        :return: Recording of pathfinding or None
+        :return: Generator of explored paths
         """
 
         self.clear()
 
-        start_node = self.find_start()
-        end_node = self.find_end()
+        graph = self.compile()
+        start = graph.index[self.find_start()]
+        self.end = graph.index[self.find_end()]
 
-        start_path = Path(start_node)
-        self.cand_paths.append(start_path)
+        self.fastest_paths = [None] * len(graph.nodes)
 
-        ending_found = False
+        start_path = Path(graph.nodes[start])
+        self.cand_paths.append((start, start_path))
 
-        # Iterate until ending found or no more paths to explore
-        while not ending_found and self.cand_paths:
+        # Iterate until ending found (or, with branch and bound, proven fastest) or no more paths to explore
+        while self.cand_paths:
 
             # Get path from top of stack
-            cand_path = self.cand_paths.pop(0)
-            self.recording.append(cand_path)
+            node, cand_path = self.cand_paths.pop()
+
+            # With branch and bound, paths overtaken by a faster path since they were pushed are discarded unrecorded
+            if self.branch_and_bound:
+                if self.is_pruned(node, cand_path):
+                    continue
 
-            if cand_path.curr_node in self.fastest_paths:
+                if cand_path is not start_path:
+                    yield cand_path
+
+            else:
+
+                # The start path itself is not recorded
+                if cand_path is not start_path:
+                    yield cand_path
 
                 # If path is slower than known path, discard
-                if cand_path.length >= self.fastest_paths[cand_path.curr_node].length:
+                fastest = self.fastest_paths[node]
+                if fastest is not None and cand_path.length >= fastest.length:
                     continue
 
-            self.fastest_paths[cand_path.curr_node] = cand_path
+            self.fastest_paths[node] = cand_path
 
-            if cand_path.curr_node.is_end:
+            if node == self.end:
+                if self.branch_and_bound:
+                    continue
 
                 break
 
-            for weight in cand_path.curr_node.weights:
-                self.explore_path(cand_path, weight)
+            self.expanded += 1
+            positions = range(graph.offsets[node], graph.offsets[node + 1])
 
-        if end_node in self.fastest_paths:
-            return self.recording[1:]
+            # With branch and bound, the shortest weight is pushed last (tried first), to find a tight bound early
+            if self.branch_and_bound:
+                positions = sorted(positions, key=graph.lengths.__getitem__, reverse=True)
+
+            for i in positions:
+                self.explore_path(cand_path, i)
+
+        self.found = self.fastest_paths[self.end] is not None
+
+
+class BranchAndBoundDFS(DFS):
+    """
+    Class to perform a branch and bound DFS pathfinding algorithm on a graph of nodes.
+
+    Searches depth first like DFS, but continues after reaching the end node, discarding every branch
+    that is no faster than the fastest path found to the end node, or to the node it reaches.
+    Once the stack is exhausted, the fastest path has been found. The stack only holds the untried branches
+    along the current path, such that memory stays bounded by the depth of the search times the number of weights.
+
+    Important note: A node is expanded again every time a faster path to it is found, which is not bounded by the size
+    of the graph. Every expansion is recorded, while paths pruned after being pushed are not. On a grid of 10,000
+    weights this is about 4 million expansions and recorded paths, taking about 30 seconds, so the recording (and the
+    timeline) grows far beyond that of Dijkstra. Use it on small graphs, or consume stream without keeping the paths.
+    """
+
+    branch_and_bound = True
 
 
 class Greedy(Algorithm):
@@ -528,9 +1163,14 @@ class Greedy(Algorithm):
 
     Important note: This algorithm is not guaranteed (or expected) to find the fastest path.
     It relies solely on heuristic, and therefore doesn't consider current path length, only distance to target.
+
+    Attributes:
+        distance_scale: Distance between node coordinates corresponding to one unit of weight length
     """
 
-    def __init__(self, nodes: list[Node], weights: list[Weight]):
+    distance_scale = 120
+
+    def __init__(self, nodes: list[GraphNode], weights: list[GraphWeight]):
         """
         Initialize an instance of the Greedy class.
 
@@ -538,30 +1178,36 @@ class Greedy(Algorithm):
         :param weights: Weights in graph
         """
 
-        # fastest_paths stores fastest found paths to all nodes in graph
-        self.fastest_paths = {}
+        # fastest_paths stores fastest found paths to all nodes in graph (by index)
+        self.fastest_paths = []
 
-        # cand_paths stores candidate paths in the queue
-        self.cand_paths = []
+        # cand_paths stores candidate paths in the queue, ordered by heuristic distance
+        self.cand_paths = PathQueue()
 
         self.start_node = None
         self.end_node = None
+        self.end = None
+
+        # estimates stores the estimated distance from each node (by index) to the end node,
+        # kept between runs along with the coordinates and end node they were computed for
+        self.estimates = []
+        self.estimates_key = None
 
         super().__init__(nodes, weights)
 
-    @staticmethod
-    def estimate_distance(node1: Node, node2: Node) -> int:
+    def prepare_estimates(self) -> None:
         """
-        Estimate distance between two nodes. Basic heuristic function.
+        Compute the estimates from all nodes to the end node in one batch,
+        unless the coordinates and end node are unchanged since the last run.
 
-        :param node1: Node 1
-        :param node2: Node 2
-        :return: Estimated distance between nodes
+        :return: None
         """
 
-        diff_x = abs(node1.pos[1] - node2.pos[1])
-        diff_y = abs(node1.pos[0] - node2.pos[0])
-        return ((diff_x ** 2 + diff_y ** 2) ** 0.5) / 120
+        key = (self.graph.xs, self.graph.ys, self.end)
+
+        if key != self.estimates_key:
+            self.estimates = euclidean_estimates(self.graph.xs, self.graph.ys, self.end, self.distance_scale)
+            self.estimates_key = key
 
     def clear(self) -> None:
         """
@@ -571,31 +1217,36 @@ class Greedy(Algorithm):
         """
 
         self.cand_paths.clear()
-        self.fastest_paths = {}
+        self.fastest_paths = []
 
         self.start_node = None
         self.end_node = None
+        self.end = None
 
         Algorithm.clear(self)
 
-    def find_candidates(self, path: Path) -> None:
+    def find_candidates(self, node: int, path: Path) -> None:
         """
         Explore path to find candidate paths.
 
+        :param node: Index of the last node in path
         :param path: Path to explore
         :return: None
         """
 
-        for weight in path.curr_node.weights:
-            other = weight.get_other_node(path.curr_node)
-            new_path = Path(other, weight, path, self.estimate_distance(other, self.end_node))
-            self.cand_paths.append(new_path)
+        graph = self.graph
+        estimates = self.estimates
+        self.expanded += 1
 
-    def run(self) -> list[Path] | None:
+        for i in range(graph.offsets[node], graph.offsets[node + 1]):
+            other = graph.targets[i]
+            self.cand_paths.push(estimates[other], other, graph.edges[i], path)
+
+    def stream(self) -> Iterator[Path]:
         """
-        Run the pathfinding algorithm.
+        Run the pathfinding algorithm, yielding paths as they are explored.
 
-        :return: Recording of pathfinding or None
+        :return: Generator of explored paths
         """
 
         self.clear()
@@ -603,25 +1254,276 @@ class Greedy(Algorithm):
         self.start_node = self.find_start()
         self.end_node = self.find_end()
 
-        start_path = Path(self.start_node, heu_length=self.estimate_distance(self.start_node, self.end_node))
-        self.find_candidates(start_path)
-        self.fastest_paths[self.start_node] = start_path
+        graph = self.compile()
+        start = graph.index[self.start_node]
+        self.end = graph.index[self.end_node]
+
+        self.fastest_paths = [None] * len(graph.nodes)
+        self.prepare_estimates()
 
-        # Repeat until end-node is found
-        while self.end_node not in self.fastest_paths:
+        start_path = Path(self.start_node, heu_length=self.estimates[start])
+        self.find_candidates(start, start_path)
+        self.fastest_paths[start] = start_path
+
+        # Repeat until end-node is found or no candidates remain
+        while self.fastest_paths[self.end] is None and self.cand_paths:
 
             # Select node with smallest heuristic distance to target
-            self.cand_paths = sorted(self.cand_paths, key=lambda path: path.heu_length, reverse=True)
-            optimal_candidate = self.cand_paths.pop()
-            self.recording.append(optimal_candidate)
+            heu_length, node, weight, prev_path = self.cand_paths.pop()
+            optimal_candidate = Path(graph.nodes[node], graph.weights[weight], prev_path, heu_length)
+            yield optimal_candidate
 
             # If path is slower than known path, discard
-            if optimal_candidate.curr_node in self.fastest_paths:
-                if optimal_candidate.length >= self.fastest_paths[optimal_candidate.curr_node].length:
-                    continue
+            fastest = self.fastest_paths[node]
+            if fastest is not None and optimal_candidate.length >= fastest.length:
+                continue
 
-            self.fastest_paths[optimal_candidate.curr_node] = optimal_candidate
-            self.find_candidates(optimal_candidate)
+            self.fastest_paths[node] = optimal_candidate
+            self.find_candidates(node, optimal_candidate)
 
-        if self.end_node in self.fastest_paths:
-            return self.recording
+        self.found = self.fastest_paths[self.end] is not None
+
+
+class Bidirectional(Algorithm):
+    """
+    Abstract class for bidirectional searches. Derived classes provide the potential function guiding the searches.
+
+    Searches from the start node (side 0) and the end node (side 1) at the same time,
+    always expanding the side with the lowest key. Whenever a search reaches a node settled by the other,
+    the connection is a candidate solution. The searches stop once the sum of the lowest keys
+    of both sides reaches the best connection, which is then the fastest path.
+
+    The potential p(v) is added to the keys of the start side and subtracted from the keys of the end side.
+    """
+
+    def __init__(self, nodes: list[GraphNode], weights: list[GraphWeight]):
+        """
+        Initialize an instance of the Bidirectional class.
+
+        :param nodes: Nodes in graph
+        :param weights: Weights in graph
+        """
+
+        # fastest_paths stores fastest found paths to all nodes in graph (by index), for each side
+        self.fastest_paths = ([], [])
+
+        # cand_paths stores all currently queued paths, for each side
+        self.cand_paths = (PathQueue(), PathQueue())
+
+        # Fastest known connection between the sides (start side path, weight index, end side path)
+        self.best_length = None
+        self.best_meeting = None
+
+        self.start = None
+        self.end = None
+
+        super().__init__(nodes, weights)
+
+    def potential(self, node: int) -> float:
+        """
+        Potential of a node, guiding the searches. Zero by default.
+
+        :param node: Index of the node
+        :return: Potential of the node
+        """
+
+        return 0
+
+    def clear(self) -> None:
+        """
+        Clear properties to init-state.
+
+        :return: None
+        """
+
+        self.fastest_paths = ([], [])
+
+        for cand_paths in self.cand_paths:
+            cand_paths.clear()
+
+        self.best_length = None
+        self.best_meeting = None
+
+        self.start = None
+        self.end = None
+
+        Algorithm.clear(self)
+
+    def find_candidates(self, side: int, node: int, path: Path) -> None:
+        """
+        Explore path to find candidate paths, and connections to the other side.
+
+        :param side: Side of the search (0 from start, 1 from end)
+        :param node: Index of the last node in path
+        :param path: Path to explore
+        :return: None
+        """
+
+        graph = self.graph
+        self.expanded += 1
+
+        fastest_paths = self.fastest_paths[side]
+        other_paths = self.fastest_paths[1 - side]
+        sign = 1 if side == 0 else -1
+
+        for i in range(graph.offsets[node], graph.offsets[node + 1]):
+            other = graph.targets[i]
+            length = path.length + graph.lengths[i]
+
+            # If the other side has settled the node, the searches connect
+            other_path = other_paths[other]
+            if other_path is not None and (self.best_length is None or length + other_path.length < self.best_length):
+                self.best_length = length + other_path.length
+
+                if side == 0:
+                    self.best_meeting = (path, graph.edges[i], other_path)
+                else:
+                    self.best_meeting = (other_path, graph.edges[i], path)
+
+            # If path is longer than known path, discard
+            fastest = fastest_paths[other]
+            if fastest is not None and length >= fastest.length:
+                continue
+
+            self.cand_paths[side].push(length + sign * self.potential(other), other, graph.edges[i], path)
+
+    def join_meeting(self) -> Path:
+        """
+        Join the paths of the best connection into a single path from start to end.
+
+        :return: Fastest path from start to end
+        """
+
+        start_path, weight, end_path = self.best_meeting
+        path = Path(end_path.curr_node, self.graph.weights[weight], start_path)
+
+        # Follow the end side path back towards the end node
+        for sub_path in end_path.iter_paths():
+            if sub_path.prev_path is None:
+                break
+
+            path = Path(sub_path.prev_path.curr_node, sub_path.curr_weight, path)
+
+        return path
+
+    def stream(self) -> Iterator[Path]:
+        """
+        Run the pathfinding algorithm, yielding paths as they are explored.
+
+        :return: Generator of explored paths
+        """
+
+        self.clear()
+
+        graph = self.compile()
+        self.start = graph.index[self.find_start()]
+        self.end = graph.index[self.find_end()]
+
+        self.fastest_paths = ([None] * len(graph.nodes), [None] * len(graph.nodes))
+
+        if self.start == self.end:
+            self.found = True
+            return
+
+        roots = (Path(graph.nodes[self.start]), Path(graph.nodes[self.end]))
+        self.fastest_paths[0][self.start] = roots[0]
+        self.fastest_paths[1][self.end] = roots[1]
+
+        self.find_candidates(0, self.start, roots[0])
+        self.find_candidates(1, self.end, roots[1])
+
+        # Repeat until either side runs out of candidates
+        while self.cand_paths[0] and self.cand_paths[1]:
+            keys = (self.cand_paths[0].peek(), self.cand_paths[1].peek())
+
+            # Stop once no connection can be faster than the best known
+            if self.best_length is not None and keys[0] + keys[1] >= self.best_length:
+                break
+
+            # Expand the side with the lowest key
+            side = 0 if keys[0] <= keys[1] else 1
+
+            _, node, weight, prev_path = self.cand_paths[side].pop()
+            optimal_candidate = Path(graph.nodes[node], graph.weights[weight], prev_path)
+            yield optimal_candidate
+
+            # If path is longer than known path, discard
+            fastest = self.fastest_paths[side][node]
+            if fastest is not None and optimal_candidate.length >= fastest.length:
+                continue
+
+            # Save path and find candidates
+            self.fastest_paths[side][node] = optimal_candidate
+            self.find_candidates(side, node, optimal_candidate)
+
+        if self.best_meeting is not None:
+            self.found = True
+            yield self.join_meeting()
+
+
+class BidirectionalDijkstra(Bidirectional):
+    """ Class to perform a bidirectional Dijkstra pathfinding algorithm on a graph of nodes. """
+
+
+class BidirectionalAStar(Bidirectional):
+    """
+    Class to perform a bidirectional A-Star pathfinding algorithm on a graph of nodes.
+
+    Both sides are guided by the average of the ALT landmark estimates to the end node and from the start node.
+    As the estimates never overestimate, the algorithm is guaranteed to return the fastest path.
+    The landmark tables are computed on the first run, and reused as long as the graph is unchanged.
+    """
+
+    def __init__(self, nodes: list[GraphNode], weights: list[GraphWeight]):
+        """
+        Initialize an instance of the BidirectionalAStar class.
+
+        :param nodes: Nodes in graph
+        :param weights: Weights in graph
+        """
+
+        # Landmark tables, kept between runs
+        self.landmarks = None
+
+        # Estimates from each node (by index) to the end node and to the start node, looked up on first use in a run
+        self.to_end = []
+        self.to_start = []
+
+        super().__init__(nodes, weights)
+
+    def compile(self) -> CompiledGraph:
+        """
+        Compile the nodes and weights, and prepare the landmark tables for the graph.
+
+        :return: Compiled graph
+        """
+
+        graph = Algorithm.compile(self)
+        self.landmarks = Landmarks.reuse(self.landmarks, graph)
+        return graph
+
+    def clear(self) -> None:
+        """
+        Clear properties to init-state.
+
+        :return: None
+        """
+
+        self.to_end = []
+        self.to_start = []
+
+        Bidirectional.clear(self)
+
+    def potential(self, node: int) -> float:
+        """
+        Average potential of the start side and (negated) end side estimates.
+
+        :param node: Index of the node
+        :return: Potential of the node
+        """
+
+        if not self.to_end:
+            self.to_end = self.landmarks.estimate_all(self.end)
+            self.to_start = self.landmarks.estimate_all(self.start)
+
+        return (self.to_end[node] - self.to_start[node]) / 2
@@ -0,0 +1,316 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from algo import Algorithm, find_solution
+from cli import ALGORITHMS
+from graph import GraphNode, GraphWeight
+
+"""
+Benchmark harness for the solvers in algo.py. Example:
+    python benchmark.py --families grid road --sizes 1000 10000 --output bench.json
+Graphs are generated from a seed, such that runs are reproducible.
+Sizes are given as the approximate number of weights (edges) in the generated graph.
+"""
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+# Exhaustive searches, and preprocessing contraction hierarchies, are only run when asked for,
+# as they may take very long on large graphs
+DEFAULT_ALGORITHMS = [name for name in ALGORITHMS if name not in ("dfsbb", "ch")]
+
+
+def connect(nodes: list[GraphNode], weights: list[GraphWeight], i: int, j: int, length: int) -> None:
+    """
+    Add a weight of the given length between two nodes.
+
+    :param nodes: Nodes in graph
+    :param weights: Weights in graph
+    :param i: Index of start node
+    :param j: Index of end node
+    :param length: Length of the weight
+    :return: None
+    """
+
+    weight = GraphWeight(nodes[i], nodes[j])
+    weight.length = str(length)
+
+    nodes[i].add_weight(weight)
+    nodes[j].add_weight(weight)
+    weights.append(weight)
+
+
+def distance(node1: GraphNode, node2: GraphNode) -> float:
+    """
+    Euclidean distance between two nodes.
+
+    :param node1: Node 1
+    :param node2: Node 2
+    :return: Distance between nodes
+    """
+
+    return ((node1.pos[0] - node2.pos[0])**2 + (node1.pos[1] - node2.pos[1])**2)**0.5
+
+
+def generate_grid(size: int, rnd: random.Random) -> tuple[list[GraphNode], list[GraphWeight]]:
+    """
+    Generate a square grid with random weight lengths.
+
+    :param size: Approximate number of weights
+    :param rnd: Random generator
+    :return: Nodes and weights
+    """
+
+    k = max(2, round((size / 2)**0.5))
+    nodes = [GraphNode((x * 100, y * 100), str(x * k + y)) for x in range(k) for y in range(k)]
+    weights = []
+
+    for x in range(k):
+        for y in range(k):
+            if x + 1 < k:
+                connect(nodes, weights, x * k + y, (x + 1) * k + y, rnd.randint(1, 9))
+            if y + 1 < k:
+                connect(nodes, weights, x * k + y, x * k + y + 1, rnd.randint(1, 9))
+
+    return nodes, weights
+
+
+def generate_geometric(size: int, rnd: random.Random) -> tuple[list[GraphNode], list[GraphWeight]]:
+    """
+    Generate a random geometric graph, connecting all nodes within a radius of each other.
+    Weight lengths follow the distance between nodes.
+
+    :param size: Approximate number of weights
+    :param rnd: Random generator
+    :return: Nodes and weights
+    """
+
+    # Average degree of 6 gives roughly 3 weights per node
+    n = max(2, size // 3)
+    side = 100 * n**0.5
+    radius = side * (6 / (3.14159 * n))**0.5
+
+    nodes = [GraphNode((rnd.uniform(0, side), rnd.uniform(0, side)), str(i)) for i in range(n)]
+    weights = []
+
+    # Bucket nodes in cells of the radius, such that only neighbouring cells are tested
+    cells = {}
+    for i, node in enumerate(nodes):
+        cells.setdefault((int(node.pos[0] // radius), int(node.pos[1] // radius)), []).append(i)
+
+    for (cx, cy), members in cells.items():
+        for dx, dy in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+            for j in cells.get((cx + dx, cy + dy), []):
+                for i in members:
+                    if (dx, dy) == (0, 0) and j <= i:
+                        continue
+
+                    dist = distance(nodes[i], nodes[j])
+                    if dist <= radius:
+                        connect(nodes, weights, i, j, max(1, round(dist / 10)))
+
+    return nodes, weights
+
+
+def generate_scale_free(size: int, rnd: random.Random) -> tuple[list[GraphNode], list[GraphWeight]]:
+    """
+    Generate a scale-free graph using Barabási-Albert preferential attachment.
+
+    :param size: Approximate number of weights
+    :param rnd: Random generator
+    :return: Nodes and weights
+    """
+
+    m = 3
+    n = max(m + 1, size // m + m)
+    side = 100 * n**0.5
+
+    nodes = [GraphNode((rnd.uniform(0, side), rnd.uniform(0, side)), str(i)) for i in range(n)]
+    weights = []
+
+    # Every node appears once per connected weight, making selection proportional to degree
+    repeated = list(range(m))
+
+    for i in range(m, n):
+        targets = []
+        while len(targets) < m:
+            j = rnd.choice(repeated)
+            if j not in targets:
+                targets.append(j)
+
+        for j in targets:
+            connect(nodes, weights, i, j, rnd.randint(1, 9))
+            repeated.extend((i, j))
+
+    return nodes, weights
+
+
+def generate_road(size: int, rnd: random.Random) -> tuple[list[GraphNode], list[GraphWeight]]:
+    """
+    Generate a road-like network: a jittered grid with missing streets, a few diagonals,
+    and faster highways along every 8th row and column. Weight lengths follow the distance between nodes.
+
+    :param size: Approximate number of weights
+    :param rnd: Random generator
+    :return: Nodes and weights
+    """
+
+    k = max(2, round((size / 1.7)**0.5))
+    nodes = [
+        GraphNode((x * 100 + rnd.uniform(-30, 30), y * 100 + rnd.uniform(-30, 30)), str(x * k + y))
+        for x in range(k) for y in range(k)
+    ]
+    weights = []
+
+    def road(i: int, j: int, highway: bool) -> None:
+        """ Connect two nodes, with highways being faster than regular roads. """
+
+        factor = 0.5 if highway else rnd.uniform(1, 1.5)
+        connect(nodes, weights, i, j, max(1, round(distance(nodes[i], nodes[j]) * factor / 10)))
+
+    for x in range(k):
+        for y in range(k):
+            i = x * k + y
+
+            if x + 1 < k and (y % 8 == 0 or rnd.random() < 0.8):
+                road(i, i + k, y % 8 == 0)
+            if y + 1 < k and (x % 8 == 0 or rnd.random() < 0.8):
+                road(i, i + 1, x % 8 == 0)
+            if x + 1 < k and y + 1 < k and rnd.random() < 0.1:
+                road(i, i + k + 1, False)
+
+    return nodes, weights
+
+
+FAMILIES = {
+    "grid": generate_grid,
+    "geometric": generate_geometric,
+    "scale_free": generate_scale_free,
+    "road": generate_road
+}
+
+
+def pick_endpoints(nodes: list[GraphNode], rnd: random.Random) -> None:
+    """
+    Mark a random start node, and a random end node reachable from it.
+
+    :param nodes: Nodes in graph
+    :param rnd: Random generator
+    :return: None
+    """
+
+    start = rnd.choice(nodes)
+
+    # Collect the component of the start node, such that a path always exists
+    component = [start]
+    seen = {start}
+
+    for node in component:
+        for weight in node.weights:
+            other = weight.get_other_node(node)
+            if other not in seen:
+                seen.add(other)
+                component.append(other)
+
+    end = rnd.choice(component[1:]) if len(component) > 1 else start
+
+    start.is_start = True
+    end.is_end = True
+
+
+def measure(algorithm_cls: type[Algorithm], nodes: list[GraphNode], weights: list[GraphWeight], memory: bool) -> dict:
+    """
+    Run an algorithm on a graph and measure it.
+
+    :param algorithm_cls: Algorithm class to run
+    :param nodes: Nodes in graph
+    :param weights: Weights in graph
+    :param memory: Whether to measure peak memory (separate run)
+    :return: Measurements
+    """
+
+    algorithm = algorithm_cls(nodes, weights)
+
+    start_time = time.perf_counter()
+    recording = algorithm.run()
+    wall_time = time.perf_counter() - start_time
+
+    solution = find_solution(recording) if recording else None
+
+    result = {
+        "algorithm": algorithm_cls.__name__,
+        "time": wall_time,
+        "expanded": algorithm.expanded,
+        "recording": len(recording) if recording else 0,
+        "found": solution is not None,
+        "length": solution.length if solution is not None else None
+    }
+
+    algorithm.clear()
+
+    # Tracing allocations slows the solver down, so memory is measured in a separate run
+    if memory:
+        algorithm = algorithm_cls(nodes, weights)
+
+        tracemalloc.start()
+        algorithm.run()
+        result["peak_memory"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        algorithm.clear()
+
+    return result
+
+
+def main(argv: list[str] = None) -> int:
+    """
+    Parse command-line arguments and run the benchmarks.
+
+    :param argv: Command-line arguments (defaults to sys.argv)
+    :return: Exit code
+    """
+
+    parser = argparse.ArgumentParser(description="Benchmark the pathfinding algorithms on synthetic graphs.")
+    parser.add_argument("--families", nargs="+", choices=FAMILIES, default=list(FAMILIES), help="Graph families")
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES, help="Approximate numbers of weights")
+    parser.add_argument("--algos", nargs="+", choices=ALGORITHMS, default=DEFAULT_ALGORITHMS, help="Algorithms to run")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for graph generation")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the peak memory measurement")
+    parser.add_argument("--output", help="File to write JSON results to (defaults to stdout)")
+    args = parser.parse_args(argv)
+
+    results = []
+
+    for family in args.families:
+        for size in args.sizes:
+            rnd = random.Random(f"{args.seed}-{family}-{size}")
+            nodes, weights = FAMILIES[family](size, rnd)
+            pick_endpoints(nodes, rnd)
+
+            for name in args.algos:
+                print(f"{family} {size}: {name}", file=sys.stderr)
+
+                result = measure(ALGORITHMS[name], nodes, weights, not args.no_memory)
+                result.update({"family": family, "size": size, "nodes": len(nodes), "weights": len(weights)})
+                results.append(result)
+
+    report = {
+        "seed": args.seed,
+        "python": platform.python_version(),
+        "results": results
+    }
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
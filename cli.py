@@ -0,0 +1,318 @@
+import argparse
+import json
+import sys
+from algo import (Algorithm, BFS, AStar, Dijkstra, Greedy, DFS, BranchAndBoundDFS, BidirectionalDijkstra, BidirectionalAStar,
+                  find_solution, shortest_path)
+from contraction import ContractionHierarchies
+from dynamic import LPAStar
+from graph import GraphNode
+from importers import read_dimacs, read_edge_list
+from matrix import DistanceMatrix
+from portfolio import Portfolio, ALGORITHMS as PORTFOLIO_ALGORITHMS
+from storage import load_graph, GraphFile, FLAG_START, FLAG_END
+
+"""
+Command-line entry point for running the solvers without pygame. Examples:
+    python -m cli solve graph.json --algo dijkstra
+    python -m cli matrix graph.json --sources A B --targets C D
+    python -m cli portfolio graph.json --first
+    python -m cli convert road.gr --coordinates road.co --output road.graph
+Graph files ending with .json use the format described in graph.py, other files the binary format in storage.py.
+Binary files are solved with Dijkstra directly on the mapped arrays, without creating node and weight objects.
+"""
+
+ALGORITHMS = {
+    "dijkstra": Dijkstra,
+    "astar": AStar,
+    "bfs": BFS,
+    "dfs": DFS,
+    "dfsbb": BranchAndBoundDFS,
+    "greedy": Greedy,
+    "bidijkstra": BidirectionalDijkstra,
+    "biastar": BidirectionalAStar,
+    "ch": ContractionHierarchies,
+    "lpastar": LPAStar
+}
+
+
+def mark_node(nodes: list[GraphNode], name: str, attr: str) -> None:
+    """
+    Mark the node with the given name as start or end, unmarking all others.
+
+    :param nodes: Nodes in graph
+    :param name: Name of the node to mark
+    :param attr: Attribute to set ("is_start" or "is_end")
+    :return: None
+    """
+
+    if not any(node.name == name for node in nodes):
+        raise SystemExit(f"No node named {name!r}")
+
+    for node in nodes:
+        setattr(node, attr, node.name == name)
+
+
+def print_solution(args: argparse.Namespace, names: list[str] | None, length: int | None, steps: int) -> int:
+    """
+    Print the result of solving a graph file.
+
+    :param args: Parsed command-line arguments
+    :param names: Names of the nodes in the path found, or None if no path was found
+    :param length: Length of the path found
+    :param steps: Number of paths explored
+    :return: Exit code
+    """
+
+    if args.json:
+        result = {"algo": args.algo, "found": names is not None, "steps": steps}
+
+        if names is not None:
+            result["length"] = length
+            result["path"] = names
+
+        print(json.dumps(result))
+
+    elif names is None:
+        print("No path found")
+
+    else:
+        print(" -> ".join(names))
+        print(f"Length: {length}, steps: {steps}")
+
+    return 0 if names is not None else 1
+
+
+def solve_compiled(args: argparse.Namespace) -> int:
+    """
+    Solve a graph file in the binary format with Dijkstra, on the mapped arrays of the file.
+
+    :param args: Parsed command-line arguments
+    :return: Exit code
+    """
+
+    with GraphFile(args.graph) as graph_file:
+        for name in (args.start, args.end):
+            if name is not None and graph_file.find_node(name) is None:
+                raise SystemExit(f"No node named {name!r}")
+
+        start = graph_file.find_flag(FLAG_START) if args.start is None else graph_file.find_node(args.start)
+        end = graph_file.find_flag(FLAG_END) if args.end is None else graph_file.find_node(args.end)
+
+        if start is None or end is None:
+            raise SystemExit("Graph needs both a start and an end node")
+
+        length, path, steps = shortest_path(graph_file.to_compiled(), start, end)
+        names = [graph_file.get_name(i) for i in path] if length is not None else None
+
+    return print_solution(args, names, length, steps)
+
+
+def solve(args: argparse.Namespace) -> int:
+    """
+    Solve a graph file and print the result.
+
+    :param args: Parsed command-line arguments
+    :return: Exit code
+    """
+
+    # Loading a large binary file as objects takes far longer than solving it
+    if args.algo == "dijkstra" and not args.graph.lower().endswith(".json"):
+        return solve_compiled(args)
+
+    nodes, weights = load_graph(args.graph)
+
+    if args.start is not None:
+        mark_node(nodes, args.start, "is_start")
+    if args.end is not None:
+        mark_node(nodes, args.end, "is_end")
+
+    algorithm: Algorithm = ALGORITHMS[args.algo](nodes, weights)
+
+    if algorithm.find_start() is None or algorithm.find_end() is None:
+        raise SystemExit("Graph needs both a start and an end node")
+
+    recording = algorithm.run()
+    solution = find_solution(recording) if recording else None
+
+    if solution is None:
+        return print_solution(args, None, None, len(recording or []))
+
+    return print_solution(args, [node.name for node in solution.nodes], solution.length, len(recording))
+
+
+def find_nodes(nodes: list[GraphNode], names: list[str]) -> list[GraphNode]:
+    """
+    Find nodes by name.
+
+    :param nodes: Nodes in graph
+    :param names: Names of the nodes to find
+    :return: Nodes in the order of the given names
+    """
+
+    by_name = {node.name: node for node in nodes}
+
+    for name in names:
+        if name not in by_name:
+            raise SystemExit(f"No node named {name!r}")
+
+    return [by_name[name] for name in names]
+
+
+def matrix(args: argparse.Namespace) -> int:
+    """
+    Compute a distance matrix between nodes of a graph file and print it as JSON.
+
+    :param args: Parsed command-line arguments
+    :return: Exit code
+    """
+
+    nodes, weights = load_graph(args.graph)
+
+    sources = find_nodes(nodes, args.sources)
+    targets = find_nodes(nodes, args.targets)
+
+    lengths, paths = DistanceMatrix(nodes, weights).compute(sources, targets, args.paths, args.processes)
+    result = {"sources": args.sources, "targets": args.targets, "lengths": lengths}
+
+    if paths is not None:
+        result["paths"] = [[path and [node.name for node in path.nodes] for path in row] for row in paths]
+
+    print(json.dumps(result))
+    return 0
+
+
+def portfolio(args: argparse.Namespace) -> int:
+    """
+    Run several algorithms on a graph file at once, and print their results side by side.
+
+    :param args: Parsed command-line arguments
+    :return: Exit code
+    """
+
+    nodes, weights = load_graph(args.graph)
+
+    if args.start is not None:
+        mark_node(nodes, args.start, "is_start")
+    if args.end is not None:
+        mark_node(nodes, args.end, "is_end")
+
+    runner = Portfolio(nodes, weights)
+
+    if runner.start_node is None or runner.end_node is None:
+        raise SystemExit("Graph needs both a start and an end node")
+
+    results = []
+    stream = runner.stream(args.algos, args.processes)
+
+    # Results arrive as the algorithms finish, stop at the first proven answer if asked to
+    for result in stream:
+        results.append(result)
+
+        if args.first and result["optimal"]:
+            stream.close()
+            break
+
+    if args.json:
+        for result in results:
+            path = result.pop("path")
+            result["path"] = [node.name for node in path.nodes] if path is not None else None
+
+        print(json.dumps(results))
+        return 0
+
+    print(f"{'Algorithm':<10} {'Optimal':<8} {'Time (s)':>9} {'Expanded':>9} {'Steps':>8} {'Length':>8}")
+
+    for result in results:
+        length = result["length"] if result["found"] else "-"
+        optimal = "yes" if result["optimal"] else "no"
+        print(f"{result['algorithm']:<10} {optimal:<8} {result['time']:>9.4f} {result['expanded']:>9} "
+              f"{result['recording']:>8} {length:>8}")
+
+    # Fastest proven path, or the fastest path of any algorithm if none of the optimal ones finished
+    proven = [result for result in results if result["optimal"]] or results
+    best = min((result for result in proven if result["found"]), key=lambda result: result["length"], default=None)
+
+    if best is None:
+        print("No path found")
+        return 1
+
+    print(" -> ".join(node.name for node in best["path"].nodes))
+    return 0
+
+
+def convert(args: argparse.Namespace) -> int:
+    """
+    Import a DIMACS (.gr) or CSV edge list file, and save it in the binary format.
+
+    :param args: Parsed command-line arguments
+    :return: Exit code
+    """
+
+    try:
+        if args.source.lower().endswith(".csv"):
+            graph = read_edge_list(args.source, args.coordinates, tuple(args.columns), scale=args.scale)
+        else:
+            graph = read_dimacs(args.source, args.coordinates, symmetric=not args.asymmetric)
+    except ValueError as error:
+        raise SystemExit(str(error))
+
+    graph.save(args.output)
+    print(f"Saved {graph.node_count} nodes and {len(graph.starts)} weights to {args.output}")
+    return 0
+
+
+def main(argv: list[str] = None) -> int:
+    """
+    Parse command-line arguments and run the given command.
+
+    :param argv: Command-line arguments (defaults to sys.argv)
+    :return: Exit code
+    """
+
+    parser = argparse.ArgumentParser(prog="cli", description="Run pathfinding algorithms without a display.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    solve_parser = commands.add_parser("solve", help="Find a path through a graph file")
+    solve_parser.add_argument("graph", help="Path to graph file (JSON or binary)")
+    solve_parser.add_argument("--algo", choices=ALGORITHMS, default="dijkstra", help="Algorithm to run")
+    solve_parser.add_argument("--start", help="Name of start node (overrides the file)")
+    solve_parser.add_argument("--end", help="Name of end node (overrides the file)")
+    solve_parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    solve_parser.set_defaults(func=solve)
+
+    matrix_parser = commands.add_parser("matrix", help="Compute distances between sets of nodes in a graph file")
+    matrix_parser.add_argument("graph", help="Path to graph file (JSON or binary)")
+    matrix_parser.add_argument("--sources", nargs="+", required=True, help="Names of nodes to find paths from")
+    matrix_parser.add_argument("--targets", nargs="+", required=True, help="Names of nodes to find paths to")
+    matrix_parser.add_argument("--paths", action="store_true", help="Also print the paths")
+    matrix_parser.add_argument("--processes", type=int, help="Number of processes (1 to disable the pool)")
+    matrix_parser.set_defaults(func=matrix)
+
+    portfolio_parser = commands.add_parser("portfolio", help="Run several algorithms at once and compare them")
+    portfolio_parser.add_argument("graph", help="Path to graph file (JSON or binary)")
+    portfolio_parser.add_argument("--algos", nargs="+", choices=PORTFOLIO_ALGORITHMS, default=list(PORTFOLIO_ALGORITHMS),
+                                  help="Algorithms to run")
+    portfolio_parser.add_argument("--start", help="Name of start node (overrides the file)")
+    portfolio_parser.add_argument("--end", help="Name of end node (overrides the file)")
+    portfolio_parser.add_argument("--processes", type=int, help="Number of processes (defaults to one per algorithm)")
+    portfolio_parser.add_argument("--first", action="store_true",
+                                  help="Stop once an algorithm guaranteed to find the fastest path has finished")
+    portfolio_parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    portfolio_parser.set_defaults(func=portfolio)
+
+    convert_parser = commands.add_parser("convert", help="Import a DIMACS or CSV road network to the binary format")
+    convert_parser.add_argument("source", help="Path to DIMACS graph (.gr) or CSV edge list (.csv)")
+    convert_parser.add_argument("--coordinates", help="Path to DIMACS coordinates (.co) or CSV of node coordinates")
+    convert_parser.add_argument("--output", required=True, help="Path to write the binary graph file to")
+    convert_parser.add_argument("--columns", nargs=3, default=["source", "target", "length"],
+                                help="Names of the CSV columns holding start node, end node and length")
+    convert_parser.add_argument("--scale", type=float, default=1, help="Factor to multiply CSV lengths by")
+    convert_parser.add_argument("--asymmetric", action="store_true", help="Keep every DIMACS arc as a weight")
+    convert_parser.set_defaults(func=convert)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+from graph import GraphNode, GraphWeight
+
+"""
+Index of the connected components of a graph, used to tell whether the end node can be reached before searching.
+
+Components are kept in a union-find structure (disjoint sets with path halving and union by size),
+such that adding a weight and testing whether two nodes are connected take nearly constant time.
+Removing a node or weight may split a component, which union-find cannot undo, so the index is then rebuilt
+from the graph on the next query instead. Nodes not yet seen by the index form components of their own.
+"""
+
+
+class ComponentIndex:
+    """ Connected components of a graph of nodes, updated as weights are added and removed. """
+
+    def __init__(self, nodes: list[GraphNode], weights: list[GraphWeight]):
+        """
+        Initialize an instance of the ComponentIndex class, indexing the current graph.
+
+        :param nodes: Nodes in graph (kept by reference, to rebuild from)
+        :param weights: Weights in graph (kept by reference, to rebuild from)
+        """
+
+        self.nodes = nodes
+        self.weights = weights
+
+        # parents stores the parent of each node in its set, roots are their own parent
+        self.parents = {}
+
+        # sizes stores the number of nodes in the set of each root
+        self.sizes = {}
+
+        # Whether nodes or weights have been removed since the index was built
+        self.dirty = False
+
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """
+        Rebuild the index from the current nodes and weights.
+
+        :return: None
+        """
+
+        self.parents = {node: node for node in self.nodes}
+        self.sizes = dict.fromkeys(self.nodes, 1)
+        self.dirty = False
+
+        for weight in self.weights:
+            self.union(weight.start_node, weight.end_node)
+
+    def find(self, node: GraphNode) -> GraphNode:
+        """
+        Find the root of the set containing a node.
+
+        :param node: Node to find
+        :return: Root node of its set
+        """
+
+        parents = self.parents
+
+        if node not in parents:
+            parents[node] = node
+            self.sizes[node] = 1
+            return node
+
+        # Path halving: point every other node on the way to its grandparent
+        while parents[node] is not node:
+            parents[node] = parents[parents[node]]
+            node = parents[node]
+
+        return node
+
+    def union(self, node1: GraphNode, node2: GraphNode) -> None:
+        """
+        Merge the sets containing two nodes.
+
+        :param node1: Node 1
+        :param node2: Node 2
+        :return: None
+        """
+
+        root1 = self.find(node1)
+        root2 = self.find(node2)
+
+        if root1 is root2:
+            return
+
+        # Attach the smaller set below the larger, keeping the trees shallow
+        if self.sizes[root1] < self.sizes[root2]:
+            root1, root2 = root2, root1
+
+        self.parents[root2] = root1
+        self.sizes[root1] += self.sizes.pop(root2)
+
+    def add_weight(self, weight: GraphWeight) -> None:
+        """
+        Register an added weight, connecting the components of its nodes.
+
+        :param weight: Added weight
+        :return: None
+        """
+
+        if not self.dirty:
+            self.union(weight.start_node, weight.end_node)
+
+    def remove(self) -> None:
+        """
+        Register that a node or weight has been removed, such that the index is rebuilt on the next query.
+
+        :return: None
+        """
+
+        self.dirty = True
+
+    def connected(self, node1: GraphNode, node2: GraphNode) -> bool:
+        """
+        Check whether a path exists between two nodes.
+
+        :param node1: Node 1 (or None)
+        :param node2: Node 2 (or None)
+        :return: Whether the nodes are in the same component, False if either node is missing
+        """
+
+        # Missing nodes are not added to the index as components of their own
+        if node1 is None or node2 is None:
+            return False
+
+        if self.dirty:
+            self.rebuild()
+
+        return self.find(node1) is self.find(node2)
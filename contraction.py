@@ -0,0 +1,440 @@
+import heapq
+from typing import Iterator
+from algo import Path, Algorithm, CompiledGraph
+from graph import GraphNode, GraphWeight
+
+"""
+Contraction hierarchies speed up repeated queries on a graph that rarely changes.
+
+Preprocessing contracts the nodes one at a time, in order of importance. When a node is contracted,
+shortcuts are added between its remaining neighbours wherever the node lies on their only shortest connection.
+A query then only has to search upwards in the hierarchy from both the start and end node,
+which visits a tiny fraction of the graph.
+
+Contracting a node of high degree needs a shortcut between almost every pair of its neighbours, so nodes whose
+degree exceeds a limit are never contracted. They are left in a core at the top of the hierarchy, connected by their
+remaining weights and shortcuts, which the query searches like a plain bidirectional Dijkstra. Witness searches are
+bounded by the number of nodes settled and weights followed, and do not search on from nodes in the core.
+A witness missed by a bounded search only adds a shortcut that was not needed, never a wrong one.
+
+Connections are referenced by integers:
+    ref >= 0: Index of an original weight in the compiled graph
+    ref < 0: Shortcut number -ref - 1
+"""
+
+
+class ContractionHierarchy:
+    """
+    Contraction hierarchy built over a compiled graph, answering shortest path queries between node indices.
+
+    Attributes:
+        witness_limit: Maximum number of nodes settled by each witness search
+        witness_hops: Maximum number of weights and shortcuts followed by each witness search
+        core_degree: Degree above which a node is left in the core instead of being contracted
+    """
+
+    witness_limit = 64
+    witness_hops = 5
+    core_degree = 16
+
+    def __init__(self, graph: CompiledGraph):
+        """
+        Initialize an instance of the ContractionHierarchy class, preprocessing the given graph.
+
+        :param graph: Compiled graph to build the hierarchy over
+        """
+
+        n = len(graph.nodes)
+
+        # Remaining (uncontracted) graph, keeping only the fastest connection between two nodes
+        self.adjacency = [{} for _ in range(n)]
+
+        for node in range(n):
+            for i in range(graph.offsets[node], graph.offsets[node + 1]):
+                other = graph.targets[i]
+                known = self.adjacency[node].get(other)
+
+                if other != node and (known is None or graph.lengths[i] < known[0]):
+                    self.adjacency[node][other] = (graph.lengths[i], graph.edges[i])
+
+        # Shortcuts store (first node, middle node, last node, first ref, last ref)
+        self.shortcuts = []
+
+        self.rank = [0] * n
+
+        # Number of nodes left uncontracted in the core
+        self.core_size = 0
+
+        self.up_offsets = [0]
+        self.up_targets = []
+        self.up_lengths = []
+        self.up_refs = []
+
+        self.contract_all()
+
+        # The remaining graph is only needed during preprocessing
+        self.adjacency = None
+
+    def find_shortcuts(self, node: int) -> list[tuple[int, int, int, int, int]]:
+        """
+        Find the shortcuts needed to contract a node.
+
+        :param node: Index of the node to contract
+        :return: List of shortcuts (first node, last node, length, first ref, last ref)
+        """
+
+        neighbours = list(self.adjacency[node].items())
+        shortcuts = []
+
+        for k, (first, (first_length, first_ref)) in enumerate(neighbours):
+            targets = {last: first_length + length for last, (length, _) in neighbours[k + 1:]}
+
+            if not targets:
+                continue
+
+            witnesses = self.witness_search(first, node, targets)
+
+            for last, (last_length, last_ref) in neighbours[k + 1:]:
+                # A path avoiding the node is at least as fast, no shortcut needed
+                if witnesses.get(last, targets[last] + 1) <= targets[last]:
+                    continue
+
+                # The search does not leave the core, so a direct connection may not be found as a witness
+                known = self.adjacency[first].get(last)
+                if known is not None and known[0] <= targets[last]:
+                    continue
+
+                shortcuts.append((first, last, targets[last], first_ref, last_ref))
+
+        return shortcuts
+
+    def witness_search(self, source: int, avoid: int, targets: dict[int, int]) -> dict[int, int]:
+        """
+        Bounded Dijkstra search in the remaining graph, avoiding a single node.
+
+        :param source: Index of the node to search from
+        :param avoid: Index of the node to avoid
+        :param targets: Nodes to find witnesses for, and the length of the path through the avoided node to them
+        :return: Lengths to the reached nodes
+        """
+
+        max_length = max(targets.values())
+        remaining = len(targets)
+
+        lengths = {source: 0}
+        settled = {}
+        queue = [(0, 0, source)]
+
+        while queue and len(settled) < self.witness_limit:
+            length, hops, node = heapq.heappop(queue)
+
+            if node in settled:
+                continue
+
+            settled[node] = length
+
+            # Stop once no witness can be shorter, or once the lengths to all targets are final
+            if length > max_length:
+                break
+
+            if node in targets:
+                remaining -= 1
+                if not remaining:
+                    break
+
+            # Nodes in the core are reached, but searching on from them would follow all of their many weights
+            adjacency = self.adjacency[node]
+            if hops == self.witness_hops or len(adjacency) > self.core_degree:
+                continue
+
+            for other, (weight_length, _) in adjacency.items():
+                new_length = length + weight_length
+
+                if other != avoid and new_length < lengths.get(other, new_length + 1):
+                    lengths[other] = new_length
+                    heapq.heappush(queue, (new_length, hops + 1, other))
+
+        return lengths
+
+    def priority(self, node: int, shortcuts: list, contracted_neighbours: list[int]) -> int:
+        """
+        Priority of a node for contraction, lowest first.
+        Combines the edge difference with the number of contracted neighbours, to spread contraction evenly.
+
+        :param node: Index of the node
+        :param shortcuts: Shortcuts needed to contract the node
+        :param contracted_neighbours: Number of contracted neighbours of each node
+        :return: Priority of the node
+        """
+
+        return len(shortcuts) - len(self.adjacency[node]) + contracted_neighbours[node]
+
+    def estimate_priority(self, node: int, contracted_neighbours: list[int]) -> int:
+        """
+        Priority of a node for contraction, without searching for witnesses if the node belongs in the core.
+        Nodes in the core are then given the priority as if every pair of neighbours needed a shortcut.
+
+        :param node: Index of the node
+        :param contracted_neighbours: Number of contracted neighbours of each node
+        :return: Priority of the node
+        """
+
+        degree = len(self.adjacency[node])
+
+        if degree > self.core_degree:
+            return degree * (degree - 1) // 2 - degree + contracted_neighbours[node]
+
+        return self.priority(node, self.find_shortcuts(node), contracted_neighbours)
+
+    def contract_all(self) -> None:
+        """
+        Contract all nodes in order of priority, building the upward graph.
+        Nodes whose degree exceeds core_degree once they are due are left in the core, ranked above all others.
+
+        :return: None
+        """
+
+        n = len(self.adjacency)
+        contracted_neighbours = [0] * n
+        queue = [(self.estimate_priority(node, contracted_neighbours), node) for node in range(n)]
+        heapq.heapify(queue)
+
+        up = [None] * n
+        core = []
+        order = 0
+
+        while queue:
+            _, node = heapq.heappop(queue)
+
+            if len(self.adjacency[node]) > self.core_degree:
+                core.append(node)
+                continue
+
+            # Priorities change as neighbours are contracted, lazily recompute before contracting
+            shortcuts = self.find_shortcuts(node)
+            priority = self.priority(node, shortcuts, contracted_neighbours)
+            if queue and priority > queue[0][0]:
+                heapq.heappush(queue, (priority, node))
+                continue
+
+            for first, last, length, first_ref, last_ref in shortcuts:
+                self.shortcuts.append((first, node, last, first_ref, last_ref))
+                ref = -len(self.shortcuts)
+
+                self.adjacency[first][last] = (length, ref)
+                self.adjacency[last][first] = (length, ref)
+
+            # All remaining neighbours are contracted later, and thus higher in the hierarchy
+            up[node] = self.adjacency[node]
+            self.rank[node] = order
+            order += 1
+
+            for other in up[node]:
+                del self.adjacency[other][node]
+                contracted_neighbours[other] += 1
+
+        # Weights and shortcuts between nodes in the core are searched in both directions
+        for node in core:
+            up[node] = self.adjacency[node]
+            self.rank[node] = order
+            order += 1
+
+        self.core_size = len(core)
+
+        for node in range(n):
+            for other, (length, ref) in up[node].items():
+                self.up_targets.append(other)
+                self.up_lengths.append(length)
+                self.up_refs.append(ref)
+
+            self.up_offsets.append(len(self.up_targets))
+
+    def unpack(self, ref: int, first: int, last: int) -> list[tuple[int, int]]:
+        """
+        Unpack a connection into the original weights it consists of.
+
+        :param ref: Reference to the connection
+        :param first: Index of the node the connection is traversed from
+        :param last: Index of the node the connection is traversed to
+        :return: List of steps (weight index, node index reached)
+        """
+
+        steps = []
+        stack = [(ref, first, last)]
+
+        while stack:
+            ref, first, last = stack.pop()
+
+            if ref >= 0:
+                steps.append((ref, last))
+                continue
+
+            start, middle, end, start_ref, end_ref = self.shortcuts[-ref - 1]
+
+            # Push in reverse order, such that the first half is unpacked first
+            if first == start:
+                stack.append((end_ref, middle, end))
+                stack.append((start_ref, start, middle))
+            else:
+                stack.append((start_ref, middle, start))
+                stack.append((end_ref, end, middle))
+
+        return steps
+
+    def query(self, source: int, target: int) -> tuple[int | None, list[tuple[int, int]], int]:
+        """
+        Find the fastest path between two nodes, by searching upwards from both.
+
+        :param source: Index of the start node
+        :param target: Index of the end node
+        :return: Length of the path (or None), steps (weight index, node index) from source, and settled node count
+        """
+
+        if source == target:
+            return 0, [], 0
+
+        lengths = ({source: 0}, {target: 0})
+        parents = ({}, {})
+        queues = ([(0, source)], [(0, target)])
+        settled = 0
+
+        best_length = None
+        meeting = None
+
+        while queues[0] or queues[1]:
+            keys = [queue[0][0] if queue else None for queue in queues]
+            side = 0 if keys[1] is None or (keys[0] is not None and keys[0] <= keys[1]) else 1
+
+            # Stop once neither side can improve on the best connection
+            if best_length is not None and keys[side] >= best_length:
+                break
+
+            length, node = heapq.heappop(queues[side])
+
+            if length > lengths[side][node]:
+                continue
+
+            settled += 1
+
+            # The other side has reached the node, the searches connect
+            other_length = lengths[1 - side].get(node)
+            if other_length is not None and (best_length is None or length + other_length < best_length):
+                best_length = length + other_length
+                meeting = node
+
+            for i in range(self.up_offsets[node], self.up_offsets[node + 1]):
+                other = self.up_targets[i]
+                new_length = length + self.up_lengths[i]
+
+                if new_length < lengths[side].get(other, new_length + 1):
+                    lengths[side][other] = new_length
+                    parents[side][other] = (node, self.up_refs[i])
+                    heapq.heappush(queues[side], (new_length, other))
+
+        if meeting is None:
+            return None, [], settled
+
+        # Collect connections from source to meeting, then from meeting to target
+        connections = []
+        node = meeting
+        while node != source:
+            prev, ref = parents[0][node]
+            connections.append((ref, prev, node))
+            node = prev
+        connections.reverse()
+
+        node = meeting
+        while node != target:
+            prev, ref = parents[1][node]
+            connections.append((ref, node, prev))
+            node = prev
+
+        steps = []
+        for ref, first, last in connections:
+            steps.extend(self.unpack(ref, first, last))
+
+        return best_length, steps, settled
+
+
+class ContractionHierarchies(Algorithm):
+    """
+    Class to answer pathfinding queries on a graph of nodes using a contraction hierarchy.
+
+    The hierarchy is built on the first run, and reused until the owner of the graph reports a change,
+    like the kept search state of LPA* (see update_weight and invalidate).
+    The recording steps along the fastest path, ending with the full path from start to end.
+    """
+
+    def __init__(self, nodes: list[GraphNode], weights: list[GraphWeight]):
+        """
+        Initialize an instance of the ContractionHierarchies class.
+
+        :param nodes: Nodes in graph
+        :param weights: Weights in graph
+        """
+
+        self.hierarchy = None
+
+        # Compiled graph the hierarchy was built from, kept along with it between runs
+        self.hierarchy_graph = None
+
+        super().__init__(nodes, weights)
+
+    def invalidate(self) -> None:
+        """
+        Discard the hierarchy, such that it is rebuilt on the next run. Must be called when nodes are added or removed.
+
+        :return: None
+        """
+
+        self.hierarchy = None
+        self.hierarchy_graph = None
+
+    def update_weight(self, weight: GraphWeight) -> None:
+        """
+        Report a weight as added, removed or changed in length, such that the hierarchy is rebuilt on the next run.
+
+        :param weight: Changed weight
+        :return: None
+        """
+
+        self.invalidate()
+
+    def prepare(self) -> ContractionHierarchy:
+        """
+        Compile the graph and build the hierarchy, unless it is kept from an earlier run.
+
+        :return: Contraction hierarchy of the graph
+        """
+
+        if self.hierarchy is None:
+            self.hierarchy_graph = self.compile()
+            self.hierarchy = ContractionHierarchy(self.hierarchy_graph)
+
+        return self.hierarchy
+
+    def stream(self) -> Iterator[Path]:
+        """
+        Run the pathfinding algorithm, yielding paths as they are explored.
+
+        :return: Generator of explored paths
+        """
+
+        self.clear()
+
+        hierarchy = self.prepare()
+        graph = self.graph = self.hierarchy_graph
+        start = graph.index[self.find_start()]
+        end = graph.index[self.find_end()]
+
+        length, steps, self.expanded = hierarchy.query(start, end)
+
+        if length is None:
+            return
+
+        self.found = True
+
+        path = Path(graph.nodes[start])
+        for weight, node in steps:
+            path = Path(graph.nodes[node], graph.weights[weight], path)
+            yield path
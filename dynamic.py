@@ -0,0 +1,281 @@
+import heapq
+from typing import Iterator
+from algo import Path, Algorithm
+from graph import GraphNode, GraphWeight
+
+"""
+Dynamic shortest paths with Lifelong Planning A* (LPA*), using a zero heuristic.
+
+Every node stores two values:
+    g: Length of the fastest path found to the node
+    rhs: One-step lookahead, the lowest g of a neighbour plus the length of the weight to it
+A node is consistent when g equals rhs. Only inconsistent nodes are queued and expanded.
+When a weight changes, only its two nodes are updated, and the search repairs the region affected by the change.
+Without a heuristic, the search state does not depend on the end node, so only a new start node requires a fresh search.
+
+LPA* requires positive weight costs, but weights may have a length of 0. Costs therefore carry the number of weights
+in the lowest bits (cost = length * HOPS + 1), which also breaks ties towards paths with fewer weights.
+"""
+
+HOPS = 1 << 32
+INFINITY = float("inf")
+
+
+class LPAStar(Algorithm):
+    """
+    Class to perform the Lifelong Planning A* pathfinding algorithm on a graph of nodes.
+
+    The search state is kept between runs. The editor reports changed weights through update_weight,
+    and the next run only repairs the nodes affected by the changes instead of searching from scratch.
+    The recording holds the nodes updated by the run, followed by the fastest path.
+    """
+
+    def __init__(self, nodes: list[GraphNode], weights: list[GraphWeight]):
+        """
+        Initialize an instance of the LPAStar class.
+
+        :param nodes: Nodes in graph
+        :param weights: Weights in graph
+        """
+
+        # Start node of the kept search state
+        self.start = None
+
+        # g and rhs values of nodes (as costs), missing nodes are infinitely far
+        self.g = {}
+        self.rhs = {}
+
+        # queue stores inconsistent nodes by key, outdated entries are skipped when popped
+        self.queue = []
+
+        # Counter breaks ties between equal keys, and keeps nodes from being compared
+        self.counter = 0
+
+        # Nodes of weights changed since the last run
+        self.changed = set()
+
+        # Paths to nodes updated during the current run
+        self.paths = {}
+
+        super().__init__(nodes, weights)
+
+    def reset(self) -> None:
+        """
+        Discard the kept search state, such that the next run searches from scratch.
+
+        :return: None
+        """
+
+        self.start = None
+        self.g.clear()
+        self.rhs.clear()
+        self.queue.clear()
+        self.counter = 0
+        self.changed.clear()
+
+    def clear(self) -> None:
+        """
+        Clear properties of the current run. The search state is kept, see reset.
+
+        :return: None
+        """
+
+        self.paths.clear()
+
+        Algorithm.clear(self)
+
+    def update_weight(self, weight: GraphWeight) -> None:
+        """
+        Report a weight as added, removed or changed in length, to be repaired on the next run.
+
+        :param weight: Changed weight
+        :return: None
+        """
+
+        self.changed.add(weight.start_node)
+        self.changed.add(weight.end_node)
+
+    @staticmethod
+    def cost(weight: GraphWeight) -> int:
+        """
+        Cost of traversing a weight.
+
+        :param weight: Weight to traverse
+        :return: Cost of the weight
+        """
+
+        return int(weight.length) * HOPS + 1
+
+    def key(self, node: GraphNode) -> float:
+        """
+        Priority of a node in the queue (lowest first).
+
+        :param node: Node to prioritize
+        :return: Key of the node
+        """
+
+        return min(self.g.get(node, INFINITY), self.rhs.get(node, INFINITY))
+
+    def update_node(self, node: GraphNode) -> None:
+        """
+        Recalculate the rhs value of a node from its neighbours, and queue the node if it is inconsistent.
+
+        :param node: Node to update
+        :return: None
+        """
+
+        if node is not self.start:
+            rhs = INFINITY
+
+            for weight in node.weights:
+                length = self.g.get(weight.get_other_node(node), INFINITY) + self.cost(weight)
+                if length < rhs:
+                    rhs = length
+
+            self.rhs[node] = rhs
+
+        g = self.g.get(node, INFINITY)
+        if g != self.rhs[node]:
+            self.counter += 1
+            heapq.heappush(self.queue, (min(g, self.rhs[node]), self.counter, node))
+
+    def top_key(self) -> float:
+        """
+        Get the lowest key in the queue, discarding outdated entries.
+
+        :return: Lowest key, or infinity if no nodes are queued
+        """
+
+        while self.queue:
+            key, _, node = self.queue[0]
+
+            # Entry is outdated if the node has since become consistent or changed key
+            if self.g.get(node, INFINITY) != self.rhs.get(node, INFINITY) and key == self.key(node):
+                return key
+
+            heapq.heappop(self.queue)
+
+        return INFINITY
+
+    def find_parent(self, node: GraphNode) -> tuple[GraphNode, GraphWeight]:
+        """
+        Find the neighbour a consistent node is reached through on its fastest path.
+
+        :param node: Node to find parent of (not start)
+        :return: Neighbouring node and weight to it
+        """
+
+        for weight in node.weights:
+            other = weight.get_other_node(node)
+            if self.g.get(other, INFINITY) + self.cost(weight) == self.g[node]:
+                return other, weight
+
+    def path_to(self, node: GraphNode) -> Path:
+        """
+        Get the fastest path to a node with a known length, following parents back to a known path.
+
+        :param node: Node to find path to
+        :return: Path from start to node
+        """
+
+        # Collect nodes back to the start, or to a node with a path found in this run
+        chain = []
+        while node not in self.paths and node is not self.start:
+            parent, weight = self.find_parent(node)
+            chain.append((node, weight))
+            node = parent
+
+        path = self.paths.get(node) or Path(node)
+
+        for node, weight in reversed(chain):
+            path = Path(node, weight, path)
+            self.paths[node] = path
+
+        return path
+
+    def expand(self, node: GraphNode) -> Path | None:
+        """
+        Make an inconsistent node consistent, and update its neighbours.
+
+        :param node: Node to expand
+        :return: Path to the node if one was found (to record), otherwise None
+        """
+
+        self.expanded += 1
+
+        # Overconsistent: a faster path has been found, settle it
+        if self.g.get(node, INFINITY) > self.rhs[node]:
+            self.g[node] = self.rhs[node]
+
+            if node is self.start:
+                self.paths[node] = Path(node)
+            else:
+                parent, weight = self.find_parent(node)
+                self.paths[node] = Path(node, weight, self.path_to(parent))
+
+            path = self.paths[node]
+
+        # Underconsistent: the known path has become slower or removed, search the node again
+        else:
+            self.g[node] = INFINITY
+            self.paths.pop(node, None)
+            self.update_node(node)
+
+            path = None
+
+        for weight in node.weights:
+            self.update_node(weight.get_other_node(node))
+
+        return path
+
+    def stream(self) -> Iterator[Path]:
+        """
+        Run the pathfinding algorithm, repairing the kept search state if possible.
+        Yields paths to nodes as they are updated.
+
+        :return: Generator of explored paths
+        """
+
+        self.clear()
+
+        start = self.find_start()
+        end = self.find_end()
+
+        # The kept search state is only valid from the same start node
+        if start is not self.start:
+            self.reset()
+            self.start = start
+            self.rhs[start] = 0
+            self.update_node(start)
+
+        # Only nodes of changed weights have to be updated, removed nodes are forgotten
+        nodes = set(self.nodes) if self.changed else ()
+
+        for node in self.changed:
+            if node in nodes:
+                self.update_node(node)
+            else:
+                self.g.pop(node, None)
+                self.rhs.pop(node, None)
+
+        self.changed.clear()
+
+        # Repeat until no queued node can lead to a faster path to the end node
+        while self.top_key() < self.key(end) or self.g.get(end, INFINITY) != self.rhs.get(end, INFINITY):
+            if not self.queue:
+                break
+
+            _, _, node = heapq.heappop(self.queue)
+            path = self.expand(node)
+
+            if path is not None:
+                yield path
+
+        if self.g.get(end, INFINITY) == INFINITY:
+            return
+
+        self.found = True
+
+        # Paths found during the run may have become outdated, so find the fastest path from scratch
+        self.paths.clear()
+        yield self.path_to(end)
@@ -1,13 +1,27 @@
 import pygame
 import sys
 from uiobjects import Node, Weight
-from algo import BFS, AStar, Dijkstra, Greedy, DFS
+from algo import BFS, AStar, Dijkstra, Greedy, DFS, BidirectionalDijkstra, BidirectionalAStar
+from components import ComponentIndex
+from contraction import ContractionHierarchies
+from dynamic import LPAStar
+from storage import save_graph, load_graph
 from string import ascii_uppercase as alphabet
 from timeline import Timeline
+from worker import SolverWorker
 
 
 class Editor:
-    """ Editor class that allows the user to create and edit graphs """
+    """
+    Editor class that allows the user to create and edit graphs
+
+    Attributes:
+        default_graph_file: File to save and load the graph, unless a file is entered in the text input
+        busy_interval: Time (milliseconds) between checks whether a cancelled search has finished
+    """
+
+    default_graph_file = "graph.json"
+    busy_interval = 100
 
     def __init__(self, ui):
         """
@@ -33,23 +47,47 @@ class Editor:
         self.start_marked = False
         self.end_marked = False
 
+        # Last worker started, which may still be finishing in the background after being cancelled.
+        # The graph is not edited and no search is started until it has finished, as it reads the nodes and weights
+        self.worker = None
+
         # Create algo objects with references to node and weight lists
         self.dijkstra = Dijkstra(self.nodes, self.weights)
         self.bfs = BFS(self.nodes, self.weights)
         self.astar = AStar(self.nodes, self.weights)
         self.dfs = DFS(self.nodes, self.weights)
         self.greedy = Greedy(self.nodes, self.weights)
+        self.bidijkstra = BidirectionalDijkstra(self.nodes, self.weights)
+        self.biastar = BidirectionalAStar(self.nodes, self.weights)
+
+        # LPA* keeps its search state between runs, and contraction hierarchies their hierarchy.
+        # Both must be told about changes to the graph (see update_weight)
+        self.lpastar = LPAStar(self.nodes, self.weights)
+        self.ch = ContractionHierarchies(self.nodes, self.weights)
+
+        # Connected components, such that an unreachable end node is detected without searching
+        self.components = ComponentIndex(self.nodes, self.weights)
+
+        for algorithm in (self.dijkstra, self.bfs, self.astar, self.dfs, self.greedy, self.bidijkstra, self.biastar,
+                          self.lpastar, self.ch):
+            algorithm.components = self.components
 
         # Apply function callbacks
         self.ui.apply_callbacks(**{
             "BUTTON_GRAPH_START": self.set_node_start,
             "BUTTON_GRAPH_END": self.set_node_end,
             "BUTTON_GRAPH_DELETE": self.delete_item,
-            "BUTTON_ALGO_DIJKSTRA": self.dijkstra.run,
-            "BUTTON_ALGO_ASTAR": self.astar.run,
-            "BUTTON_ALGO_BFS": self.bfs.run,
-            "BUTTON_ALGO_DFS": self.dfs.run,
-            "BUTTON_ALGO_GREEDY": self.greedy.run,
+            "BUTTON_GRAPH_SAVE": self.save_graph_file,
+            "BUTTON_GRAPH_LOAD": self.load_graph_file,
+            "BUTTON_ALGO_DIJKSTRA": self.dijkstra.stream,
+            "BUTTON_ALGO_ASTAR": self.astar.stream,
+            "BUTTON_ALGO_BFS": self.bfs.stream,
+            "BUTTON_ALGO_DFS": self.dfs.stream,
+            "BUTTON_ALGO_GREEDY": self.greedy.stream,
+            "BUTTON_ALGO_BIDIJKSTRA": self.bidijkstra.stream,
+            "BUTTON_ALGO_BIASTAR": self.biastar.stream,
+            "BUTTON_ALGO_LPASTAR": self.lpastar.stream,
+            "BUTTON_ALGO_CH": self.ch.stream,
             "BUTTON_GEN_EXIT": self.quit
         })
 
@@ -69,12 +107,23 @@ class Editor:
         :return: None
         """
 
+        busy = self.is_busy()
+
         self.ui.apply_masks(**{
-            "MASK_GRAPH_BUTTONS": True,
-            "MASK_ALGO_BUTTONS": self.start_marked and self.end_marked,
+            "MASK_GRAPH_BUTTONS": not busy,
+            "MASK_ALGO_BUTTONS": self.start_marked and self.end_marked and not busy,
             "MASK_TIME_BUTTONS": False
         })
 
+    def is_busy(self) -> bool:
+        """
+        Check whether the last search is still running in the background, such that the graph must not be changed.
+
+        :return: Whether the worker thread is running
+        """
+
+        return self.worker is not None and self.worker.thread.is_alive()
+
     """
     The editor supports automatically naming nodes. These will be named alphabetically and in order. Example:
         0: A
@@ -247,6 +296,42 @@ class Editor:
 
         self.apply_masks()
 
+    def update_weight(self, weight: Weight) -> None:
+        """
+        Report a weight as added, removed or changed in length to the algorithms keeping state between runs.
+
+        :param weight: Changed weight
+        :return: None
+        """
+
+        self.lpastar.update_weight(weight)
+        self.ch.update_weight(weight)
+
+    def find_node(self, pos: tuple[int, int], ignore: Node = None) -> Node | None:
+        """
+        Find the first placed node overlapping a coordinate, only testing the nodes near it (see UI.index_item).
+
+        :param pos: Coordinate to test
+        :param ignore: Node to skip (if any)
+        :return: Node at coordinate or None
+        """
+
+        for node in self.ui.node_grid.query(pos):
+            if node is not ignore and node.clicked(pos):
+                return node
+
+    def find_weight(self, pos: tuple[int, int]) -> Weight | None:
+        """
+        Find the first placed weight overlapping a coordinate, only testing the weights near it (see UI.index_item).
+
+        :param pos: Coordinate to test
+        :return: Weight at coordinate or None
+        """
+
+        for weight in self.ui.weight_grid.query(pos):
+            if weight.clicked(pos):
+                return weight
+
     def delete_item(self) -> None:
         """
         Delete currently selected object, or last placed node if no object selected.
@@ -262,6 +347,9 @@ class Editor:
             for node in self.nodes:
                 node.remove_weight(self.active)
 
+            self.update_weight(self.active)
+            self.ui.remove_item(self.active)
+            self.components.remove()
             self.set_active(None)
             return
 
@@ -281,6 +369,9 @@ class Editor:
             self.start_marked = False
 
         self.remove_name(deleted.name)
+        self.ui.remove_item(deleted)
+        self.components.remove()
+        self.ch.invalidate()
 
         # Delete all connected weights and update nodes accordingly
         for weight in deleted.weights:
@@ -288,6 +379,96 @@ class Editor:
                 node.remove_weight(weight)
 
             self.weights.remove(weight)
+            self.update_weight(weight)
+            self.ui.remove_item(weight)
+
+    @staticmethod
+    def stream_unreachable():
+        """
+        Stream of paths for an unreachable end node, which explores nothing.
+
+        :return: Empty generator
+        """
+
+        yield from ()
+
+    def get_graph_file(self) -> str:
+        """
+        Get the file to save or load the graph. When no item is selected, a file can be entered in the text input.
+        Files ending with .json are stored as JSON, other files in the binary format (see storage.py).
+
+        :return: Path of the file
+        """
+
+        if self.active is None and self.text_input.user_text:
+            return self.text_input.user_text
+
+        return self.default_graph_file
+
+    def save_graph_file(self) -> None:
+        """
+        Save the graph to a file.
+
+        :return: None
+        """
+
+        file_path = self.get_graph_file()
+
+        try:
+            save_graph(file_path, self.nodes, self.weights)
+        except OSError as error:
+            print(f"Could not save graph to {file_path}: {error}", file=sys.stderr)
+
+    def load_graph_file(self) -> None:
+        """
+        Replace the graph with one loaded from a file.
+
+        :return: None
+        """
+
+        file_path = self.get_graph_file()
+
+        try:
+            nodes, weights = load_graph(
+                file_path,
+                lambda pos, name: Node(self.ui, pos, name),
+                lambda start_node, end_node: Weight(self.ui, start_node, end_node)
+            )
+        except (OSError, ValueError, KeyError) as error:
+            print(f"Could not load graph from {file_path}: {error}", file=sys.stderr)
+            return
+
+        self.set_active(None)
+
+        # Replace the contents of the lists, as they are shared with the UI and algo objects
+        self.nodes[:] = nodes
+        self.weights[:] = weights
+
+        # Only one start and end node is allowed
+        self.start_marked = False
+        self.end_marked = False
+        self.consumed_names.clear()
+
+        for node in self.nodes:
+            if node.is_start and self.start_marked:
+                node.is_start = False
+            if node.is_end and (self.end_marked or node.is_start):
+                node.is_end = False
+
+            self.start_marked |= node.is_start
+            self.end_marked |= node.is_end
+
+            # Names given by the editor are reserved, such that new nodes are not given the same names
+            if node.name and all(char in alphabet for char in node.name) and len(node.name) <= 3:
+                self.add_name(node.name)
+
+        # The kept search state and hierarchy refer to the replaced graph
+        self.lpastar.reset()
+        self.ch.invalidate()
+        self.components.rebuild()
+
+        self.ui.invalidate()
+        self.apply_masks()
 
     def set_active(self, new: Node | Weight | None) -> None:
         """
@@ -342,15 +523,11 @@ class Editor:
         for button in self.algo_buttons:
             if button.clicked(event.pos) and self.start_marked and self.end_marked:
 
-                # Get solution from solver
-                resp = button.callback()
-
-                # If no solution has been found
-                if not resp:
-                    return False
-
-                # Create timeline and give control
-                t = Timeline(self.ui, resp)
+                # Run the solver on a background worker, and give control to a timeline showing its progress.
+                # If the end node cannot be reached, there is nothing to search (the algorithms share the component index)
+                stream = button.callback if self.dijkstra.is_reachable() else self.stream_unreachable
+                self.worker = SolverWorker(stream)
+                t = Timeline(self.ui, self.worker)
                 t.main()
                 self.apply_masks()
                 return False
@@ -360,17 +537,16 @@ class Editor:
             if button.clicked(event.pos):
                 button.callback()
 
-        # Iterate all nodes and detect presses
-        for node in self.nodes:
-            if node.clicked(event.pos):
-                self.set_active(node)
-                return False
+        # Detect presses on nodes, then weights, near the click
+        node = self.find_node(event.pos)
+        if node is not None:
+            self.set_active(node)
+            return False
 
-        # Iterate all weights and detect presses
-        for weight in self.weights:
-            if weight.clicked(event.pos):
-                self.set_active(weight)
-                return False
+        weight = self.find_weight(event.pos)
+        if weight is not None:
+            self.set_active(weight)
+            return False
 
         # If active is already None, new node should be created
         res = self.active is None
@@ -385,10 +561,19 @@ class Editor:
         :return: None
         """
 
-        # Find selected items, and check if new node is to be created
-        if self.select_item(event) and event.pos[0] > 252:
+        # Only the general buttons respond while a cancelled search is finishing
+        if self.is_busy():
+            for button in self.general_buttons:
+                if button.clicked(event.pos):
+                    button.callback()
+            return
+
+        # Find selected items, and check if new node is to be created (clear of the sidebar)
+        if self.select_item(event) and event.pos[0] > self.ui.sidebar_width + Node.radius:
             new = Node(self.ui, event.pos, self.get_next_name())
             self.nodes.append(new)
+            self.ui.add_item(new)
+            self.ch.invalidate()
 
     def on_keypress(self, event: pygame.event.Event) -> None:
         """
@@ -401,6 +586,10 @@ class Editor:
         if event.key == pygame.K_ESCAPE:
             self.quit()
 
+        # The graph cannot be edited while a cancelled search is finishing
+        if self.is_busy():
+            return
+
         # If return key is pressed, update selected item value
         if event.key == pygame.K_RETURN:
             if isinstance(self.active, Node):
@@ -415,6 +604,7 @@ class Editor:
 
             elif isinstance(self.active, Weight):
                 self.active.set_length(self.text_input.user_text)
+                self.update_weight(self.active)
 
         # If delete key is pressed, delete selected item or previous node
         elif event.key == pygame.K_DELETE:
@@ -433,28 +623,32 @@ class Editor:
         :return: None
         """
 
-        # Check is node is currently selected
-        if isinstance(self.active, Node):
-            for node in self.nodes:
-                if node is not self.active:
+        # Check is node is currently selected, and the graph can be edited
+        if not isinstance(self.active, Node) or self.is_busy():
+            return
 
-                    # Find node that user unclicked on (dragged)
-                    if node.clicked(event.pos):
+        # Find node that user unclicked on (dragged)
+        node = self.find_node(event.pos, self.active)
+        if node is None:
+            return
 
-                        # Prevent creation of overlapping weights
-                        for weight in self.weights:
-                            if weight.is_similar(self.active, node):
-                                self.set_active(weight)
-                                return
+        # Prevent creation of overlapping weights, any existing weight is connected to the selected node
+        for weight in self.active.weights:
+            if weight.is_similar(self.active, node):
+                self.set_active(weight)
+                return
 
-                        curr = Weight(self.ui, self.active, node)
+        curr = Weight(self.ui, self.active, node)
 
-                        # Add new weight to both connected nodes
-                        self.active.add_weight(curr)
-                        node.add_weight(curr)
+        # Add new weight to both connected nodes
+        self.active.add_weight(curr)
+        node.add_weight(curr)
 
-                        self.set_active(curr)
-                        self.weights.append(curr)
+        self.set_active(curr)
+        self.weights.append(curr)
+        self.update_weight(curr)
+        self.ui.add_item(curr)
+        self.components.add_weight(curr)
 
     def main(self) -> None:
         """
@@ -464,12 +658,11 @@ class Editor:
         """
 
         while True:
-            for event in pygame.event.get():
 
-                # Convert from real to virtual coordinates
-                if hasattr(event, "pos"):
-                    event.pos = self.ui.get_virtual_cords(event.pos)
+            # While a cancelled search is finishing, check regularly whether editing can be enabled again
+            busy = self.is_busy()
 
+            for event in self.ui.get_events(self.busy_interval if busy else None):
                 if event.type == pygame.KEYDOWN:
                     self.on_keypress(event)
                 if event.type == pygame.MOUSEBUTTONDOWN:
@@ -477,4 +670,7 @@ class Editor:
                 if event.type == pygame.MOUSEBUTTONUP:
                     self.set_weight(event)
 
+            if busy and not self.is_busy():
+                self.apply_masks()
+
             self.ui.draw()
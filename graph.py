@@ -0,0 +1,233 @@
+from typing import Callable
+
+
+class GraphNode:
+    """
+    Pure-Python node (or vertex) of a graph, holding everything the solvers need.
+    Does not depend on pygame, such that graphs can be solved without a display.
+    """
+
+    def __init__(self, pos: tuple[int, int], name: str):
+        """
+        Initialize an instance of the GraphNode class.
+
+        :param pos: Coordinates to the node center
+        :param name: Name of the node
+        """
+
+        self.pos = pos
+        self.name = name
+        self.origin_name = name
+
+        self.is_start = False
+        self.is_end = False
+        self.state = False
+
+        self.weights = []
+
+    def set_name(self, name: str) -> None:
+        """
+        Set the name of a node.
+
+        :param name: New name
+        :return: None
+        """
+
+        self.name = name
+
+    def set_name_origin(self) -> None:
+        """
+        Reset the node to its original name (solver)
+
+        :return: None
+        """
+
+        self.name = self.origin_name
+
+    def add_weight(self, weight) -> None:
+        """
+        Add a weight to the nodes index of weights.
+
+        :param weight: Weight to add
+        :return: None
+        """
+
+        self.weights.append(weight)
+
+    def remove_weight(self, weight) -> None:
+        """
+        Remove a weight from the nodes index of weights.
+
+        :param weight: Weight to remove
+        :return: None
+        """
+
+        if weight in self.weights:
+            self.weights.remove(weight)
+
+
+class GraphWeight:
+    """
+    Pure-Python weight (or edge) of a graph, holding everything the solvers need.
+    Does not depend on pygame, such that graphs can be solved without a display.
+    """
+
+    def __init__(self, start_node: GraphNode, end_node: GraphNode):
+        """
+        Initialize an instance of the GraphWeight class.
+
+        :param start_node: Source node
+        :param end_node: Destination node
+        """
+
+        self.start_node = start_node
+        self.end_node = end_node
+
+        # Calculate a default length for the weight, based on distance
+        diff_x = abs(start_node.pos[0] - end_node.pos[0])
+        diff_y = abs(start_node.pos[1] - end_node.pos[1])
+        self.length = str(int((diff_x**2 + diff_y**2)**0.5) // 100)
+
+        self.state = False
+        self.is_searched = False
+        self.is_searching = False
+
+    def set_length(self, num: str) -> None:
+        """
+        Set the length of the weight.
+
+        :param num: Length to set the weight to
+        :return: None
+        """
+
+        # Filter non-numeric inputs to prevent errors
+        if num.isnumeric():
+            self.length = num
+
+    def is_similar(self, node1: GraphNode, node2: GraphNode) -> bool:
+        """
+        Check whether given nodes are equivalent to own nodes.
+
+        :param node1: Node 1
+        :param node2: Node 2
+        :return: Whether self and given nodes are the same (ignore order)
+        """
+
+        if node1 == self.start_node and node2 == self.end_node:
+            return True
+
+        if node2 == self.start_node and node1 == self.end_node:
+            return True
+
+        return False
+
+    def set_searched(self) -> None:
+        """
+        Set weight to searched status (solver)
+
+        :return: None
+        """
+
+        self.is_searching = False
+        self.is_searched = True
+
+    def set_searching(self) -> None:
+        """
+        Set weight to searching status (solver)
+
+        :return: None
+        """
+
+        self.is_searched = False
+        self.is_searching = True
+
+    def get_other_node(self, node: GraphNode) -> GraphNode:
+        """
+        Get opposing node from given node.
+        Useful when caller doesn't know, whether given node is source or dest.
+
+        :param node: Node to use
+        :return: Opposite node to given node
+        """
+
+        if node is self.start_node:
+            return self.end_node
+        return self.start_node
+
+    def set_default(self) -> None:
+        """
+        Reset all states (solver)
+
+        :return: None
+        """
+
+        self.is_searched = False
+        self.is_searching = False
+        self.state = False
+
+
+"""
+Graphs are exchanged as plain dicts (e.g. loaded from JSON) in the following format:
+    {
+        "nodes": [{"name": "A", "pos": [x, y], "start": true, "end": false}, ...],
+        "weights": [{"nodes": [0, 1], "length": 3}, ...]
+    }
+Weights refer to nodes by their index in the node list.
+"""
+
+
+def graph_from_dict(data: dict, make_node: Callable = GraphNode,
+                    make_weight: Callable = GraphWeight) -> tuple[list[GraphNode], list[GraphWeight]]:
+    """
+    Build nodes and weights from a graph dict.
+
+    :param data: Graph dict
+    :param make_node: Function creating a node from its position and name (e.g. to create UI-objects)
+    :param make_weight: Function creating a weight from its start and end node
+    :return: Nodes and weights
+    """
+
+    nodes = []
+    weights = []
+
+    for entry in data["nodes"]:
+        node = make_node(tuple(entry["pos"]), entry["name"])
+        node.is_start = entry.get("start", False)
+        node.is_end = entry.get("end", False)
+        nodes.append(node)
+
+    for entry in data["weights"]:
+        start_node, end_node = (nodes[i] for i in entry["nodes"])
+        weight = make_weight(start_node, end_node)
+
+        if "length" in entry:
+            weight.set_length(str(entry["length"]))
+
+        start_node.add_weight(weight)
+        end_node.add_weight(weight)
+        weights.append(weight)
+
+    return nodes, weights
+
+
+def graph_to_dict(nodes: list[GraphNode], weights: list[GraphWeight]) -> dict:
+    """
+    Convert nodes and weights to a graph dict.
+
+    :param nodes: Nodes in graph
+    :param weights: Weights in graph
+    :return: Graph dict
+    """
+
+    index = {node: i for i, node in enumerate(nodes)}
+
+    return {
+        "nodes": [
+            {"name": node.origin_name, "pos": list(node.pos), "start": node.is_start, "end": node.is_end}
+            for node in nodes
+        ],
+        "weights": [
+            {"nodes": [index[weight.start_node], index[weight.end_node]], "length": int(weight.length)}
+            for weight in weights
+        ]
+    }
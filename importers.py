@@ -0,0 +1,347 @@
+import csv
+from array import array
+from itertools import compress
+from typing import Iterable, Iterator
+from algo import CompiledGraph
+from storage import write_binary
+
+"""
+Streaming importers for large graphs, such as road networks, building compiled graphs without node or weight objects.
+
+Supported formats:
+    DIMACS shortest path challenge files (.gr), with optional coordinates (.co):
+        p sp <nodes> <arcs>
+        a <from> <to> <length>
+        v <node> <x> <y>
+    CSV edge lists (e.g. exported from OpenStreetMap) with a header, and optionally a CSV file of node coordinates
+
+Files are parsed in chunks of whole lines, and weights are stored in flat typed arrays as they are read,
+such that memory is bounded by the size of the graph rather than the size of the file.
+Chunks consisting only of arc lines (the bulk of a DIMACS file) are split and converted in one go.
+
+Weights of compiled graphs are undirected. DIMACS files list every road as two arcs, one in each direction,
+so by default only the arcs from a lower to a higher node are kept (see read_dimacs).
+"""
+
+CHUNK_SIZE = 1 << 22
+
+
+def read_chunks(file_path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """
+    Read a text file in chunks of whole lines.
+
+    :param file_path: Path of the file to read
+    :param chunk_size: Approximate size of each chunk in characters
+    :return: Generator of chunks, each ending with a newline
+    """
+
+    with open(file_path) as file:
+        rest = ""
+
+        while True:
+            data = file.read(chunk_size)
+            if not data:
+                break
+
+            data = rest + data
+            cut = data.rfind("\n") + 1
+            rest = data[cut:]
+
+            if cut:
+                yield data[:cut]
+
+        if rest:
+            yield rest + "\n"
+
+
+class ImportedGraph:
+    """
+    Graph imported from a file, stored as flat arrays of weights instead of node and weight objects.
+    Nodes are identified by their index, and named by their identifier in the file.
+    """
+
+    def __init__(self, node_count: int = 0):
+        """
+        Initialize an instance of the ImportedGraph class, without weights.
+
+        :param node_count: Number of nodes
+        """
+
+        self.node_count = node_count
+
+        # Start node, end node and length of each weight
+        self.starts = array("i")
+        self.ends = array("i")
+        self.lengths = array("q")
+
+        # Coordinates of each node
+        self.xs = array("d", bytes(8 * node_count))
+        self.ys = array("d", bytes(8 * node_count))
+
+        # Names of the nodes, None when nodes are named by their number (index + 1)
+        self.names = None
+
+    def add_node(self, x: float = 0, y: float = 0) -> int:
+        """
+        Add a node.
+
+        :param x: Horizontal coordinate
+        :param y: Vertical coordinate
+        :return: Index of the node
+        """
+
+        self.xs.append(x)
+        self.ys.append(y)
+        self.node_count += 1
+        return self.node_count - 1
+
+    def add_weights(self, starts: list[int], ends: list[int], lengths: list[int]) -> None:
+        """
+        Add weights between nodes.
+
+        :param starts: Index of the start node of each weight
+        :param ends: Index of the end node of each weight
+        :param lengths: Length of each weight
+        :return: None
+        """
+
+        self.starts.extend(starts)
+        self.ends.extend(ends)
+        self.lengths.extend(lengths)
+
+    def get_names(self) -> Iterable[str]:
+        """
+        Get the name of each node. Names by number are generated as they are iterated, instead of stored.
+
+        :return: Names of the nodes
+        """
+
+        if self.names is None:
+            return map(str, range(1, self.node_count + 1))
+        return self.names
+
+    def compile(self) -> CompiledGraph:
+        """
+        Compile the weights to compressed sparse row form.
+        The neighbours of each node are ordered by weight, like a graph of objects created in the same order.
+
+        :return: Compiled graph
+        """
+
+        n = self.node_count
+        m = len(self.starts)
+
+        if m and max(max(self.starts), max(self.ends)) >= n:
+            raise ValueError("Weight refers to a node that does not exist")
+
+        # Count the neighbours of each node, then find where each node's neighbours start
+        offsets = array("q", bytes(8 * (n + 1)))
+        for node in self.starts:
+            offsets[node + 1] += 1
+        for node in self.ends:
+            offsets[node + 1] += 1
+
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+
+        targets = array("i", bytes(4 * 2 * m))
+        lengths = array("q", bytes(8 * 2 * m))
+        edges = array("i", bytes(4 * 2 * m))
+
+        # Next free position in the neighbours of each node
+        positions = offsets[:-1]
+
+        for weight, (start, end, length) in enumerate(zip(self.starts, self.ends, self.lengths)):
+            i = positions[start]
+            targets[i] = end
+            lengths[i] = length
+            edges[i] = weight
+            positions[start] = i + 1
+
+            i = positions[end]
+            targets[i] = start
+            lengths[i] = length
+            edges[i] = weight
+            positions[end] = i + 1
+
+        graph = CompiledGraph.from_arrays(offsets, targets, lengths, edges, self.xs, self.ys)
+        graph.weights = range(m)
+        return graph
+
+    def save(self, file_path: str) -> None:
+        """
+        Save the graph in the binary format (see storage.py), such that it can be memory-mapped later.
+
+        :param file_path: Path of the file to write
+        :return: None
+        """
+
+        write_binary(file_path, self.compile(), self.starts, self.ends, self.lengths, self.get_names(),
+                     bytes(self.node_count))
+
+
+def read_dimacs(gr_path: str, co_path: str = None, symmetric: bool = True,
+                chunk_size: int = CHUNK_SIZE) -> ImportedGraph:
+    """
+    Import a graph from DIMACS shortest path challenge files. Nodes are named by their number in the file.
+
+    :param gr_path: Path of the graph file (.gr)
+    :param co_path: Path of the coordinate file (.co), if any
+    :param symmetric: Whether every arc is listed in both directions with the same length, such that only the arcs
+        from a lower to a higher node are kept as weights. Otherwise, every arc becomes a weight
+    :param chunk_size: Approximate size of each parsed chunk in characters
+    :return: Imported graph
+    """
+
+    graph = None
+
+    for chunk in read_chunks(gr_path, chunk_size):
+        tokens = chunk.split()
+        line_count = chunk.count("\n")
+
+        # Fast path: chunk consists only of arc lines
+        if graph is not None and len(tokens) == 4 * line_count and tokens[0::4].count("a") == line_count:
+            starts = [int(token) - 1 for token in tokens[1::4]]
+            ends = [int(token) - 1 for token in tokens[2::4]]
+            lengths = [int(token) for token in tokens[3::4]]
+
+        else:
+            starts = []
+            ends = []
+            lengths = []
+
+            for line in chunk.splitlines():
+                parts = line.split()
+
+                if not parts or parts[0] == "c":
+                    continue
+
+                if parts[0] == "p":
+                    graph = ImportedGraph(int(parts[2]))
+
+                elif parts[0] == "a":
+                    if graph is None:
+                        raise ValueError(f"{gr_path} lists arcs before the problem line")
+
+                    starts.append(int(parts[1]) - 1)
+                    ends.append(int(parts[2]) - 1)
+                    lengths.append(int(parts[3]))
+
+        if symmetric:
+            keep = [start <= end for start, end in zip(starts, ends)]
+            starts = compress(starts, keep)
+            ends = compress(ends, keep)
+            lengths = compress(lengths, keep)
+
+        if graph is not None:
+            graph.add_weights(starts, ends, lengths)
+
+    if graph is None:
+        raise ValueError(f"{gr_path} has no problem line")
+
+    if co_path is not None:
+        for chunk in read_chunks(co_path, chunk_size):
+            tokens = chunk.split()
+            line_count = chunk.count("\n")
+
+            # Fast path: chunk consists only of coordinate lines
+            if len(tokens) == 4 * line_count and tokens[0::4].count("v") == line_count:
+                coordinates = zip(tokens[1::4], tokens[2::4], tokens[3::4])
+            else:
+                coordinates = [line.split()[1:4] for line in chunk.splitlines() if line.startswith("v")]
+
+            for node, x, y in coordinates:
+                graph.xs[int(node) - 1] = float(x)
+                graph.ys[int(node) - 1] = float(y)
+
+    return graph
+
+
+def find_columns(file_path: str, header: list[str], columns: tuple[str, ...]) -> list[int]:
+    """
+    Find the position of named columns in the header of a CSV file.
+
+    :param file_path: Path of the CSV file (for errors)
+    :param header: Names of the columns in the file
+    :param columns: Names of the columns to find
+    :return: Position of each column
+    """
+
+    for column in columns:
+        if column not in header:
+            raise ValueError(f"{file_path} has no column named {column!r}")
+
+    return [header.index(column) for column in columns]
+
+
+def read_edge_list(file_path: str, nodes_path: str = None, columns: tuple[str, str, str] = ("source", "target", "length"),
+                   node_columns: tuple[str, str, str] = ("id", "x", "y"), scale: float = 1,
+                   delimiter: str = ",") -> ImportedGraph:
+    """
+    Import a graph from a CSV file of weights, with a header naming the columns. Nodes are named by their identifier.
+
+    :param file_path: Path of the CSV file of weights
+    :param nodes_path: Path of a CSV file of node coordinates, if any
+    :param columns: Names of the columns holding the start node, end node and length of each weight
+    :param node_columns: Names of the columns holding the identifier, horizontal and vertical coordinate of each node
+    :param scale: Factor to multiply lengths by before rounding to whole numbers (e.g. 1000 for meters to millimeters)
+    :param delimiter: Delimiter between columns
+    :return: Imported graph
+    """
+
+    graph = ImportedGraph()
+    graph.names = []
+
+    # Index of each node by its identifier, in order of first appearance
+    index = {}
+
+    def get_index(identifier: str) -> int:
+        """ Get the index of a node, adding it if not seen before. """
+
+        i = index.get(identifier)
+        if i is None:
+            i = index[identifier] = graph.add_node()
+            graph.names.append(identifier)
+        return i
+
+    if nodes_path is not None:
+        with open(nodes_path, newline="") as file:
+            reader = csv.reader(file, delimiter=delimiter)
+            header = next(reader, [])
+            id_column, x_column, y_column = find_columns(nodes_path, header, node_columns)
+
+            for row in reader:
+                if not row:
+                    continue
+
+                i = get_index(row[id_column])
+                graph.xs[i] = float(row[x_column])
+                graph.ys[i] = float(row[y_column])
+
+    with open(file_path, newline="") as file:
+        reader = csv.reader(file, delimiter=delimiter)
+        header = next(reader, [])
+        start_column, end_column, length_column = find_columns(file_path, header, columns)
+
+        starts = []
+        ends = []
+        lengths = []
+
+        for row in reader:
+            if not row:
+                continue
+
+            starts.append(get_index(row[start_column]))
+            ends.append(get_index(row[end_column]))
+            lengths.append(round(float(row[length_column]) * scale))
+
+            # Move parsed weights to the compact arrays in chunks
+            if len(starts) >= CHUNK_SIZE // 64:
+                graph.add_weights(starts, ends, lengths)
+                starts.clear()
+                ends.clear()
+                lengths.clear()
+
+        graph.add_weights(starts, ends, lengths)
+
+    return graph
@@ -1,7 +1,10 @@
 import pygame
 import ctypes
-from uiobjects import TextInput, Button, TextLabel, Line, Mask
+import time
+from uiobjects import TextInput, Button, TextLabel, Line, Mask, Scrubber, Weight
 from editor import Editor
+from spatial import SpatialGrid
+from collections import OrderedDict
 from math import ceil
 from typing import Callable
 
@@ -23,6 +26,11 @@ class UI:
     Attributes:
         base_width: Default width of UI
         base_height: Default height of UI
+        sidebar_width: Width of the sidebar holding buttons (virtual)
+        text_cache_size: Maximum number of rendered text surfaces to keep
+        fps: Maximum number of frames per second
+        full_redraw_ratio: Fraction of nodes and weights changed in a frame, from which the whole screen is redrawn
+        show_stats: Whether to show frame statistics in the window caption (toggled with F3)
         background_color: Background color of UI
         rect_attr: Dict describing rect-properties and their axis of dependence
     """
@@ -30,6 +38,14 @@ class UI:
     base_width = 1920
     base_height = 1080
 
+    sidebar_width = 340
+
+    text_cache_size = 4096
+
+    fps = 60
+    full_redraw_ratio = 0.25
+    show_stats = False
+
     background_color = (100, 100, 240, 0.5)
 
     """
@@ -77,6 +93,19 @@ class UI:
         self.window = pygame.display.set_mode((self.width, self.height), flags=pygame.FULLSCREEN)
         pygame.display.set_caption('Graph Visualizer')
 
+        # Frame timing, the clock caps the frame rate
+        self.clock = pygame.time.Clock()
+        self.idle = False
+        self.frame_count = 0
+        self.frame_time = 0
+        self.average_frame_time = 0
+
+        # Fonts are shared between UI-objects, by file and virtual size
+        self.fonts = {}
+
+        # Rendered text surfaces, ordered from least to most recently used
+        self.text_cache = OrderedDict()
+
         # Lists to keep UI-objects
         self.nodes = []
         self.weights = []
@@ -88,37 +117,64 @@ class UI:
         self.lines = []
         self.masks = []
 
-        self.text_input = TextInput(self, pygame.Rect(50, 370, 120, 40))
-
-        self.text_labels.append(TextLabel(self, pygame.Rect(50, 30, 120, 40), "General:"))
-        self.text_labels.append(TextLabel(self, pygame.Rect(50, 180, 120, 40), "Graph:"))
-        self.text_labels.append(TextLabel(self, pygame.Rect(50, 490, 120, 40), "Algorithms:"))
-        self.text_labels.append(TextLabel(self, pygame.Rect(50, 850, 120, 40), "Timeline:"))
-
-        self.general_buttons.append(Button(self, pygame.Rect(50, 70, 120, 40), "Exit", "BUTTON_GEN_EXIT"))
-
-        self.graph_buttons.append(Button(self, pygame.Rect(50, 220, 120, 40), "Start", "BUTTON_GRAPH_START"))
-        self.graph_buttons.append(Button(self, pygame.Rect(50, 270, 120, 40), "End", "BUTTON_GRAPH_END"))
-        self.graph_buttons.append(Button(self, pygame.Rect(50, 320, 120, 40), "Delete", "BUTTON_GRAPH_DELETE"))
-
-        self.algo_buttons.append(Button(self, pygame.Rect(50, 530, 120, 40), "Dijkstra", "BUTTON_ALGO_DIJKSTRA"))
-        self.algo_buttons.append(Button(self, pygame.Rect(50, 580, 120, 40), "A-Star", "BUTTON_ALGO_ASTAR"))
-        self.algo_buttons.append(Button(self, pygame.Rect(50, 630, 120, 40), "BFS", "BUTTON_ALGO_BFS"))
-        self.algo_buttons.append(Button(self, pygame.Rect(50, 680, 120, 40), "DFS", "BUTTON_ALGO_DFS"))
-        self.algo_buttons.append(Button(self, pygame.Rect(50, 730, 120, 40), "Greedy", "BUTTON_ALGO_GREEDY"))
-
-        self.timeline_buttons.append(Button(self, pygame.Rect(50, 890, 120, 40), "Forward", "BUTTON_TIME_FORWARD"))
-        self.timeline_buttons.append(Button(self, pygame.Rect(50, 940, 120, 40), "Back", "BUTTON_TIME_BACK"))
-        self.timeline_buttons.append(Button(self, pygame.Rect(50, 990, 120, 40), "Stop", "BUTTON_TIME_STOP"))
-
-        self.lines.append(Line(self, (220, 0), (220, self.base_height)))
-        self.lines.append(Line(self, (0, 150), (220, 150)))
-        self.lines.append(Line(self, (0, 460), (220, 460)))
-        self.lines.append(Line(self, (0, 820), (220, 820)))
-
-        self.masks.append(Mask(self, pygame.Rect(0, 150, 220, 310), "MASK_GRAPH_BUTTONS"))
-        self.masks.append(Mask(self, pygame.Rect(0, 460, 220, 360), "MASK_ALGO_BUTTONS"))
-        self.masks.append(Mask(self, pygame.Rect(0, 820, 220, self.base_height - 820), "MASK_TIME_BUTTONS"))
+        # The sidebar is laid out in two columns of buttons
+        self.text_input = TextInput(self, pygame.Rect(180, 270, 140, 40))
+
+        self.text_labels.append(TextLabel(self, pygame.Rect(20, 30, 300, 40), "General:"))
+        self.text_labels.append(TextLabel(self, pygame.Rect(20, 180, 300, 40), "Graph:"))
+        self.text_labels.append(TextLabel(self, pygame.Rect(20, 395, 300, 40), "Algorithms:"))
+        self.text_labels.append(TextLabel(self, pygame.Rect(20, 710, 300, 40), "Timeline:"))
+
+        self.general_buttons.append(Button(self, pygame.Rect(20, 70, 140, 40), "Exit", "BUTTON_GEN_EXIT"))
+
+        self.graph_buttons.append(Button(self, pygame.Rect(20, 220, 140, 40), "Start", "BUTTON_GRAPH_START"))
+        self.graph_buttons.append(Button(self, pygame.Rect(180, 220, 140, 40), "End", "BUTTON_GRAPH_END"))
+        self.graph_buttons.append(Button(self, pygame.Rect(20, 270, 140, 40), "Delete", "BUTTON_GRAPH_DELETE"))
+        self.graph_buttons.append(Button(self, pygame.Rect(20, 320, 140, 40), "Save", "BUTTON_GRAPH_SAVE"))
+        self.graph_buttons.append(Button(self, pygame.Rect(180, 320, 140, 40), "Load", "BUTTON_GRAPH_LOAD"))
+
+        self.algo_buttons.append(Button(self, pygame.Rect(20, 435, 140, 40), "Dijkstra", "BUTTON_ALGO_DIJKSTRA"))
+        self.algo_buttons.append(Button(self, pygame.Rect(180, 435, 140, 40), "A-Star", "BUTTON_ALGO_ASTAR"))
+        self.algo_buttons.append(Button(self, pygame.Rect(20, 485, 140, 40), "BFS", "BUTTON_ALGO_BFS"))
+        self.algo_buttons.append(Button(self, pygame.Rect(180, 485, 140, 40), "DFS", "BUTTON_ALGO_DFS"))
+        self.algo_buttons.append(Button(self, pygame.Rect(20, 535, 140, 40), "Greedy", "BUTTON_ALGO_GREEDY"))
+        self.algo_buttons.append(Button(self, pygame.Rect(180, 535, 140, 40), "LPA*", "BUTTON_ALGO_LPASTAR"))
+        self.algo_buttons.append(Button(self, pygame.Rect(20, 585, 140, 40), "Bi-Dijkstra", "BUTTON_ALGO_BIDIJKSTRA"))
+        self.algo_buttons.append(Button(self, pygame.Rect(180, 585, 140, 40), "Bi-A-Star", "BUTTON_ALGO_BIASTAR"))
+        self.algo_buttons.append(Button(self, pygame.Rect(20, 635, 140, 40), "CH", "BUTTON_ALGO_CH"))
+
+        self.timeline_buttons.append(Button(self, pygame.Rect(20, 750, 140, 40), "Forward", "BUTTON_TIME_FORWARD"))
+        self.timeline_buttons.append(Button(self, pygame.Rect(180, 750, 140, 40), "Back", "BUTTON_TIME_BACK"))
+        self.timeline_buttons.append(Button(self, pygame.Rect(20, 800, 140, 40), "Stop", "BUTTON_TIME_STOP"))
+        self.timeline_buttons.append(Button(self, pygame.Rect(180, 800, 140, 40), "Play", "BUTTON_TIME_PLAY"))
+        self.timeline_buttons.append(Button(self, pygame.Rect(20, 850, 140, 40), "Slower", "BUTTON_TIME_SLOWER"))
+        self.timeline_buttons.append(Button(self, pygame.Rect(180, 850, 140, 40), "Faster", "BUTTON_TIME_FASTER"))
+        self.timeline_buttons.append(Button(self, pygame.Rect(20, 900, 140, 40), "Solution", "BUTTON_TIME_SOLUTION"))
+
+        self.timeline_scrubber = Scrubber(self, pygame.Rect(20, 960, 300, 40), "SCRUBBER_TIME")
+
+        self.lines.append(Line(self, (self.sidebar_width, 0), (self.sidebar_width, self.base_height)))
+        self.lines.append(Line(self, (0, 150), (self.sidebar_width, 150)))
+        self.lines.append(Line(self, (0, 390), (self.sidebar_width, 390)))
+        self.lines.append(Line(self, (0, 680), (self.sidebar_width, 680)))
+
+        self.masks.append(Mask(self, pygame.Rect(0, 150, self.sidebar_width, 240), "MASK_GRAPH_BUTTONS"))
+        self.masks.append(Mask(self, pygame.Rect(0, 390, self.sidebar_width, 290), "MASK_ALGO_BUTTONS"))
+        self.masks.append(Mask(self, pygame.Rect(0, 680, self.sidebar_width, self.base_height - 680), "MASK_TIME_BUTTONS"))
+
+        # The sidebar is rendered to a cached surface, and only re-rendered when its state changes
+        self.sidebar_rect = pygame.Rect(0, 0, self.sidebar_width + Line.width, self.base_height)
+        self.sidebar_surface = None
+        self.sidebar_signature = None
+
+        # Nodes and weights changed, added or removed since the last frame (see mark_dirty)
+        self.dirty_items = set()
+        self.redraw_all = True
+
+        # Nodes and weights by the regions they draw within and can be clicked in, shared with the editor.
+        # Finds those overlapping a changed region when redrawing, and those near a click when editing
+        self.node_grid = SpatialGrid(128)
+        self.weight_grid = SpatialGrid(128)
 
     def get_virtual_cords(self, real_cords: tuple[int, int]) -> tuple[float, float]:
         """
@@ -289,14 +345,19 @@ class UI:
 
     def get_font(self, file_path=None, size=12) -> pygame.font.Font:
         """
-        Generate a font object from virtual size.
+        Get a font object from virtual size. Fonts are loaded once and shared.
 
         :param file_path: Path to font file
         :param size: Virtual size of font
         :return: Font object
         """
 
-        return pygame.font.Font(file_path, int(self.get_real_avg(size)))
+        key = (file_path, size)
+
+        if key not in self.fonts:
+            self.fonts[key] = pygame.font.Font(file_path, int(self.get_real_avg(size)))
+
+        return self.fonts[key]
 
     def get_real_rect_attr(self, virtual_attr: dict[str: int]) -> dict[str: float]:
         """
@@ -323,10 +384,10 @@ class UI:
 
         return real_attr
 
-    @staticmethod
-    def font_render(font: pygame.font.Font, text: str, antialias: bool, color: pygame.Color) -> pygame.Surface:
+    def font_render(self, font: pygame.font.Font, text: str, antialias: bool, color: pygame.Color) -> pygame.Surface:
         """
-        Wrapper function to font.render.
+        Wrapper function to font.render, caching the rendered surfaces.
+        Surfaces are shared, and must not be drawn onto.
 
         :param font: Font to render with
         :param text: Text to render
@@ -335,7 +396,21 @@ class UI:
         :return: Surface with text
         """
 
-        return font.render(text, antialias, color)
+        key = (font, text, antialias, tuple(color))
+        surface = self.text_cache.get(key)
+
+        if surface is not None:
+            self.text_cache.move_to_end(key)
+            return surface
+
+        surface = font.render(text, antialias, color)
+        self.text_cache[key] = surface
+
+        # Evict the least recently used surface
+        if len(self.text_cache) > self.text_cache_size:
+            self.text_cache.popitem(last=False)
+
+        return surface
 
     def font_get_rect(self, text_surface: pygame.Surface, **rect_attr: dict[str: int]) -> pygame.Rect:
         """
@@ -420,20 +495,132 @@ class UI:
             if mask.identifier in masks:
                 mask.state = masks[mask.identifier]
 
-    def draw(self) -> None:
+    def invalidate(self) -> None:
         """
-        Draws the scene by calling UI-object draw functions and updating the screen.
+        Rebuild the index of nodes and weights, and force the whole screen to be redrawn on the next frame.
+        Called when the nodes and weights have been replaced.
 
         :return: None
         """
 
-        self.window.fill(self.background_color)
+        self.index_items()
+        self.redraw_all = True
+
+    def mark_dirty(self, item) -> None:
+        """
+        Mark a node or weight as changed, such that its region is redrawn on the next frame.
+
+        :param item: Changed node or weight
+        :return: None
+        """
+
+        self.dirty_items.add(item)
+
+    def get_grid(self, item) -> SpatialGrid:
+        """
+        Get the index of drawn items holding a node or weight.
+
+        :param item: Node or weight
+        :return: Spatial index of its kind
+        """
+
+        return self.weight_grid if isinstance(item, Weight) else self.node_grid
+
+    def add_item(self, item) -> None:
+        """
+        Register an added node or weight, drawing it on the next frame.
+        Items are drawn in the order they were added, weights below nodes.
+
+        :param item: Added node or weight
+        :return: None
+        """
+
+        self.index_item(item)
+        self.mark_dirty(item)
+
+    def remove_item(self, item) -> None:
+        """
+        Register a removed node or weight, clearing its region on the next frame.
+
+        :param item: Removed node or weight
+        :return: None
+        """
+
+        self.get_grid(item).remove(item)
+        self.mark_dirty(item)
+
+    @staticmethod
+    def get_corners(rect: pygame.Rect) -> tuple[int, int, int, int]:
+        """
+        Get the edges of a rect, as used by the spatial index.
+
+        :param rect: Rect
+        :return: Left, top, right and bottom edge
+        """
+
+        return rect.left, rect.top, rect.right, rect.bottom
+
+    def index_item(self, item) -> None:
+        """
+        Add a node or weight to its index, covering the region it draws within.
+        Weights are widened by the reach of their click-detection, which extends past the drawn line.
+
+        :param item: Node or weight
+        :return: None
+        """
+
+        bounds = item.get_bounds()
+
+        if isinstance(item, Weight):
+            bounds = bounds.inflate(item.clip_size, item.clip_size)
+
+        self.get_grid(item).insert_rect(item, *self.get_corners(bounds))
+
+    def index_items(self) -> None:
+        """
+        Rebuild the index from the current nodes and weights.
+
+        :return: None
+        """
+
+        self.node_grid.clear()
+        self.weight_grid.clear()
 
         for weight in self.weights:
-            weight.draw()
+            self.index_item(weight)
 
         for node in self.nodes:
-            node.draw()
+            self.index_item(node)
+
+    def get_sidebar_signature(self) -> tuple:
+        """
+        Get everything in the sidebar that can change at runtime. Buttons, labels and lines are static.
+
+        :return: State of the sidebar
+        """
+
+        return (tuple(mask.state for mask in self.masks), self.text_input.user_text, self.text_input.state,
+                self.timeline_scrubber.get_signature())
+
+    def render_sidebar(self) -> bool:
+        """
+        Render the sidebar to its cached surface, if its state has changed since it was last rendered.
+
+        :return: Whether the sidebar was rendered
+        """
+
+        signature = self.get_sidebar_signature()
+
+        if self.sidebar_surface is not None and signature == self.sidebar_signature:
+            return False
+
+        if self.sidebar_surface is None:
+            self.sidebar_surface = self.get_surface(self.sidebar_rect.size)
+
+        # Point the drawing functions at the cached surface, which shares the top-left corner of the window
+        window = self.window
+        self.window = self.sidebar_surface
+        self.window.fill(self.background_color)
 
         for button in self.graph_buttons:
             button.draw()
@@ -454,11 +641,157 @@ class UI:
             line.draw()
 
         self.text_input.draw()
+        self.timeline_scrubber.draw()
 
         for mask in self.masks:
             mask.draw()
 
-        pygame.display.update()
+        self.window = window
+        self.sidebar_signature = signature
+        return True
+
+    def get_events(self, timeout: int = None) -> list[pygame.event.Event]:
+        """
+        Get the events to handle in the next frame, with positions converted to virtual coordinates.
+        While idle (the last frame changed nothing), blocks until an event arrives instead of polling.
+        Otherwise, waits as needed to cap the frame rate at UI.fps.
+
+        :param timeout: Maximum time to block while idle in milliseconds (defaults to no limit)
+        :return: List of events
+        """
+
+        if self.idle and timeout is None:
+            events = [pygame.event.wait()]
+        elif self.idle:
+            event = pygame.event.wait(timeout)
+            events = [event] if event.type != pygame.NOEVENT else []
+        else:
+            events = []
+
+        self.clock.tick(self.fps)
+        events.extend(pygame.event.get())
+
+        for event in events:
+
+            # Convert from real to virtual coordinates
+            if hasattr(event, "pos"):
+                event.pos = self.get_virtual_cords(event.pos)
+
+            # Statistics are toggled for every scene
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.show_stats = not self.show_stats
+                self.update_caption()
+
+        return events
+
+    def get_frame_stats(self) -> dict[str: float]:
+        """
+        Get statistics of the drawn frames.
+
+        :return: Number of frames, frame rate, and time of the last frame and average time (milliseconds)
+        """
+
+        return {
+            "frames": self.frame_count,
+            "fps": self.clock.get_fps(),
+            "frame_time": self.frame_time,
+            "average_frame_time": self.average_frame_time
+        }
+
+    def draw(self) -> None:
+        """
+        Draws the scene if anything has changed, and updates the frame statistics.
+
+        :return: None
+        """
+
+        start_time = time.perf_counter()
+        self.idle = not self.render()
+
+        if self.idle:
+            return
+
+        # Average over roughly the last 20 frames
+        self.frame_time = (time.perf_counter() - start_time) * 1000
+        self.average_frame_time += (self.frame_time - self.average_frame_time) / min(self.frame_count + 1, 20)
+        self.frame_count += 1
+
+        if self.show_stats:
+            self.update_caption()
+
+    def update_caption(self) -> None:
+        """
+        Set the window caption, including frame statistics if enabled.
+
+        :return: None
+        """
+
+        if not self.show_stats:
+            pygame.display.set_caption("Graph Visualizer")
+            return
+
+        stats = self.get_frame_stats()
+        pygame.display.set_caption(
+            f"Graph Visualizer - {stats['fps']:.0f} fps, {stats['frame_time']:.1f} ms "
+            f"(avg. {stats['average_frame_time']:.1f} ms)"
+        )
+
+    def render(self) -> bool:
+        """
+        Draws the scene by calling UI-object draw functions and updating the screen.
+        Only the regions that have changed since the last frame are redrawn and updated.
+
+        :return: Whether anything was drawn
+        """
+
+        sidebar_changed = self.render_sidebar()
+
+        # Redrawing many small regions costs more than redrawing the screen once
+        if self.redraw_all or len(self.dirty_items) > self.full_redraw_ratio * (len(self.nodes) + len(self.weights)):
+            self.window.fill(self.background_color)
+
+            for weight in self.weights:
+                weight.draw()
+
+            for node in self.nodes:
+                node.draw()
+
+            self.window.blit(self.sidebar_surface, (0, 0))
+            pygame.display.update()
+
+            self.dirty_items.clear()
+            self.redraw_all = False
+            return True
+
+        if not self.dirty_items and not sidebar_changed:
+            return False
+
+        # Redraw everything overlapping each changed region, clipped to the region.
+        # Regions are widened slightly, to cover rounding between virtual and real coordinates.
+        updated = [item.get_bounds().inflate(4, 4) for item in self.dirty_items]
+        self.dirty_items.clear()
+
+        for region in updated:
+            self.window.set_clip(self.get_real_rect(region))
+            self.window.fill(self.background_color)
+
+            corners = self.get_corners(region)
+
+            for weight in self.weight_grid.query_rect(*corners):
+                weight.draw()
+
+            for node in self.node_grid.query_rect(*corners):
+                node.draw()
+
+        self.window.set_clip(None)
+
+        # The sidebar is drawn on top of the graph
+        if sidebar_changed or any(rect.colliderect(self.sidebar_rect) for rect in updated):
+            self.window.blit(self.sidebar_surface, (0, 0))
+            updated.append(self.sidebar_rect)
+
+        pygame.display.update([self.get_real_rect(rect) for rect in updated])
+        return True
 
 
 if __name__ == "__main__":
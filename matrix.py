@@ -0,0 +1,303 @@
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from algo import Path, CompiledGraph
+from graph import GraphNode, GraphWeight
+
+"""
+Batch computation of many-to-many distances, without toggling start and end nodes for every query.
+Each distinct source is searched once, and its search tree is kept and resumed for later targets.
+As weights are undirected, the searches run from whichever side has fewer distinct nodes.
+Large batches are spread over a pool of processes.
+"""
+
+
+class SearchTree:
+    """ Resumable Dijkstra search from a single node over a compiled graph. """
+
+    def __init__(self, graph: CompiledGraph, source: int):
+        """
+        Initialize an instance of the SearchTree class.
+
+        :param graph: Compiled graph to search
+        :param source: Index of the node to search from
+        """
+
+        self.graph = graph
+        self.source = source
+
+        # settled stores final lengths, lengths stores tentative lengths
+        self.settled = {}
+        self.lengths = {source: 0}
+
+        # parents stores the previous node and weight index on the fastest path to each node
+        self.parents = {}
+
+        self.queue = [(0, source)]
+
+    def settle(self, targets: set[int]) -> None:
+        """
+        Continue the search until all given nodes are settled, or the graph is exhausted.
+
+        :param targets: Indices of nodes to settle
+        :return: None
+        """
+
+        graph = self.graph
+        remaining = len(targets.difference(self.settled))
+
+        while remaining and self.queue:
+            length, node = heapq.heappop(self.queue)
+
+            if node in self.settled:
+                continue
+
+            self.settled[node] = length
+
+            if node in targets:
+                remaining -= 1
+
+            for i in range(graph.offsets[node], graph.offsets[node + 1]):
+                other = graph.targets[i]
+                new_length = length + graph.lengths[i]
+
+                if other not in self.settled and new_length < self.lengths.get(other, new_length + 1):
+                    self.lengths[other] = new_length
+                    self.parents[other] = (node, graph.edges[i])
+                    heapq.heappush(self.queue, (new_length, other))
+
+    def steps_to(self, target: int) -> list[tuple[int, int]] | None:
+        """
+        Get the fastest path from the source to a settled node.
+
+        :param target: Index of the node
+        :return: Steps (weight index, node index reached) from the source, or None if unreachable
+        """
+
+        if target not in self.settled:
+            return None
+
+        steps = []
+        node = target
+
+        while node != self.source:
+            prev, weight = self.parents[node]
+            steps.append((weight, node))
+            node = prev
+
+        steps.reverse()
+        return steps
+
+
+def reverse_steps(source: int, steps: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """
+    Reverse the steps of a path, such that it is walked from its last node to its source.
+
+    :param source: Index of the first node of the path
+    :param steps: Steps (weight index, node index reached) from source
+    :return: Steps from the last node back to source
+    """
+
+    nodes = [source] + [node for _, node in steps]
+    return [(steps[i][0], nodes[i]) for i in range(len(steps) - 1, -1, -1)]
+
+
+# Compiled graph of a worker process, sent once when the worker starts
+_worker_graph = None
+
+
+def _init_worker(graph: CompiledGraph) -> None:
+    """
+    Store the compiled graph in a worker process.
+
+    :param graph: Detached compiled graph
+    :return: None
+    """
+
+    global _worker_graph
+    _worker_graph = graph
+
+
+def _search_sources(sources: list[int], targets: list[int], with_steps: bool) -> list[tuple[list, list | None]]:
+    """
+    Search from a chunk of sources in a worker process.
+
+    :param sources: Indices of nodes to search from
+    :param targets: Indices of nodes to search to
+    :param with_steps: Whether to return the steps of each path
+    :return: Lengths (and steps) to each target, for each source
+    """
+
+    results = []
+
+    for source in sources:
+        tree = SearchTree(_worker_graph, source)
+        tree.settle(set(targets))
+
+        lengths = [tree.settled.get(target) for target in targets]
+        steps = [tree.steps_to(target) for target in targets] if with_steps else None
+        results.append((lengths, steps))
+
+    return results
+
+
+class DistanceMatrix:
+    """
+    Batch many-to-many distance queries over a graph of nodes.
+    The graph is compiled once on creation. Create a new instance after the graph changes.
+
+    Attributes:
+        parallel_threshold: Number of searches from which a process pool is used by default
+        chunk_size: Number of searches sent to a worker process at a time
+    """
+
+    parallel_threshold = 256
+    chunk_size = 32
+
+    def __init__(self, nodes: list[GraphNode], weights: list[GraphWeight]):
+        """
+        Initialize an instance of the DistanceMatrix class.
+
+        :param nodes: Nodes in graph
+        :param weights: Weights in graph
+        """
+
+        self.graph = CompiledGraph(nodes, weights)
+
+        # Search trees kept between queries, by index of their source
+        self.trees = {}
+
+    def clear(self) -> None:
+        """
+        Remove all kept search trees.
+
+        :return: None
+        """
+
+        self.trees.clear()
+
+    def search_local(self, sources: list[int], targets: list[int], with_steps: bool) -> dict[int, tuple[list, list | None]]:
+        """
+        Search from the given sources in this process, reusing kept search trees.
+
+        :param sources: Indices of nodes to search from
+        :param targets: Indices of nodes to search to
+        :param with_steps: Whether to collect the steps of each path
+        :return: Lengths (and steps) to each target, by source
+        """
+
+        results = {}
+
+        for source in sources:
+            if source not in self.trees:
+                self.trees[source] = SearchTree(self.graph, source)
+
+            tree = self.trees[source]
+            tree.settle(set(targets))
+
+            lengths = [tree.settled.get(target) for target in targets]
+            steps = [tree.steps_to(target) for target in targets] if with_steps else None
+            results[source] = (lengths, steps)
+
+        return results
+
+    def search_parallel(self, sources: list[int], targets: list[int], with_steps: bool,
+                        processes: int | None) -> dict[int, tuple[list, list | None]]:
+        """
+        Search from the given sources in a pool of processes.
+
+        :param sources: Indices of nodes to search from
+        :param targets: Indices of nodes to search to
+        :param with_steps: Whether to collect the steps of each path
+        :param processes: Number of processes (defaults to the number of CPUs)
+        :return: Lengths (and steps) to each target, by source
+        """
+
+        chunks = [sources[i:i + self.chunk_size] for i in range(0, len(sources), self.chunk_size)]
+        results = {}
+
+        with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(self.graph.detached(),)) as pool:
+            futures = [pool.submit(_search_sources, chunk, targets, with_steps) for chunk in chunks]
+
+            for chunk, future in zip(chunks, futures):
+                results.update(zip(chunk, future.result()))
+
+        return results
+
+    def compute(self, sources: list[GraphNode], targets: list[GraphNode], paths: bool = False,
+                processes: int | None = None) -> tuple[list[list[int | None]], list[list[Path | None]] | None]:
+        """
+        Compute the lengths (and optionally paths) of the fastest paths from all sources to all targets.
+
+        :param sources: Nodes to find paths from
+        :param targets: Nodes to find paths to
+        :param paths: Whether to also return the paths
+        :param processes: Number of processes, 1 to stay in this process (defaults to automatic)
+        :return: Matrix of lengths (None if unreachable), and matrix of paths if requested
+        """
+
+        graph = self.graph
+        source_indices = list(dict.fromkeys(graph.index[node] for node in sources))
+        target_indices = list(dict.fromkeys(graph.index[node] for node in targets))
+
+        # Weights are undirected, so search from the side with fewer distinct nodes
+        swap = len(target_indices) < len(source_indices)
+        if swap:
+            source_indices, target_indices = target_indices, source_indices
+
+        if processes is None:
+            parallel = len(source_indices) >= self.parallel_threshold and (os.cpu_count() or 1) > 1
+        else:
+            parallel = processes > 1
+
+        if parallel:
+            results = self.search_parallel(source_indices, target_indices, paths, processes)
+        else:
+            results = self.search_local(source_indices, target_indices, paths)
+
+        # Look up the result of each pair, accounting for swapped sides
+        columns = {target: k for k, target in enumerate(target_indices)}
+
+        def lookup(source: int, target: int) -> tuple[int | None, list | None]:
+            """ Get the length and steps from source to target. """
+
+            if swap:
+                source, target = target, source
+
+            lengths, steps = results[source]
+            k = columns[target]
+            return lengths[k], steps[k] if steps is not None else None
+
+        length_matrix = []
+        path_matrix = [] if paths else None
+
+        for source_node in sources:
+            source = graph.index[source_node]
+            length_row = []
+            path_row = []
+
+            for target_node in targets:
+                target = graph.index[target_node]
+                length, steps = lookup(source, target)
+                length_row.append(length)
+
+                if not paths:
+                    continue
+
+                if steps is None:
+                    path_row.append(None)
+                    continue
+
+                if swap:
+                    steps = reverse_steps(target, steps)
+
+                path = Path(source_node)
+                for weight, node in steps:
+                    path = Path(graph.nodes[node], graph.weights[weight], path)
+                path_row.append(path)
+
+            length_matrix.append(length_row)
+            if paths:
+                path_matrix.append(path_row)
+
+        return length_matrix, path_matrix
@@ -0,0 +1,203 @@
+import os
+import time
+from functools import partial
+from multiprocessing import Pool
+from typing import Iterator
+from algo import BFS, AStar, Dijkstra, Greedy, DFS, Path, CompiledGraph, find_solution
+from graph import GraphNode, GraphWeight
+
+"""
+Algorithm portfolio: runs several solvers on the same graph at once, in a pool of processes, to compare them.
+
+The graph is compiled once and sent to each worker process as a detached snapshot (see CompiledGraph.detached),
+where it is turned back into plain nodes and weights with the same indices, such that every solver runs unchanged.
+Results arrive in the order the solvers finish. Dijkstra, BFS and A-Star are guaranteed to find the fastest path
+(or prove there is none), so the first of them to finish gives a proven answer, and the rest can be stopped early.
+"""
+
+ALGORITHMS = {
+    "Dijkstra": Dijkstra,
+    "BFS": BFS,
+    "AStar": AStar,
+    "DFS": DFS,
+    "Greedy": Greedy
+}
+
+# Algorithms guaranteed to find the fastest path
+OPTIMAL = {"Dijkstra", "BFS", "AStar"}
+
+
+def objects_from_compiled(graph: CompiledGraph) -> tuple[list[GraphNode], list[GraphWeight]]:
+    """
+    Create nodes and weights from a compiled graph, keeping the index of every node and weight,
+    and the order of the weights of every node.
+
+    :param graph: Compiled graph (may be detached)
+    :return: Nodes and weights
+    """
+
+    nodes = [GraphNode((x, y), str(i)) for i, (x, y) in enumerate(zip(graph.xs, graph.ys))]
+    weights = [None] * len(graph.weights)
+
+    for i, node in enumerate(nodes):
+        for k in range(graph.offsets[i], graph.offsets[i + 1]):
+            edge = graph.edges[k]
+
+            if weights[edge] is None:
+                weights[edge] = GraphWeight(node, nodes[graph.targets[k]])
+                weights[edge].length = str(graph.lengths[k])
+
+            node.weights.append(weights[edge])
+
+    return nodes, weights
+
+
+# Nodes and weights of a worker process, created once when the worker starts
+_worker_nodes = None
+_worker_weights = None
+
+
+def _init_worker(graph: CompiledGraph) -> None:
+    """
+    Create the nodes and weights of a worker process.
+
+    :param graph: Detached compiled graph
+    :return: None
+    """
+
+    global _worker_nodes, _worker_weights
+    _worker_nodes, _worker_weights = objects_from_compiled(graph)
+
+
+def _run_algorithm(name: str, start: int, end: int) -> dict:
+    """
+    Run an algorithm in a worker process and measure it.
+
+    :param name: Name of the algorithm (see ALGORITHMS)
+    :param start: Index of the start node
+    :param end: Index of the end node
+    :return: Measurements, and the steps (weight index, node index reached) of the path found, if any
+    """
+
+    for i, node in enumerate(_worker_nodes):
+        node.is_start = i == start
+        node.is_end = i == end
+
+    algorithm = ALGORITHMS[name](_worker_nodes, _worker_weights)
+
+    start_time = time.perf_counter()
+    recording = algorithm.run()
+    wall_time = time.perf_counter() - start_time
+
+    solution = find_solution(recording) if recording else None
+    steps = None
+
+    if solution is not None:
+        index = {node: i for i, node in enumerate(_worker_nodes)}
+        weight_index = {weight: i for i, weight in enumerate(_worker_weights)}
+        steps = [(weight_index[weight], index[node]) for weight, node in zip(solution.weights, solution.nodes[1:])]
+
+    return {
+        "algorithm": name,
+        "optimal": name in OPTIMAL,
+        "time": wall_time,
+        "expanded": algorithm.expanded,
+        "recording": len(recording) if recording else 0,
+        "found": solution is not None,
+        "length": solution.length if solution is not None else None,
+        "steps": steps
+    }
+
+
+class Portfolio:
+    """
+    Runs several algorithms on a graph of nodes at once, in a pool of processes.
+    The graph is compiled on creation. Create a new instance after the graph changes.
+    """
+
+    def __init__(self, nodes: list[GraphNode], weights: list[GraphWeight]):
+        """
+        Initialize an instance of the Portfolio class.
+
+        :param nodes: Nodes in graph
+        :param weights: Weights in graph
+        """
+
+        self.graph = CompiledGraph(nodes, weights)
+
+        self.start_node = next((node for node in nodes if node.is_start), None)
+        self.end_node = next((node for node in nodes if node.is_end), None)
+
+    def get_path(self, steps: list[tuple[int, int]]) -> Path:
+        """
+        Create the path from the start node along the given steps.
+
+        :param steps: Steps (weight index, node index reached) from the start node
+        :return: Path through the nodes and weights of the graph
+        """
+
+        path = Path(self.start_node)
+        for weight, node in steps:
+            path = Path(self.graph.nodes[node], self.graph.weights[weight], path)
+
+        return path
+
+    def stream(self, names: list[str] = None, processes: int = None) -> Iterator[dict]:
+        """
+        Run the algorithms, yielding the results in the order the algorithms finish.
+        Algorithms still running are stopped when the generator is closed.
+
+        :param names: Names of the algorithms to run (defaults to all of ALGORITHMS)
+        :param processes: Number of processes (defaults to one per algorithm, at most the number of CPUs)
+        :return: Generator of results, holding the path found (or None) and the measurements of each algorithm
+        """
+
+        names = list(ALGORITHMS) if names is None else names
+        processes = processes or min(len(names), os.cpu_count() or 1)
+
+        start = self.graph.index[self.start_node]
+        end = self.graph.index[self.end_node]
+        start_time = time.perf_counter()
+
+        pool = Pool(processes, initializer=_init_worker, initargs=(self.graph.detached(),))
+
+        try:
+            for result in pool.imap_unordered(partial(_run_algorithm, start=start, end=end), names):
+                result["elapsed"] = time.perf_counter() - start_time
+
+                steps = result.pop("steps")
+                result["path"] = self.get_path(steps) if steps is not None else None
+                yield result
+
+        finally:
+            pool.terminate()
+            pool.join()
+
+    def solve(self, names: list[str] = None, processes: int = None) -> dict | None:
+        """
+        Run the algorithms until the first algorithm guaranteed to find the fastest path has finished.
+
+        :param names: Names of the algorithms to run (defaults to all of ALGORITHMS)
+        :param processes: Number of processes
+        :return: Result of the first optimal algorithm to finish, or None if none of them were run
+        """
+
+        stream = self.stream(names, processes)
+
+        for result in stream:
+            if result["optimal"]:
+                stream.close()
+                return result
+
+        return None
+
+    def compare(self, names: list[str] = None, processes: int = None) -> list[dict]:
+        """
+        Run all algorithms to completion.
+
+        :param names: Names of the algorithms to run (defaults to all of ALGORITHMS)
+        :param processes: Number of processes
+        :return: Results in the order the algorithms finished
+        """
+
+        return list(self.stream(names, processes))
@@ -0,0 +1,265 @@
+from array import array
+from bisect import bisect_right
+from algo import Path
+from graph import GraphNode, GraphWeight
+
+"""
+Compact delta log of the changes a timeline makes to nodes and weights, step by step.
+
+Every step is stored as a list of changes, each being an item, its previous value and its new value:
+    Nodes have a label, which is the shortest length found to the node, or ORIGIN for its original name
+    Weights have a state, which is one of DEFAULT, SEARCHED and SEARCHING
+Nodes are stored by their index, weights by the bitwise inverse of their index (such that they are negative).
+
+Stepping forward applies the new values of a step, stepping back applies the previous values in reverse.
+Snapshots of all labels and states are taken along the log, such that seeking far away starts from the nearest
+snapshot instead of walking every step in between. A snapshot is taken once the changes since the previous snapshot
+reach the number of items, which bounds the memory of the snapshots by the size of the log, and the cost of a seek
+by the number of items.
+"""
+
+ORIGIN = -1
+
+DEFAULT = 0
+SEARCHED = 1
+SEARCHING = 2
+
+
+class Recording:
+    """ Delta log of the steps of a timeline, applied to the nodes and weights of a graph. """
+
+    def __init__(self, nodes: list[GraphNode], weights: list[GraphWeight]):
+        """
+        Initialize an instance of the Recording class.
+
+        :param nodes: Nodes in graph
+        :param weights: Weights in graph
+        """
+
+        self.nodes = list(nodes)
+        self.weights = list(weights)
+
+        self.node_index = {node: i for i, node in enumerate(self.nodes)}
+        self.weight_index = {weight: i for i, weight in enumerate(self.weights)}
+
+        # Original names that are lengths compete with found lengths, like the names set during a run
+        self.origin_lengths = [int(node.origin_name) if node.origin_name.isdecimal() else None for node in self.nodes]
+
+        # Labels and states at the current position
+        self.labels = array("q", [ORIGIN] * len(self.nodes))
+        self.states = bytearray(len(self.weights))
+
+        # Changes of step k are stored in the range offsets[k] to offsets[k + 1]
+        self.items = array("q")
+        self.old_values = array("q")
+        self.new_values = array("q")
+        self.offsets = array("q", [0])
+
+        # snapshots stores the labels and states after a number of steps, by the number of steps (kept in order)
+        self.snapshots = {0: (array("q", self.labels), bytes(self.states))}
+        self.snapshot_steps = [0]
+
+        # Number of steps currently applied
+        self.position = 0
+
+    def __len__(self) -> int:
+        """
+        Get the number of steps in the log.
+
+        :return: Number of steps
+        """
+
+        return len(self.offsets) - 1
+
+    def get_value(self, item: int) -> int:
+        """
+        Get the current value of an item.
+
+        :param item: Encoded item (node index, or inverse weight index)
+        :return: Label of node or state of weight
+        """
+
+        if item >= 0:
+            return self.labels[item]
+        return self.states[~item]
+
+    def set_value(self, item: int, value: int) -> None:
+        """
+        Set the value of an item, and apply it to the node or weight.
+
+        :param item: Encoded item (node index, or inverse weight index)
+        :param value: Label of node or state of weight
+        :return: None
+        """
+
+        if item >= 0:
+            self.labels[item] = value
+            node = self.nodes[item]
+
+            if value == ORIGIN:
+                node.set_name_origin()
+            else:
+                node.set_name(str(value))
+
+        else:
+            self.states[~item] = value
+            weight = self.weights[~item]
+
+            if value == SEARCHED:
+                weight.set_searched()
+            elif value == SEARCHING:
+                weight.set_searching()
+            else:
+                weight.is_searched = False
+                weight.is_searching = False
+
+    def change(self, item: int, value: int) -> None:
+        """
+        Add a change to the step being recorded, and apply it. Changes to the current value are skipped.
+
+        :param item: Encoded item (node index, or inverse weight index)
+        :param value: New value of the item
+        :return: None
+        """
+
+        if self.get_value(item) == value:
+            return
+
+        self.items.append(item)
+        self.old_values.append(self.get_value(item))
+        self.new_values.append(value)
+        self.set_value(item, value)
+
+    def record(self, path: Path, prev_path: Path | None) -> None:
+        """
+        Add a step visualising a path to the end of the log, and apply it.
+        Must be at the end of the log.
+
+        :param path: Path explored in the step
+        :param prev_path: Path explored in the previous step, if any
+        :return: None
+        """
+
+        # Mark weights of the previous path as searched (red), all earlier paths are already marked.
+        # Weights shared with the current path stay searching (green), so they are left out.
+        states = {}
+        if prev_path is not None:
+            for weight in prev_path.weights:
+                states[weight] = SEARCHED
+
+        for weight in path.weights:
+            states[weight] = SEARCHING
+
+        for weight, state in states.items():
+            if state == SEARCHED:
+                self.change(~self.weight_index[weight], state)
+
+        # Find the length to each node in the path, keeping the first occurrence of a node
+        lengths = {}
+        for sub_path in path.iter_paths():
+            lengths[sub_path.curr_node] = sub_path.length
+
+        # Set the length of all nodes to the shortest distance to them
+        for node, length in lengths.items():
+            i = self.node_index[node]
+            label = self.labels[i]
+            current = self.origin_lengths[i] if label == ORIGIN else label
+
+            # Faster route discovered earlier
+            if current is not None and current <= length:
+                continue
+
+            self.change(i, length)
+
+        # Mark weights in current path as being searched (green)
+        for weight, state in states.items():
+            if state == SEARCHING:
+                self.change(~self.weight_index[weight], state)
+
+        self.offsets.append(len(self.items))
+        self.position += 1
+
+        # Snapshot once the changes since the previous snapshot outweigh a snapshot
+        if self.offsets[-1] - self.offsets[self.snapshot_steps[-1]] >= len(self.labels) + len(self.states):
+            self.snapshots[self.position] = (array("q", self.labels), bytes(self.states))
+            self.snapshot_steps.append(self.position)
+
+    def forward(self) -> bool:
+        """
+        Apply the next step of the log.
+
+        :return: Whether a step was applied
+        """
+
+        if self.position >= len(self):
+            return False
+
+        for k in range(self.offsets[self.position], self.offsets[self.position + 1]):
+            self.set_value(self.items[k], self.new_values[k])
+
+        self.position += 1
+        return True
+
+    def back(self) -> bool:
+        """
+        Undo the last applied step of the log.
+
+        :return: Whether a step was undone
+        """
+
+        if self.position <= 0:
+            return False
+
+        self.position -= 1
+
+        for k in range(self.offsets[self.position + 1] - 1, self.offsets[self.position] - 1, -1):
+            self.set_value(self.items[k], self.old_values[k])
+
+        return True
+
+    def restore(self, step: int) -> None:
+        """
+        Restore the snapshot taken after a number of steps, applying only the items that differ.
+
+        :param step: Number of steps of the snapshot
+        :return: None
+        """
+
+        labels, states = self.snapshots[step]
+
+        for i, label in enumerate(labels):
+            if self.labels[i] != label:
+                self.set_value(i, label)
+
+        for i, state in enumerate(states):
+            if self.states[i] != state:
+                self.set_value(~i, state)
+
+        self.position = step
+
+    def seek(self, step: int) -> None:
+        """
+        Move to the position after a number of steps, by walking the log or from the nearest snapshot.
+
+        :param step: Number of steps to have applied (clamped to the log)
+        :return: None
+        """
+
+        step = max(0, min(step, len(self)))
+        offsets = self.offsets
+
+        # Nearest snapshot before the step
+        snapshot = self.snapshot_steps[bisect_right(self.snapshot_steps, step) - 1]
+
+        # Compare the number of changes to walk from here, with restoring the snapshot and walking from there
+        walk_cost = abs(offsets[step] - offsets[self.position])
+        snapshot_cost = len(self.labels) + len(self.states) + offsets[step] - offsets[snapshot]
+
+        if snapshot_cost < walk_cost:
+            self.restore(snapshot)
+
+        while self.position < step:
+            self.forward()
+
+        while self.position > step:
+            self.back()
@@ -0,0 +1,160 @@
+"""
+Uniform grid over the drawing area, used to find the few items near a coordinate without testing every item.
+Items are registered in every cell their bounds overlap. A query only returns the items of the cells
+overlapping a coordinate or rectangle, which are then tested exactly by the caller (if needed).
+"""
+
+
+class SpatialGrid:
+    """
+    Spatial index of items by their bounds, divided in square cells.
+    Queries return candidates in the order the items were inserted.
+
+    Attributes:
+        cell_size: Default side length of a cell
+    """
+
+    cell_size = 64
+
+    def __init__(self, cell_size: int = None):
+        """
+        Initialize an instance of the SpatialGrid class.
+
+        :param cell_size: Side length of a cell (defaults to SpatialGrid.cell_size)
+        """
+
+        if cell_size is not None:
+            self.cell_size = cell_size
+
+        # cells stores the items overlapping each cell, by their insertion number
+        self.cells = {}
+
+        # items stores the insertion number and cells of each item
+        self.items = {}
+
+        self.counter = 0
+
+    def __len__(self) -> int:
+        """
+        Get the number of items in the index.
+
+        :return: Number of items
+        """
+
+        return len(self.items)
+
+    def get_cell(self, pos: tuple[float, float]) -> tuple[int, int]:
+        """
+        Get the cell containing a coordinate.
+
+        :param pos: Coordinate
+        :return: Column and row of the cell
+        """
+
+        return int(pos[0] // self.cell_size), int(pos[1] // self.cell_size)
+
+    def add_cells(self, item, cells: set[tuple[int, int]]) -> None:
+        """
+        Register an item in the given cells, replacing any previous registration.
+
+        :param item: Item to register
+        :param cells: Cells the item overlaps
+        :return: None
+        """
+
+        self.remove(item)
+
+        self.counter += 1
+        self.items[item] = (self.counter, cells)
+
+        for cell in cells:
+            self.cells.setdefault(cell, {})[item] = self.counter
+
+    def insert_rect(self, item, left: float, top: float, right: float, bottom: float) -> None:
+        """
+        Insert an item covering a rectangle.
+
+        :param item: Item to insert
+        :param left: Left edge of the rectangle
+        :param top: Top edge of the rectangle
+        :param right: Right edge of the rectangle
+        :param bottom: Bottom edge of the rectangle
+        :return: None
+        """
+
+        min_x, min_y = self.get_cell((left, top))
+        max_x, max_y = self.get_cell((right, bottom))
+
+        self.add_cells(item, {(x, y) for x in range(min_x, max_x + 1) for y in range(min_y, max_y + 1)})
+
+    def remove(self, item) -> None:
+        """
+        Remove an item from the index, if present.
+
+        :param item: Item to remove
+        :return: None
+        """
+
+        if item not in self.items:
+            return
+
+        _, cells = self.items.pop(item)
+
+        for cell in cells:
+            members = self.cells[cell]
+            del members[item]
+
+            if not members:
+                del self.cells[cell]
+
+    def clear(self) -> None:
+        """
+        Remove all items from the index.
+
+        :return: None
+        """
+
+        self.cells.clear()
+        self.items.clear()
+        self.counter = 0
+
+    def query(self, pos: tuple[float, float]) -> list:
+        """
+        Find the items whose bounds may contain a coordinate.
+
+        :param pos: Coordinate to test
+        :return: Candidate items, in the order they were inserted
+        """
+
+        members = self.cells.get(self.get_cell(pos))
+
+        if not members:
+            return []
+
+        return sorted(members, key=members.get)
+
+    def query_rect(self, left: float, top: float, right: float, bottom: float) -> list:
+        """
+        Find the items whose bounds may overlap a rectangle.
+
+        :param left: Left edge of the rectangle
+        :param top: Top edge of the rectangle
+        :param right: Right edge of the rectangle
+        :param bottom: Bottom edge of the rectangle
+        :return: Candidate items, in the order they were inserted
+        """
+
+        min_x, min_y = self.get_cell((left, top))
+        max_x, max_y = self.get_cell((right, bottom))
+
+        # Items often overlap several of the cells, merge them to return each item once
+        found = {}
+
+        for x in range(min_x, max_x + 1):
+            for y in range(min_y, max_y + 1):
+                members = self.cells.get((x, y))
+
+                if members:
+                    found.update(members)
+
+        return sorted(found, key=found.get)
@@ -0,0 +1,404 @@
+import json
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Callable, Iterable
+from algo import CompiledGraph
+from graph import GraphNode, GraphWeight, graph_from_dict, graph_to_dict
+
+"""
+Saving and loading of graphs, either as JSON (see graph.py) or in a compact binary format.
+
+The binary format stores the graph as flat arrays, which are memory-mapped when loaded instead of parsed.
+It starts with a header (HEADER), followed by the sections listed in SECTIONS, each aligned to 8 bytes:
+    xs, ys: Coordinates of each node
+    offsets, targets, lengths, edges: The graph in compressed sparse row form (see CompiledGraph)
+    starts, ends, weight_lengths: Index of the start and end node, and the length, of each weight
+    name_offsets, names: Names of the nodes, encoded as UTF-8, where node i is stored from name_offsets[i]
+    flags: Whether each node is start (1) or end (2)
+Values are stored in the byte order of the machine that saved the file, which is checked on load.
+A compiled graph can be loaded directly from the mapped arrays, without creating any node or weight objects.
+"""
+
+MAGIC = b"GRPH"
+VERSION = 1
+
+# Magic, version, byte order, number of nodes, number of weights and size of the names in bytes
+HEADER = struct.Struct("=4sHcxqqq")
+
+# Name, type code and number of values (in nodes, weights, or bytes of names) of each section
+SECTIONS = (
+    ("xs", "d", "nodes"),
+    ("ys", "d", "nodes"),
+    ("offsets", "q", "nodes + 1"),
+    ("targets", "i", "2 * weights"),
+    ("lengths", "q", "2 * weights"),
+    ("edges", "i", "2 * weights"),
+    ("starts", "i", "weights"),
+    ("ends", "i", "weights"),
+    ("weight_lengths", "q", "weights"),
+    ("name_offsets", "q", "nodes + 1"),
+    ("names", "B", "names"),
+    ("flags", "B", "nodes")
+)
+
+FLAG_START = 1
+FLAG_END = 2
+
+
+def get_section_count(count: str, node_count: int, weight_count: int, names_size: int) -> int:
+    """
+    Get the number of values in a section.
+
+    :param count: Number of values as described in SECTIONS
+    :param node_count: Number of nodes
+    :param weight_count: Number of weights
+    :param names_size: Size of the names in bytes
+    :return: Number of values
+    """
+
+    return {
+        "nodes": node_count,
+        "nodes + 1": node_count + 1,
+        "weights": weight_count,
+        "2 * weights": 2 * weight_count,
+        "names": names_size
+    }[count]
+
+
+def write_binary(file_path: str, graph: CompiledGraph, starts: list[int], ends: list[int], weight_lengths: list[int],
+                 names: Iterable[str], flags: list[int]) -> None:
+    """
+    Write a compiled graph to a file in the binary format.
+
+    :param file_path: Path of the file to write
+    :param graph: Compiled graph
+    :param starts: Index of the start node of each weight
+    :param ends: Index of the end node of each weight
+    :param weight_lengths: Length of each weight
+    :param names: Name of each node (may be a generator, to avoid creating all names at once)
+    :param flags: Flags of each node (FLAG_START and FLAG_END)
+    :return: None
+    """
+
+    # Encode the names into a single buffer as they are generated, without keeping an object per name
+    name_offsets = array("q", [0])
+    encoded = bytearray()
+
+    for name in names:
+        encoded += name.encode()
+        name_offsets.append(len(encoded))
+
+    values = {
+        "xs": graph.xs,
+        "ys": graph.ys,
+        "offsets": graph.offsets,
+        "targets": graph.targets,
+        "lengths": graph.lengths,
+        "edges": graph.edges,
+        "starts": starts,
+        "ends": ends,
+        "weight_lengths": weight_lengths,
+        "name_offsets": name_offsets,
+        "names": encoded,
+        "flags": flags
+    }
+
+    byteorder = b"l" if sys.byteorder == "little" else b"b"
+
+    with open(file_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, byteorder, len(graph.nodes), len(starts), name_offsets[-1]))
+
+        for name, code, _ in SECTIONS:
+            data = values[name]
+
+            # Arrays of the right type are written as they are, other sequences are converted first
+            if not isinstance(data, array) or data.typecode != code:
+                data = array(code, data)
+
+            file.write(data)
+            file.write(bytes(-len(data) * data.itemsize % 8))
+
+
+def save_binary(file_path: str, nodes: list[GraphNode], weights: list[GraphWeight]) -> None:
+    """
+    Save nodes and weights to a file in the binary format.
+
+    :param file_path: Path of the file to write
+    :param nodes: Nodes in graph
+    :param weights: Weights in graph
+    :return: None
+    """
+
+    graph = CompiledGraph(nodes, weights)
+
+    write_binary(
+        file_path,
+        graph,
+        [graph.index[weight.start_node] for weight in weights],
+        [graph.index[weight.end_node] for weight in weights],
+        [int(weight.length) for weight in weights],
+        [node.origin_name for node in nodes],
+        [node.is_start * FLAG_START | node.is_end * FLAG_END for node in nodes]
+    )
+
+
+class GraphFile:
+    """
+    Graph file in the binary format, memory-mapped such that its sections are read on demand.
+    The sections are available as attributes (see SECTIONS), holding memoryviews of the file.
+    The file stays open until closed, or until the graph file and all views of it are discarded.
+    """
+
+    def __init__(self, file_path: str):
+        """
+        Open a graph file in the binary format.
+
+        :param file_path: Path of the file to open
+        """
+
+        with open(file_path, "rb") as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # Sections opened so far, released again if the file turns out to be invalid
+        self.sections = []
+
+        # Position of each section in the file (in bytes), by name
+        self.positions = {}
+
+        try:
+            self.read_sections(file_path)
+        except ValueError:
+            self.close()
+            raise
+
+    def read_sections(self, file_path: str) -> None:
+        """
+        Validate the header, and open the sections as attributes.
+
+        :param file_path: Path of the file (for error messages)
+        :return: None
+        """
+
+        data = memoryview(self.buffer)
+        self.sections.append(data)
+
+        if len(data) < HEADER.size:
+            raise ValueError(f"{file_path} is not a graph file")
+
+        magic, version, byteorder, self.node_count, self.weight_count, names_size = HEADER.unpack_from(data)
+
+        if magic != MAGIC:
+            raise ValueError(f"{file_path} is not a graph file")
+        if version != VERSION:
+            raise ValueError(f"{file_path} has unsupported version {version}")
+        if byteorder != (b"l" if sys.byteorder == "little" else b"b"):
+            raise ValueError(f"{file_path} was saved with a different byte order")
+
+        position = HEADER.size
+
+        for name, code, count in SECTIONS:
+            size = get_section_count(count, self.node_count, self.weight_count, names_size) * array(code).itemsize
+
+            if position + size > len(data):
+                raise ValueError(f"{file_path} is truncated")
+
+            section = data[position:position + size].cast(code)
+            self.sections.append(section)
+            self.positions[name] = position
+            setattr(self, name, section)
+            position += size + -size % 8
+
+    def close(self) -> None:
+        """
+        Release the sections and close the file.
+
+        :return: None
+        """
+
+        # Views must be released before the mapping can be closed, casts before the views they were made from
+        for section in reversed(self.sections):
+            section.release()
+
+        self.sections.clear()
+        self.buffer.close()
+
+    def __enter__(self):
+        """
+        Use the graph file as a context manager, closing it on exit.
+
+        :return: The graph file
+        """
+
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Close the graph file when leaving the context.
+
+        :param exc_info: Exception raised in the context, if any
+        :return: None
+        """
+
+        self.close()
+
+    def get_name(self, i: int) -> str:
+        """
+        Get the name of a node.
+
+        :param i: Index of the node
+        :return: Name of the node
+        """
+
+        return bytes(self.names[self.name_offsets[i]:self.name_offsets[i + 1]]).decode()
+
+    def find_node(self, name: str) -> int | None:
+        """
+        Find a node by name, searching the mapped names in place without decoding or copying them.
+
+        :param name: Name of the node
+        :return: Index of the first node with the name, or None if no node has it
+        """
+
+        encoded = name.encode()
+        start = self.positions["names"]
+        end = start + len(self.names)
+        position = self.buffer.find(encoded, start, end)
+
+        # Names are stored back to back, so a match only counts if it spans exactly one name
+        while position != -1:
+            position -= start
+            i = bisect_left(self.name_offsets, position)
+
+            # Nodes with empty names start at the same offset as the next node
+            while i < self.node_count and self.name_offsets[i] == position:
+                if self.name_offsets[i + 1] - position == len(encoded):
+                    return i
+                i += 1
+
+            position = self.buffer.find(encoded, start + position + 1, end)
+
+        return None
+
+    def find_flag(self, flag: int) -> int | None:
+        """
+        Find the first node with a flag set.
+
+        :param flag: Flag to find (FLAG_START or FLAG_END)
+        :return: Index of the node, or None if no node has the flag
+        """
+
+        return next((i for i, flags in enumerate(self.flags) if flags & flag), None)
+
+    def to_compiled(self) -> CompiledGraph:
+        """
+        Create a compiled graph backed by the mapped sections, without copying them.
+        Nodes and weights are represented by their indices. The file must stay open while the graph is used.
+
+        :return: Compiled graph
+        """
+
+        graph = CompiledGraph.from_arrays(self.offsets, self.targets, self.lengths, self.edges, self.xs, self.ys)
+        graph.weights = range(self.weight_count)
+        return graph
+
+    def to_objects(self, make_node: Callable = GraphNode,
+                   make_weight: Callable = GraphWeight) -> tuple[list[GraphNode], list[GraphWeight]]:
+        """
+        Create nodes and weights from the file.
+
+        :param make_node: Function creating a node from its position and name (e.g. to create UI-objects)
+        :param make_weight: Function creating a weight from its start and end node
+        :return: Nodes and weights
+        """
+
+        nodes = []
+        weights = []
+
+        for i, (x, y, flags) in enumerate(zip(self.xs, self.ys, self.flags)):
+
+            # Keep whole coordinates as integers, as placed in the editor
+            pos = (int(x) if x.is_integer() else x, int(y) if y.is_integer() else y)
+
+            node = make_node(pos, self.get_name(i))
+            node.is_start = bool(flags & FLAG_START)
+            node.is_end = bool(flags & FLAG_END)
+            nodes.append(node)
+
+        for start, end, length in zip(self.starts, self.ends, self.weight_lengths):
+            start_node = nodes[start]
+            end_node = nodes[end]
+
+            weight = make_weight(start_node, end_node)
+            weight.length = str(length)
+
+            start_node.add_weight(weight)
+            end_node.add_weight(weight)
+            weights.append(weight)
+
+        return nodes, weights
+
+
+def save_json(file_path: str, nodes: list[GraphNode], weights: list[GraphWeight]) -> None:
+    """
+    Save nodes and weights to a JSON file.
+
+    :param file_path: Path of the file to write
+    :param nodes: Nodes in graph
+    :param weights: Weights in graph
+    :return: None
+    """
+
+    with open(file_path, "w") as file:
+        json.dump(graph_to_dict(nodes, weights), file)
+
+
+def load_json(file_path: str, make_node: Callable = GraphNode,
+              make_weight: Callable = GraphWeight) -> tuple[list[GraphNode], list[GraphWeight]]:
+    """
+    Load nodes and weights from a JSON file.
+
+    :param file_path: Path of the file to read
+    :param make_node: Function creating a node from its position and name
+    :param make_weight: Function creating a weight from its start and end node
+    :return: Nodes and weights
+    """
+
+    with open(file_path) as file:
+        return graph_from_dict(json.load(file), make_node, make_weight)
+
+
+def save_graph(file_path: str, nodes: list[GraphNode], weights: list[GraphWeight]) -> None:
+    """
+    Save nodes and weights to a file, as JSON if the file ends with .json, otherwise in the binary format.
+
+    :param file_path: Path of the file to write
+    :param nodes: Nodes in graph
+    :param weights: Weights in graph
+    :return: None
+    """
+
+    if file_path.lower().endswith(".json"):
+        save_json(file_path, nodes, weights)
+    else:
+        save_binary(file_path, nodes, weights)
+
+
+def load_graph(file_path: str, make_node: Callable = GraphNode,
+               make_weight: Callable = GraphWeight) -> tuple[list[GraphNode], list[GraphWeight]]:
+    """
+    Load nodes and weights from a file, as JSON if the file ends with .json, otherwise in the binary format.
+
+    :param file_path: Path of the file to read
+    :param make_node: Function creating a node from its position and name
+    :param make_weight: Function creating a weight from its start and end node
+    :return: Nodes and weights
+    """
+
+    if file_path.lower().endswith(".json"):
+        return load_json(file_path, make_node, make_weight)
+
+    with GraphFile(file_path) as graph_file:
+        return graph_file.to_objects(make_node, make_weight)
@@ -0,0 +1,31 @@
+import os
+import random
+import sys
+import pytest
+
+"""
+Shared setup for the tests. The modules live in the repository root rather than a package, so it is put on the path.
+"""
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import benchmark  # noqa: E402 (needs the repository root on the path)
+
+# Graph families and seeds the solvers are tested on, kept small such that every solver finishes quickly
+GRAPHS = [(family, seed) for family in benchmark.FAMILIES for seed in range(3)]
+
+
+@pytest.fixture(params=GRAPHS, ids=[f"{family}-{seed}" for family, seed in GRAPHS])
+def graph(request):
+    """
+    Random graph with a start node and a reachable end node marked.
+
+    :param request: Family and seed of the graph
+    :return: Nodes and weights
+    """
+
+    family, seed = request.param
+    rnd = random.Random(seed)
+    nodes, weights = benchmark.FAMILIES[family](200, rnd)
+    benchmark.pick_endpoints(nodes, rnd)
+    return nodes, weights
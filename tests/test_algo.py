@@ -0,0 +1,114 @@
+import pytest
+from algo import (BFS, AStar, Dijkstra, Greedy, DFS, BranchAndBoundDFS, BidirectionalDijkstra, BidirectionalAStar,
+                  CompiledGraph, PathQueue, find_solution, shortest_lengths, shortest_path)
+from components import ComponentIndex
+from contraction import ContractionHierarchies
+from dynamic import LPAStar
+from graph import GraphNode, GraphWeight
+
+"""
+Tests of the solvers, checking the paths they find against plain Dijkstra on the compiled graph.
+"""
+
+OPTIMAL = [Dijkstra, AStar, BFS, BranchAndBoundDFS, BidirectionalDijkstra, BidirectionalAStar, ContractionHierarchies,
+           LPAStar]
+
+# Solvers that find some path, not necessarily the fastest
+SUBOPTIMAL = [DFS, Greedy]
+
+
+def fastest_length(nodes: list[GraphNode], weights: list[GraphWeight]) -> int | None:
+    """
+    Find the length of the fastest path from the start node to the end node with plain Dijkstra.
+
+    :param nodes: Nodes in graph
+    :param weights: Weights in graph
+    :return: Length of the fastest path, or None if the end node is unreachable
+    """
+
+    graph = CompiledGraph(nodes, weights)
+    start = next(node for node in nodes if node.is_start)
+    end = next(node for node in nodes if node.is_end)
+    return shortest_lengths(graph, graph.index[start])[graph.index[end]]
+
+
+def check_path(path, nodes: list[GraphNode]) -> None:
+    """
+    Check that a path leads from the start node to the end node along connected weights, and has their length.
+
+    :param path: Path to check
+    :param nodes: Nodes in graph
+    :return: None
+    """
+
+    assert path.nodes[0].is_start
+    assert path.nodes[-1].is_end
+    assert all(node in nodes for node in path.nodes)
+
+    for weight, node, next_node in zip(path.weights, path.nodes, path.nodes[1:]):
+        assert weight.get_other_node(node) is next_node
+
+    assert path.length == sum(int(weight.length) for weight in path.weights)
+
+
+@pytest.mark.parametrize("algorithm_cls", OPTIMAL, ids=lambda cls: cls.__name__)
+def test_optimal(graph, algorithm_cls):
+    nodes, weights = graph
+    recording = algorithm_cls(nodes, weights).run()
+    solution = find_solution(recording)
+
+    check_path(solution, nodes)
+    assert solution.length == fastest_length(nodes, weights)
+
+
+@pytest.mark.parametrize("algorithm_cls", SUBOPTIMAL, ids=lambda cls: cls.__name__)
+def test_suboptimal(graph, algorithm_cls):
+    nodes, weights = graph
+    recording = algorithm_cls(nodes, weights).run()
+
+    check_path(find_solution(recording), nodes)
+
+
+@pytest.mark.parametrize("algorithm_cls", OPTIMAL + SUBOPTIMAL, ids=lambda cls: cls.__name__)
+def test_unreachable(algorithm_cls):
+    nodes = [GraphNode((0, 0), "A"), GraphNode((100, 0), "B"), GraphNode((200, 0), "C")]
+    weight = GraphWeight(nodes[0], nodes[1])
+    nodes[0].add_weight(weight)
+    nodes[1].add_weight(weight)
+    nodes[0].is_start = True
+    nodes[2].is_end = True
+
+    algorithm = algorithm_cls(nodes, [weight])
+    assert algorithm.run() is None
+    assert not algorithm.found
+
+    # With a component index, no search is made at all
+    algorithm.components = ComponentIndex(nodes, [weight])
+    assert algorithm.run() is None
+    assert algorithm.expanded == 0
+
+
+def test_shortest_path(graph):
+    nodes, weights = graph
+    compiled = CompiledGraph(nodes, weights)
+    start = compiled.index[next(node for node in nodes if node.is_start)]
+    lengths = shortest_lengths(compiled, start)
+
+    for end in range(0, len(nodes), 17):
+        length, path, _ = shortest_path(compiled, start, end)
+        assert length == lengths[end]
+
+        if length is not None:
+            assert path[0] == start and path[-1] == end
+
+
+def test_path_queue_order():
+    queue = PathQueue()
+
+    for node, key in enumerate([2, 1, 2, 1]):
+        queue.push(key, node, None, None)
+
+    # Lowest key first, and the most recently pushed first among equal keys
+    assert queue.peek() == 1
+    assert [queue.pop()[1] for _ in range(4)] == [3, 1, 2, 0]
+    assert not queue
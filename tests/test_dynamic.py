@@ -0,0 +1,96 @@
+import random
+import benchmark
+from algo import find_solution
+from dynamic import LPAStar
+from graph import GraphWeight
+from test_algo import check_path, fastest_length
+
+"""
+Tests of LPA* repairing its kept search state after the graph is edited, as the editor reports edits.
+"""
+
+
+def check_run(lpastar: LPAStar) -> int:
+    """
+    Run LPA*, and check that it finds the fastest path of the current graph.
+
+    :param lpastar: LPA* keeping its state from earlier runs
+    :return: Number of nodes expanded by the run
+    """
+
+    expected = fastest_length(lpastar.nodes, lpastar.weights)
+    recording = lpastar.run()
+
+    if expected is None:
+        assert recording is None
+    else:
+        check_path(find_solution(recording), lpastar.nodes)
+        assert find_solution(recording).length == expected
+
+    return lpastar.expanded
+
+
+def test_repair_after_edits(graph):
+    nodes, weights = graph
+    rnd = random.Random(len(weights))
+    lpastar = LPAStar(nodes, weights)
+    check_run(lpastar)
+
+    for _ in range(20):
+        action = rnd.random()
+
+        # Change the length of a weight
+        if action < 0.5:
+            weight = rnd.choice(weights)
+            weight.length = str(rnd.randint(0, 100))
+
+        # Remove a weight
+        elif action < 0.75:
+            weight = weights.pop(rnd.randrange(len(weights)))
+            weight.start_node.remove_weight(weight)
+            weight.end_node.remove_weight(weight)
+
+        # Add a weight between two unconnected nodes
+        else:
+            start_node, end_node = rnd.sample(nodes, 2)
+            if any(weight.is_similar(start_node, end_node) for weight in start_node.weights):
+                continue
+
+            weight = GraphWeight(start_node, end_node)
+            start_node.add_weight(weight)
+            end_node.add_weight(weight)
+            weights.append(weight)
+
+        lpastar.update_weight(weight)
+        check_run(lpastar)
+
+
+def test_repair_expands_less():
+    rnd = random.Random(0)
+    nodes, weights = benchmark.FAMILIES["grid"](2000, rnd)
+    benchmark.pick_endpoints(nodes, rnd)
+
+    lpastar = LPAStar(nodes, weights)
+    full = check_run(lpastar)
+
+    # Without changes, the kept state already holds the fastest path
+    assert check_run(lpastar) == 0
+
+    # A single changed weight is repaired locally
+    weight = weights[len(weights) // 2]
+    weight.length = str(int(weight.length) + 1)
+    lpastar.update_weight(weight)
+    assert check_run(lpastar) < full
+
+
+def test_new_start_searches_again(graph):
+    nodes, weights = graph
+    lpastar = LPAStar(nodes, weights)
+    check_run(lpastar)
+
+    start = next(node for node in nodes if node.is_start)
+    end = next(node for node in nodes if node.is_end)
+    start.is_start, end.is_end = False, False
+    end.is_start, start.is_end = True, True
+
+    check_run(lpastar)
@@ -0,0 +1,142 @@
+import pytest
+from algo import shortest_lengths
+from importers import read_dimacs, read_edge_list
+from storage import GraphFile
+
+"""
+Tests of importing graphs from DIMACS and CSV files, and saving them in the binary format.
+"""
+
+DIMACS_GRAPH = """c small test graph
+p sp 4 8
+a 1 2 3
+a 2 1 3
+a 2 3 4
+a 3 2 4
+a 1 4 10
+a 4 1 10
+a 3 4 2
+a 4 3 2
+"""
+
+DIMACS_COORDINATES = """c coordinates
+p aux sp co 4
+v 1 0 0
+v 2 3 0
+v 3 3 4
+v 4 0 4
+"""
+
+EDGES = """source,target,length
+a,b,1.5
+b,c,2
+a,c,4
+"""
+
+NODES = """id,x,y
+a,0,0
+b,1,0
+c,1,1
+"""
+
+
+def write(tmp_path, name: str, text: str) -> str:
+    """
+    Write a test file.
+
+    :param tmp_path: Directory of the test
+    :param name: Name of the file
+    :param text: Content of the file
+    :return: Path of the file
+    """
+
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+@pytest.mark.parametrize("chunk_size", [16, 1 << 16])
+def test_read_dimacs(tmp_path, chunk_size):
+    gr_path = write(tmp_path, "graph.gr", DIMACS_GRAPH)
+    co_path = write(tmp_path, "graph.co", DIMACS_COORDINATES)
+
+    graph = read_dimacs(gr_path, co_path, chunk_size=chunk_size)
+
+    assert graph.node_count == 4
+    assert sorted(zip(graph.starts, graph.ends, graph.lengths)) == [(0, 1, 3), (0, 3, 10), (1, 2, 4), (2, 3, 2)]
+    assert list(graph.xs) == [0, 3, 3, 0]
+    assert list(graph.ys) == [0, 0, 4, 4]
+    assert list(graph.get_names()) == ["1", "2", "3", "4"]
+    assert shortest_lengths(graph.compile(), 0) == [0, 3, 7, 9]
+
+
+def test_read_dimacs_asymmetric(tmp_path):
+    gr_path = write(tmp_path, "graph.gr", DIMACS_GRAPH)
+
+    graph = read_dimacs(gr_path, symmetric=False)
+
+    assert len(graph.starts) == 8
+
+
+def test_read_dimacs_without_problem_line(tmp_path):
+    gr_path = write(tmp_path, "graph.gr", "c no problem line\n")
+
+    with pytest.raises(ValueError, match="has no problem line"):
+        read_dimacs(gr_path)
+
+
+def test_read_dimacs_arcs_before_problem_line(tmp_path):
+    gr_path = write(tmp_path, "graph.gr", "a 1 2 3\np sp 2 1\n")
+
+    with pytest.raises(ValueError, match="before the problem line"):
+        read_dimacs(gr_path)
+
+
+def test_read_dimacs_round_trip(tmp_path):
+    gr_path = write(tmp_path, "graph.gr", DIMACS_GRAPH)
+    co_path = write(tmp_path, "graph.co", DIMACS_COORDINATES)
+    graph = read_dimacs(gr_path, co_path)
+
+    graph_path = str(tmp_path / "graph.bin")
+    graph.save(graph_path)
+
+    with GraphFile(graph_path) as graph_file:
+        assert graph_file.node_count == 4
+        assert list(zip(graph_file.starts, graph_file.ends, graph_file.weight_lengths)) == \
+            list(zip(graph.starts, graph.ends, graph.lengths))
+        assert list(graph_file.xs) == list(graph.xs)
+        assert graph_file.find_node("3") == 2
+        assert shortest_lengths(graph_file.to_compiled(), 0) == [0, 3, 7, 9]
+
+
+def test_read_edge_list(tmp_path):
+    edges_path = write(tmp_path, "edges.csv", EDGES)
+    nodes_path = write(tmp_path, "nodes.csv", NODES)
+
+    graph = read_edge_list(edges_path, nodes_path, scale=10)
+
+    assert graph.names == ["a", "b", "c"]
+    assert list(zip(graph.starts, graph.ends, graph.lengths)) == [(0, 1, 15), (1, 2, 20), (0, 2, 40)]
+    assert list(graph.xs) == [0, 1, 1]
+    assert shortest_lengths(graph.compile(), 0) == [0, 15, 35]
+
+
+def test_read_edge_list_round_trip(tmp_path):
+    edges_path = write(tmp_path, "edges.csv", EDGES)
+    graph = read_edge_list(edges_path)
+
+    graph_path = str(tmp_path / "graph.bin")
+    graph.save(graph_path)
+
+    with GraphFile(graph_path) as graph_file:
+        assert [graph_file.get_name(i) for i in range(graph_file.node_count)] == ["a", "b", "c"]
+        assert graph_file.find_node("c") == 2
+        assert graph_file.find_node("d") is None
+        assert list(graph_file.weight_lengths) == [2, 2, 4]
+
+
+def test_read_edge_list_missing_column(tmp_path):
+    edges_path = write(tmp_path, "edges.csv", "from,to,length\na,b,1\n")
+
+    with pytest.raises(ValueError, match="no column named 'source'"):
+        read_edge_list(edges_path)
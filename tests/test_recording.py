@@ -0,0 +1,88 @@
+import random
+from algo import Dijkstra, DFS
+from recording import Recording
+
+"""
+Tests of the delta log of a timeline, checking that seeking shows the same graph as stepping to the same position.
+"""
+
+
+def get_state(nodes: list, weights: list) -> tuple:
+    """
+    Get everything the recording changes about a graph.
+
+    :param nodes: Nodes in graph
+    :param weights: Weights in graph
+    :return: Names of the nodes, and searched states of the weights
+    """
+
+    return tuple(node.name for node in nodes), tuple((weight.is_searched, weight.is_searching) for weight in weights)
+
+
+def record(nodes: list, weights: list, algorithm_cls: type) -> tuple[Recording, list[tuple]]:
+    """
+    Record a run of an algorithm, keeping the state of the graph after every step.
+
+    :param nodes: Nodes in graph
+    :param weights: Weights in graph
+    :param algorithm_cls: Algorithm to run
+    :return: Recording, and the state after each number of steps
+    """
+
+    recording = Recording(nodes, weights)
+    states = [get_state(nodes, weights)]
+    last_path = None
+
+    for path in algorithm_cls(nodes, weights).stream():
+        recording.record(path, last_path)
+        states.append(get_state(nodes, weights))
+        last_path = path
+
+    return recording, states
+
+
+def test_seek_matches_stepping(graph):
+    nodes, weights = graph
+
+    for algorithm_cls in (Dijkstra, DFS):
+        recording, states = record(nodes, weights, algorithm_cls)
+        assert len(recording) == len(states) - 1
+
+        # Jump back and forth, far and near, across snapshots
+        rnd = random.Random(len(recording))
+        for _ in range(200):
+            step = rnd.randint(0, len(recording))
+            recording.seek(step)
+
+            assert recording.position == step
+            assert get_state(nodes, weights) == states[step]
+
+        recording.seek(0)
+        assert get_state(nodes, weights) == states[0]
+
+
+def test_back_and_forward(graph):
+    nodes, weights = graph
+    recording, states = record(nodes, weights, Dijkstra)
+
+    while recording.back():
+        assert get_state(nodes, weights) == states[recording.position]
+
+    assert recording.position == 0
+
+    while recording.forward():
+        assert get_state(nodes, weights) == states[recording.position]
+
+    assert recording.position == len(recording)
+
+
+def test_seek_clamped(graph):
+    nodes, weights = graph
+    recording, states = record(nodes, weights, Dijkstra)
+
+    recording.seek(-5)
+    assert recording.position == 0
+
+    recording.seek(len(recording) + 5)
+    assert recording.position == len(recording)
+    assert get_state(nodes, weights) == states[-1]
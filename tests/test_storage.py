@@ -0,0 +1,86 @@
+import pytest
+import sys
+from algo import CompiledGraph, shortest_lengths
+from graph import GraphNode, graph_to_dict
+from storage import HEADER, GraphFile, load_graph, save_graph, FLAG_START, FLAG_END
+
+"""
+Tests of saving and loading graphs, in JSON and in the binary format.
+"""
+
+
+@pytest.mark.parametrize("file_name", ["graph.json", "graph.graph"])
+def test_round_trip(tmp_path, graph, file_name):
+    nodes, weights = graph
+    file_path = str(tmp_path / file_name)
+
+    save_graph(file_path, nodes, weights)
+    loaded_nodes, loaded_weights = load_graph(file_path)
+
+    assert graph_to_dict(loaded_nodes, loaded_weights) == graph_to_dict(nodes, weights)
+
+
+def test_binary_sections(tmp_path, graph):
+    nodes, weights = graph
+    file_path = str(tmp_path / "graph.graph")
+    save_graph(file_path, nodes, weights)
+
+    compiled = CompiledGraph(nodes, weights)
+    start = next(i for i, node in enumerate(nodes) if node.is_start)
+    end = next(i for i, node in enumerate(nodes) if node.is_end)
+
+    with GraphFile(file_path) as graph_file:
+        assert (graph_file.node_count, graph_file.weight_count) == (len(nodes), len(weights))
+        assert graph_file.find_flag(FLAG_START) == start
+        assert graph_file.find_flag(FLAG_END) == end
+        assert graph_file.find_node(nodes[end].name) == next(i for i, node in enumerate(nodes)
+                                                             if node.name == nodes[end].name)
+
+        # The mapped arrays are solved directly, like the compiled graph of objects
+        assert shortest_lengths(graph_file.to_compiled(), start) == shortest_lengths(compiled, start)
+
+
+def test_find_node_by_whole_name(tmp_path):
+    file_path = str(tmp_path / "graph.graph")
+    names = ["AB", "A", "", "B", "BA", "ABA", "", "Æ"]
+    save_graph(file_path, [GraphNode((i, 0), name) for i, name in enumerate(names)], [])
+
+    # Names are stored back to back, so parts of neighbouring names must not match
+    with GraphFile(file_path) as graph_file:
+        for name in names + ["C", "AA", "BAB"]:
+            assert graph_file.find_node(name) == (names.index(name) if name in names else None)
+
+
+def test_truncated(tmp_path, graph):
+    nodes, weights = graph
+    file_path = tmp_path / "graph.graph"
+    save_graph(str(file_path), nodes, weights)
+
+    data = file_path.read_bytes()
+    file_path.write_bytes(data[:len(data) // 2])
+
+    with pytest.raises(ValueError, match="is truncated"):
+        GraphFile(str(file_path))
+
+
+def test_wrong_byte_order(tmp_path, graph):
+    nodes, weights = graph
+    file_path = tmp_path / "graph.graph"
+    save_graph(str(file_path), nodes, weights)
+
+    # The byte order flag follows the magic and version
+    data = bytearray(file_path.read_bytes())
+    data[6:7] = b"b" if sys.byteorder == "little" else b"l"
+    file_path.write_bytes(data)
+
+    with pytest.raises(ValueError, match="different byte order"):
+        GraphFile(str(file_path))
+
+
+@pytest.mark.parametrize("data", [b"", b"GRPH", b"JSON" + bytes(HEADER.size)])
+def test_not_a_graph_file(tmp_path, data):
+    file_path = tmp_path / "graph.graph"
+    file_path.write_bytes(data)
+
+    with pytest.raises(ValueError):
+        GraphFile(str(file_path))
@@ -1,17 +1,41 @@
 import pygame
 import sys
+import time
 from algo import Path
+from recording import Recording
+from worker import SolverWorker
 
 
 class Timeline:
-    """ Timeline class to manage visualisation of any algorithm. """
-
-    def __init__(self, ui, timeline: list[Path]):
+    """
+    Timeline class to manage visualisation of any algorithm.
+
+    The algorithm runs on a background worker (see worker.py), and visualisation starts while it is still running.
+    Steps are only taken as far as the worker has found paths, and only for a limited time per frame,
+    such that the window never waits for the search. Seeking further continues over the following frames.
+    Every step taken from the timeline is stored in a recording as the changes it made (see recording.py),
+    such that stepping back or seeking applies those changes instead of replaying the timeline.
+
+    Attributes:
+        speeds: Steps per second available for playback
+        default_speed: Index of the playback speed to start at
+        max_play_time: Longest time (seconds) that is played in a single frame, to catch up after slow frames
+        progress_interval: Time (milliseconds) between updates of the progress while the worker is searching
+        max_record_time: Longest time (seconds) spent recording new steps in a single frame
+    """
+
+    speeds = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+    default_speed = 3
+    max_play_time = 0.25
+    progress_interval = 100
+    max_record_time = 0.05
+
+    def __init__(self, ui, worker: SolverWorker):
         """
         Initialize an instance of the timeline class.
 
         :param ui: Pointer to the ui object
-        :param timeline: Each algorithm creates a timeline that this object can display
+        :param worker: Worker running an algorithm, whose paths are the steps of the timeline
         """
 
         self.ui = ui
@@ -21,23 +45,38 @@ class Timeline:
         self.timeline_buttons = self.ui.timeline_buttons
         self.general_buttons = self.ui.general_buttons
 
-        self.timeline = timeline
-        self.current_pos = -1
-        self.current_path = timeline[0]
-        self.active_paths = []
+        self.worker = worker
 
-        self.running = None
+        self.recording = Recording(self.nodes, self.weights)
+
+        # Fastest path to the end node so far, and the last path recorded
+        self.solution = None
+        self.last_path = None
+        self.finished = False
 
-        end_paths = [path for path in self.timeline if path.nodes[-1].is_end]
-        solution = min(end_paths, key=lambda path: path.length)
+        # Number of steps still being sought over the following frames, if any
+        self.target = None
 
-        if not self.timeline[-1].curr_node.is_end or solution.length < self.timeline[-1].length:
-            self.timeline.append(solution)
+        # Playback state, play_progress holds the fraction of a step played since the last step
+        self.playing = False
+        self.speed = self.default_speed
+        self.play_time = 0
+        self.play_progress = 0
+
+        # Whether the scrubber is being dragged
+        self.scrubbing = False
+        self.scrubber = self.ui.timeline_scrubber
+
+        self.running = None
 
         self.ui.apply_callbacks(**{
             "BUTTON_TIME_FORWARD": self.forward,
             "BUTTON_TIME_BACK": self.back,
             "BUTTON_TIME_STOP": self.stop,
+            "BUTTON_TIME_PLAY": self.toggle_play,
+            "BUTTON_TIME_SLOWER": self.slower,
+            "BUTTON_TIME_FASTER": self.faster,
+            "BUTTON_TIME_SOLUTION": self.seek_solution,
             "BUTTON_GEN_EXIT": self.quit
         })
 
@@ -61,96 +100,213 @@ class Timeline:
         :Return: None
         """
 
+        self.worker.cancel()
+
         for weight in self.weights:
             weight.set_default()
 
         for node in self.nodes:
             node.set_name_origin()
 
+        self.scrubber.set_progress(0, 0, "")
+        self.playing = False
+        self.target = None
         self.running = False
 
-    def back(self):
+    def next_path(self) -> Path | None:
+        """
+        Take the path of the next step from the worker.
+        Once the worker is done, the fastest path to the end node is added as the last step (if not already).
+
+        :return: Next path or None if at the end, or if the worker has not found it yet
+        """
+
+        if self.finished:
+            return None
+
+        # Check whether the worker is done first, as it queues its last path before it is done
+        done = self.worker.done
+        path = self.worker.take()
+
+        if path is None:
+            if not done:
+                return None
+
+            self.finished = True
+
+            if self.worker.error is not None:
+                print(f"Search failed: {self.worker.error!r}", file=sys.stderr)
+
+            last = self.last_path
+            if self.solution is not None and (not last.curr_node.is_end or self.solution.length < last.length):
+                return self.solution
+
+            return None
+
+        # Keep the first of the fastest paths to the end node
+        if path.curr_node.is_end and (self.solution is None or path.length < self.solution.length):
+            self.solution = path
+
+        return path
+
+    def extend(self) -> bool:
+        """
+        Record the next step of the timeline, if found. Must be at the end of the recording.
+
+        :return: Whether a step was recorded
         """
-        Function to visualize the previous path explored of the timeline
 
+        path = self.next_path()
+        if path is None:
+            return False
+
+        self.recording.record(path, self.last_path)
+        self.last_path = path
+        return True
+
+    def seek(self, step: int) -> None:
+        """
+        Visualize the timeline after a number of steps, taking steps from the worker if not yet recorded.
+        If the steps are not found yet, or take too long to record, the seek continues in the following frames.
+
+        :param step: Number of steps to visualize (clamped to the timeline)
         :return: None
         """
 
-        # Don't step beyond the bounds of the timeline
-        if self.current_pos < 0:
-            return
+        step = max(0, step)
+        self.recording.seek(step)
 
-        # Stepping backwards, removing most recent path
-        self.current_pos -= 1
-        self.active_paths = self.active_paths[:-1]
+        deadline = time.perf_counter() + self.max_record_time
+        while self.recording.position < step and time.perf_counter() < deadline and self.extend():
+            pass
 
-        if self.active_paths:
-            self.current_path = self.active_paths[-1]
-        else:
-            self.current_path = None
+        self.target = step if self.recording.position < step and not self.finished else None
 
-        # Reset all nodes and weights to their original
-        for node in self.nodes:
-            node.set_name_origin()
+    def seek_solution(self) -> None:
+        """
+        Visualize the last step, which shows the fastest path to the end node.
+        If the worker is still searching, the timeline keeps seeking to the end until the worker is done.
 
-        for weight in self.weights:
-            weight.set_default()
+        :return: None
+        """
 
-        # Set the length of all nodes to the shortest distance to them
-        for path in self.active_paths:
-            for node in path.nodes:
-                length = path.length_to_node(node)
+        self.seek(sys.maxsize)
+        self.playing = False
 
-                # Faster route discovered earlier
-                if node.name.isnumeric() and int(node.name) <= length:
-                    continue
+    def toggle_play(self) -> None:
+        """
+        Start or pause playback of the timeline. Playback restarts from the beginning when at the end.
+
+        :return: None
+        """
 
-                node.set_name(str(length))
+        self.playing = not self.playing
+        self.target = None
 
-            # Mark searched weights as searched (red)
-            for weight in path.weights:
-                weight.set_searched()
+        if self.playing and self.finished and self.recording.position >= len(self.recording):
+            self.seek(0)
 
-        # Mark weights in current path as being searched (green)
-        if self.current_path is not None:
-            for weight in self.current_path.weights:
-                weight.set_searching()
+        self.play_time = time.perf_counter()
+        self.play_progress = 0
 
-    def forward(self):
+    def slower(self) -> None:
         """
-        Function to visualize the next path of the timeline
-        
+        Decrease the playback speed.
+
         :return: None
         """
 
-        # Don't step beyond the bounds of the timeline
-        if self.current_pos >= len(self.timeline) - 1:
+        self.speed = max(self.speed - 1, 0)
+
+    def faster(self) -> None:
+        """
+        Increase the playback speed.
+
+        :return: None
+        """
+
+        self.speed = min(self.speed + 1, len(self.speeds) - 1)
+
+    def play(self) -> None:
+        """
+        Step forward by the number of steps due since the last frame, at the playback speed.
+
+        :return: None
+        """
+
+        now = time.perf_counter()
+        self.play_progress += min(now - self.play_time, self.max_play_time) * self.speeds[self.speed]
+        self.play_time = now
+
+        steps = int(self.play_progress)
+        if not steps:
             return
 
-        # Get next path in the timeline
-        self.current_pos += 1
-        self.current_path = self.timeline[self.current_pos]
-        self.active_paths.append(self.current_path)
+        self.play_progress -= steps
+        position = self.recording.position
+        self.seek(position + steps)
+
+        # Pause once the end has been reached, or wait while the worker is searching
+        if self.recording.position < position + steps:
+            if self.finished:
+                self.playing = False
+            else:
+                self.play_progress = 0
+
+    def get_timeout(self) -> int | None:
+        """
+        Get the time until the next step is due, or the progress is updated, to wake up for while waiting for events.
+
+        :return: Milliseconds until the next update, or None if there is nothing to update
+        """
+
+        # Continue seeking right away, as the worker pauses while its queue of paths is full
+        if self.target is not None:
+            return 1
+
+        timeout = None if self.worker.done else self.progress_interval
+
+        if self.playing:
+            play_timeout = max(1, int((1 - self.play_progress) / self.speeds[self.speed] * 1000))
+            timeout = play_timeout if timeout is None else min(timeout, play_timeout)
+
+        return timeout
 
-        # Set the length of all nodes to the shortest distance to them
-        for node in self.current_path.nodes:
-            length = self.current_path.length_to_node(node)
+    def update_scrubber(self) -> None:
+        """
+        Show the current step, number of steps and playback speed in the scrubber.
+        The number of steps found so far is marked with a plus while the worker is still searching.
 
-            # Faster route discovered earlier
-            if node.name.isnumeric() and int(node.name) <= length:
-                continue
+        :return: None
+        """
 
-            node.set_name(str(length))
+        position = self.recording.position
+        length = len(self.recording) + self.worker.get_queued()
+        more = "" if self.finished else "+"
+        text = f"{position} / {length}{more}   {self.speeds[self.speed]}/s"
 
-        # Mark searched weights as searched (red)
-        for path in self.active_paths:
-            if path is not self.current_path:
-                for weight in path.weights:
-                    weight.set_searched()
+        if self.finished and self.solution is None:
+            text = "No path"
 
-        # Mark weights in current path as being searched (green)
-        for weight in self.current_path.weights:
-            weight.set_searching()
+        self.scrubber.set_progress(position, length, text)
+
+    def back(self):
+        """
+        Function to visualize the previous path explored of the timeline
+
+        :return: None
+        """
+
+        self.seek(self.recording.position - 1)
+
+    def forward(self):
+        """
+        Function to visualize the next path of the timeline
+        
+        :return: None
+        """
+
+        self.seek(self.recording.position + 1)
 
     def on_click(self, event: pygame.event.Event) -> None:
         """
@@ -160,6 +316,10 @@ class Timeline:
         :return: None
         """
 
+        if self.scrubber.clicked(event.pos):
+            self.scrubbing = True
+            self.seek(self.scrubber.get_step(event.pos))
+
         for button in self.timeline_buttons:
             if button.clicked(event.pos):
                 button.callback()
@@ -182,6 +342,21 @@ class Timeline:
         elif event.key == pygame.K_BACKSPACE:
             self.stop()
 
+        elif event.key == pygame.K_SPACE:
+            self.toggle_play()
+
+        elif event.key == pygame.K_HOME:
+            self.seek(0)
+
+        elif event.key == pygame.K_END:
+            self.seek_solution()
+
+        elif event.key == pygame.K_UP:
+            self.faster()
+
+        elif event.key == pygame.K_DOWN:
+            self.slower()
+
     def main(self) -> None:
         """
         Main function loop.
@@ -190,15 +365,26 @@ class Timeline:
         """
 
         self.running = True
+        self.update_scrubber()
 
         while self.running:
-            for event in pygame.event.get():
-                if hasattr(event, "pos"):
-                    event.pos = self.ui.get_virtual_cords(event.pos)
-
+            for event in self.ui.get_events(self.get_timeout()):
                 if event.type == pygame.KEYDOWN:
                     self.on_keypress(event)
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     self.on_click(event)
+                if event.type == pygame.MOUSEMOTION and self.scrubbing:
+                    self.seek(self.scrubber.get_step(event.pos))
+                if event.type == pygame.MOUSEBUTTONUP:
+                    self.scrubbing = False
+
+            if self.playing:
+                self.play()
+
+            elif self.target is not None:
+                self.seek(self.target)
+
+            if self.running:
+                self.update_scrubber()
 
             self.ui.draw()
@@ -1,5 +1,6 @@
 import pygame
 from typing import Callable
+from graph import GraphNode, GraphWeight
 
 
 class Mask:
@@ -292,97 +293,225 @@ class TextInput:
         self.ui.blit(text_surface, text_rect, (max(text_rect.w - self.rect.w + 12, 0), 0, self.rect.w, self.rect.h))
 
 
-class Node:
+class Scrubber:
     """
-    UI-class for drawing a node (or a vertex) for use in graphing.
+    UI-object to draw a bar showing progress through a number of steps, that can be clicked to seek.
 
     Attributes:
-        color_active_start: Color to draw a start-node when selected
-        color_active_end: Color to draw an end-node when selected
-        color_active: Color to draw a node when selected
-        color_boundary: Color to draw the node boundary
-        color_passive: Color to draw a node when not selected
-        color_start: Color to draw a start-node
-        color_end: Color to draw an end-node
-        color_text: Color to draw text
-        border_width: Width of node border (adjusted for 1080p)
-        radius: Radius of node (adjusted for 1080p)
+        color_body: Color to draw the main body
+        color_fill: Color to draw the progress
+        color_border: Color to draw the border
+        color_text: Color to draw the text
+        border_width: Width of the border (adjusted for 1080p)
     """
 
-    color_active_start = pygame.Color("lime")
-    color_active_end = pygame.Color("orange")
-    color_active = pygame.Color("yellow")
-    color_boundary = pygame.Color("black")
-    color_passive = pygame.Color("grey")
-    color_start = pygame.Color("limegreen")
-    color_end = pygame.Color("red")
+    color_body = pygame.Color("white")
+    color_fill = pygame.Color("limegreen")
+    color_border = pygame.Color("black")
     color_text = pygame.Color("black")
 
-    border_width = 5
-    radius = 32
+    border_width = 2
 
-    def __init__(self, ui, pos: tuple[int, int], name: str):
+    def __init__(self, ui, rect: pygame.Rect, identifier: str):
         """
-        Initialize an instance of the Node class.
+        Initialize an instance of the Scrubber class.
 
         :param ui: Pointer to the owner UI-object
-        :param pos: Coordinates to the node center
-        :param name: Name of the node
+        :param rect: Rect to draw the bar within (text is drawn below)
+        :param identifier: Identifier for scene objects
         """
 
         self.ui = ui
-        self.pos = pos
-        self.rect = None
-        self.name = name
-        self.origin_name = name
-
-        self.is_start = False
-        self.is_end = False
-        self.state = False
+        self.rect = rect
+        self.identifier = identifier
 
-        self.weights = []
+        # Current step, number of steps and text describing them
+        self.position = 0
+        self.length = 0
+        self.text = ""
 
         self.text_font = self.ui.get_font(None, 32)
 
-    def set_name(self, name: str) -> None:
+    def set_progress(self, position: int, length: int, text: str) -> None:
         """
-        Set the name of a node.
+        Set the current step and number of steps to show.
 
-        :param name: New name
+        :param position: Current step
+        :param length: Number of steps
+        :param text: Text to show below the bar
         :return: None
         """
 
-        self.name = name
+        self.position = position
+        self.length = length
+        self.text = text
+
+    def get_signature(self) -> tuple:
+        """
+        Get everything that affects how the scrubber is drawn, to detect when it must be redrawn.
+
+        :return: Drawn state of the scrubber
+        """
+
+        return self.get_fill_width(), self.text
 
-    def set_name_origin(self) -> None:
+    def get_fill_width(self) -> int:
         """
-        Reset the node to its original name (solver)
+        Get the width of the progress bar.
+
+        :return: Virtual width of the progress
+        """
+
+        if self.length <= 0:
+            return 0
+        return round(self.rect.w * min(self.position / self.length, 1))
+
+    def clicked(self, pos: tuple[int, int]) -> bool:
+        """
+        Detect whether a given coordinate overlaps the bar.
+
+        :param pos: Coordinate to test
+        :return: Whether the coordinate overlaps the bar
+        """
+
+        return self.rect.collidepoint(pos)
+
+    def get_step(self, pos: tuple[int, int]) -> int:
+        """
+        Get the step at a coordinate along the bar, clamped to the bar.
+
+        :param pos: Coordinate to convert
+        :return: Step at the coordinate
+        """
+
+        fraction = (pos[0] - self.rect.left) / self.rect.w
+        return round(self.length * max(0.0, min(fraction, 1.0)))
+
+    def draw(self) -> None:
+        """
+        Draw the scrubber using the owner UI-object.
 
         :return: None
         """
 
-        self.name = self.origin_name
+        self.ui.draw_rect(self.color_body, self.rect)
+
+        fill_width = self.get_fill_width()
+        if fill_width:
+            self.ui.draw_rect(self.color_fill, pygame.Rect(self.rect.left, self.rect.top, fill_width, self.rect.h))
+
+        self.ui.draw_rect(self.color_border, self.rect, width=self.border_width)
 
-    def add_weight(self, weight) -> None:
+        text_surface = self.ui.font_render(self.text_font, self.text, True, self.color_text)
+        text_rect = self.ui.font_get_rect(text_surface, centerx=self.rect.centerx, top=self.rect.bottom + 10)
+        self.ui.blit(text_surface, text_rect)
+
+
+class DrawnAttribute:
+    """
+    Attribute of a node or weight that affects how it is drawn, like a property with a shared setter.
+    Setting it to a new value marks the item as changed with its owner UI-object, such that it is redrawn.
+    Every way of changing the item (setters, selection, solver) is covered, without scanning items every frame.
+    """
+
+    def __set_name__(self, owner: type, name: str) -> None:
         """
-        Add a weight to the nodes index of weights.
+        Store the name of the attribute, as assigned in the class body.
 
-        :param weight: Weight to add
+        :param owner: Class holding the attribute
+        :param name: Name of the attribute
         :return: None
         """
 
-        self.weights.append(weight)
+        self.name = name
+
+    def __get__(self, item, owner: type = None):
+        """
+        Get the value of the attribute, stored in the instance dict under the same name.
+
+        :param item: Node or weight (None when accessed on the class)
+        :param owner: Class of the item
+        :return: Value of the attribute
+        """
+
+        if item is None:
+            return self
+
+        return item.__dict__[self.name]
 
-    def remove_weight(self, weight) -> None:
+    def __set__(self, item, value) -> None:
         """
-        Remove a weight from the nodes index of weights.
+        Set the value of the attribute, marking the item as changed if the value differs.
 
-        :param weight: Weight to remove
+        :param item: Node or weight
+        :param value: New value
         :return: None
         """
 
-        if weight in self.weights:
-            self.weights.remove(weight)
+        # The drawn attributes are all set before the owner UI-object is
+        ui = item.__dict__.get("ui")
+
+        if ui is not None and item.__dict__[self.name] != value:
+            ui.mark_dirty(item)
+
+        item.__dict__[self.name] = value
+
+
+class Node(GraphNode):
+    """
+    UI-class for drawing a node (or a vertex) for use in graphing.
+    Extends the headless GraphNode with drawing and click-detection.
+
+    Attributes:
+        color_active_start: Color to draw a start-node when selected
+        color_active_end: Color to draw an end-node when selected
+        color_active: Color to draw a node when selected
+        color_boundary: Color to draw the node boundary
+        color_passive: Color to draw a node when not selected
+        color_start: Color to draw a start-node
+        color_end: Color to draw an end-node
+        color_text: Color to draw text
+        border_width: Width of node border (adjusted for 1080p)
+        radius: Radius of node (adjusted for 1080p)
+        text_size: Size reserved for the name when redrawing regions (adjusted for 1080p)
+        name, state, is_start, is_end: Attributes that affect how the node is drawn (see DrawnAttribute)
+    """
+
+    color_active_start = pygame.Color("lime")
+    color_active_end = pygame.Color("orange")
+    color_active = pygame.Color("yellow")
+    color_boundary = pygame.Color("black")
+    color_passive = pygame.Color("grey")
+    color_start = pygame.Color("limegreen")
+    color_end = pygame.Color("red")
+    color_text = pygame.Color("black")
+
+    border_width = 5
+    radius = 32
+    text_size = (128, 48)
+
+    name = DrawnAttribute()
+    state = DrawnAttribute()
+    is_start = DrawnAttribute()
+    is_end = DrawnAttribute()
+
+    def __init__(self, ui, pos: tuple[int, int], name: str):
+        """
+        Initialize an instance of the Node class.
+
+        :param ui: Pointer to the owner UI-object
+        :param pos: Coordinates to the node center
+        :param name: Name of the node
+        """
+
+        super().__init__(pos, name)
+
+        self.ui = ui
+
+        # Rect bounding the circle, kept independent of drawing since redrawn regions are clipped
+        self.rect = pygame.Rect(pos[0] - self.radius, pos[1] - self.radius, 2 * self.radius, 2 * self.radius)
+
+        self.text_font = self.ui.get_font(None, 32)
 
     def clicked(self, pos):
         """
@@ -395,6 +524,18 @@ class Node:
 
         return self.rect.collidepoint(pos)
 
+    def get_bounds(self) -> pygame.Rect:
+        """
+        Get the virtual rect the node can draw within, including room for its name.
+
+        :return: Virtual rect bounding the node
+        """
+
+        reach = self.radius + self.border_width
+        bounds = pygame.Rect(0, 0, max(2 * reach, self.text_size[0]), max(2 * reach, self.text_size[1]))
+        bounds.center = self.pos
+        return bounds
+
     def get_color(self) -> pygame.Color:
         """
         Get the appropriate color, given the nodes current state.
@@ -422,16 +563,17 @@ class Node:
         :return: None
         """
 
-        self.rect = self.ui.draw_circle(self.get_color(), self.pos, self.radius)
+        self.ui.draw_circle(self.get_color(), self.pos, self.radius)
         self.ui.draw_circle(self.color_boundary, self.pos, self.radius, self.border_width)
         text_surface = self.ui.font_render(self.text_font, self.name, True, self.color_text)
-        text_rect = self.ui.font_get_rect(text_surface, center=self.rect.center)
+        text_rect = self.ui.font_get_rect(text_surface, center=self.pos)
         self.ui.blit(text_surface, text_rect)
 
 
-class Weight:
+class Weight(GraphWeight):
     """
     UI-object to draw a weight (or an edge) for use in graphing.
+    Extends the headless GraphWeight with drawing and click-detection.
 
     Attributes:
         color_active: Color to draw when weight is selected
@@ -442,6 +584,8 @@ class Weight:
         width: Width of drawn line (adjusted for 1080p)
         offset: Text-offset from line (adjusted for 1080p)
         clip_size: Size to use for click-detection (read clicked docs)
+        text_size: Size reserved for the length when redrawing regions (adjusted for 1080p)
+        length, state, is_searched, is_searching: Attributes that affect how the weight is drawn (see DrawnAttribute)
     """
 
     color_active = pygame.Color("yellow")
@@ -454,6 +598,12 @@ class Weight:
     offset = 20
 
     clip_size = 30
+    text_size = (128, 48)
+
+    length = DrawnAttribute()
+    state = DrawnAttribute()
+    is_searched = DrawnAttribute()
+    is_searching = DrawnAttribute()
 
     def __init__(self, ui, start_node: Node, end_node: Node):
         """
@@ -464,20 +614,11 @@ class Weight:
         :param end_node: Destination node
         """
 
+        super().__init__(start_node, end_node)
+
         self.ui = ui
-        self.start_node = start_node
-        self.end_node = end_node
         self.rect = None
 
-        # Calculate a default length for the weight, based on distance
-        diff_x = abs(start_node.pos[0] - end_node.pos[0])
-        diff_y = abs(start_node.pos[1] - end_node.pos[1])
-        self.length = str(int((diff_x**2 + diff_y**2)**0.5) // 100)
-
-        self.state = False
-        self.is_searched = False
-        self.is_searching = False
-
         self.text_font = self.ui.get_font(None, 32)
 
     def clicked(self, pos: tuple[int, int]):
@@ -492,79 +633,62 @@ class Weight:
         # Draw a rect around the clicked area, check if the line (weight) clips it.
         click_rect = pygame.rect.Rect(pos[0] - self.clip_size / 2, pos[1] - self.clip_size / 2, self.clip_size, self.clip_size)
         return click_rect.clipline(self.start_node.pos, self.end_node.pos)
-    
-    def set_length(self, num: str) -> None:
-        """
-        Set the length of the weight.
 
-        :param num: Length to set the weight to
-        :return: None
-        """
-
-        # Filter non-numeric inputs to prevent errors
-        if num.isnumeric():
-            self.length = num
+    """
+    Calculate coordinates to use when drawing weight length. Simplifies to this piece of math:
+        v = dest - source
+        pos = c + cross(v) * (offset / |v|)
+    c is the center of the line.
+    """
 
-    def is_similar(self, node1: Node, node2: Node) -> bool:
+    def get_text_offset(self) -> tuple[float, float]:
         """
-        Check whether given nodes are equivalent to own nodes.
+        Get the offset of the length text from the center of the line.
 
-        :param node1: Node 1
-        :param node2: Node 2
-        :return: Whether self and given nodes are the same (ignore order)
+        :return: Virtual offset of the text
         """
 
-        if node1 == self.start_node and node2 == self.end_node:
-            return True
-
-        if node2 == self.start_node and node1 == self.end_node:
-            return True
-
-        return False
-
-    def set_searched(self) -> None:
-        """
-        Set weight to searched status (solver)
+        diff_x = self.end_node.pos[0] - self.start_node.pos[0]
+        diff_y = self.end_node.pos[1] - self.start_node.pos[1]
 
-        :return: None
-        """
+        diff_m = max(abs(diff_x), abs(diff_y))
 
-        self.is_searching = False
-        self.is_searched = True
+        return -diff_y / diff_m * self.offset, diff_x / diff_m * self.offset
 
-    def set_searching(self) -> None:
+    def get_bounds(self) -> pygame.Rect:
         """
-        Set weight to searching status (solver)
+        Get the virtual rect the weight can draw within, including room for its length.
 
-        :return: None
+        :return: Virtual rect bounding the weight
         """
 
-        self.is_searched = False
-        self.is_searching = True
+        start_x, start_y = self.start_node.pos
+        end_x, end_y = self.end_node.pos
 
-    def get_other_node(self, node: Node) -> Node:
-        """
-        Get opposing node from given node.
-        Useful when caller doesn't know, whether given node is source or dest.
+        bounds = pygame.Rect(min(start_x, end_x), min(start_y, end_y), abs(end_x - start_x), abs(end_y - start_y))
+        bounds.inflate_ip(self.width + 2, self.width + 2)
 
-        :param node: Node to use
-        :return: Opposite node to given node
-        """
+        offset_x, offset_y = self.get_text_offset()
+        text_bounds = pygame.Rect((0, 0), self.text_size)
+        text_bounds.center = ((start_x + end_x) / 2 + offset_x, (start_y + end_y) / 2 + offset_y)
 
-        if node is self.start_node:
-            return self.end_node
-        return self.start_node
+        return bounds.union(text_bounds)
 
-    def set_default(self) -> None:
+    def get_color(self) -> pygame.Color:
         """
-        Reset all states (solver)
+        Get the appropriate color, given the weights current state.
 
-        :return: None
+        :return: Appropriate color
         """
 
-        self.is_searched = False
-        self.is_searching = False
-        self.state = False
+        if self.state:
+            return self.color_active
+        elif self.is_searching:
+            return self.color_searching
+        elif self.is_searched:
+            return self.color_search
+        else:
+            return self.color_passive
 
     def draw(self) -> None:
         """
@@ -574,30 +698,13 @@ class Weight:
         """
 
         # Draw using correct color, checking all states
-        if self.state:
-            self.rect = self.ui.draw_line(self.color_active, self.start_node.pos, self.end_node.pos, self.width)
-        elif self.is_searching:
-            self.rect = self.ui.draw_line(self.color_searching, self.start_node.pos, self.end_node.pos, self.width)
-        elif self.is_searched:
-            self.rect = self.ui.draw_line(self.color_search, self.start_node.pos, self.end_node.pos, self.width)
-        else:
-            self.rect = self.ui.draw_line(self.color_passive, self.start_node.pos, self.end_node.pos, self.width)
-
-        """
-        Calculate coordinates to use when drawing weight length. Simplifies to this piece of math:
-            v = dest - source
-            pos = c + cross(v) * (offset / |v|)
-        c is the center of the line.
-        """
-
-        diff_x = self.end_node.pos[0] - self.start_node.pos[0]
-        diff_y = self.end_node.pos[1] - self.start_node.pos[1]
-
-        diff_m = max(abs(diff_x), abs(diff_y))
+        self.rect = self.ui.draw_line(self.get_color(), self.start_node.pos, self.end_node.pos, self.width)
 
-        offset_x = -diff_y / diff_m * self.offset
-        offset_y = diff_x / diff_m * self.offset
+        # Position text from the node coordinates, as the drawn rect is clipped when redrawing regions
+        center_x = (self.start_node.pos[0] + self.end_node.pos[0]) / 2
+        center_y = (self.start_node.pos[1] + self.end_node.pos[1]) / 2
+        offset_x, offset_y = self.get_text_offset()
 
         text_surface = self.ui.font_render(self.text_font, self.length, True, self.color_text)
-        text_rect = self.ui.font_get_rect(text_surface, centerx=self.rect.centerx + offset_x, centery=self.rect.centery + offset_y)
+        text_rect = self.ui.font_get_rect(text_surface, centerx=center_x + offset_x, centery=center_y + offset_y)
         self.ui.blit(text_surface, text_rect)
@@ -0,0 +1,124 @@
+import queue
+import threading
+from typing import Callable, Iterator
+from algo import Path
+
+"""
+Background worker running a solver while the UI keeps drawing frames.
+
+The worker consumes the stream of paths from a solver on its own thread, passing them to the timeline through a
+bounded queue. The timeline is never blocked by the search, even when seeking to the solution, as it only steps as
+far as the paths found so far. The search pauses while the queue is full, until the timeline has taken some of them,
+and paths are dropped by the worker once taken.
+
+Paths reference the node and weight UI-objects, which cannot be sent to other processes, so the worker is a thread.
+Cancelling only asks the search to stop between two paths, and returns right away. A solver may still be preprocessing
+after being cancelled, reading the nodes and weights, so the editor neither edits the graph nor starts another search
+until the thread has finished (see Editor.is_busy).
+"""
+
+
+class SolverWorker:
+    """
+    Runs the stream of a solver on a background thread, passing on the paths it explores.
+
+    Attributes:
+        max_queued: Most paths waiting to be taken, the search pauses while the queue is full
+        put_interval: Time (seconds) between checks for cancellation while waiting for room in the queue
+    """
+
+    max_queued = 4096
+    put_interval = 0.05
+
+    def __init__(self, stream: Callable[[], Iterator[Path]]):
+        """
+        Initialize an instance of the SolverWorker class, and start the search.
+
+        :param stream: Function starting the search and returning its stream of paths (e.g. Dijkstra.stream)
+        """
+
+        self.stream = stream
+
+        # Paths explored and not yet taken, only put by the worker thread
+        self.paths = queue.Queue(self.max_queued)
+
+        # Whether the search has ended, and the error it failed with, if any
+        self.done = False
+        self.error = None
+
+        self.cancelled = threading.Event()
+
+        self.thread = threading.Thread(target=self.work, daemon=True)
+        self.thread.start()
+
+    def work(self) -> None:
+        """
+        Consume the stream until exhausted or cancelled. Runs on the worker thread.
+
+        :return: None
+        """
+
+        stream = None
+
+        try:
+            stream = self.stream()
+
+            for path in stream:
+                if not self.put(path):
+                    break
+
+        except Exception as error:
+            self.error = error
+
+        finally:
+            if stream is not None:
+                stream.close()
+
+            self.done = True
+
+    def put(self, path: Path) -> bool:
+        """
+        Queue an explored path, waiting while the queue is full. Runs on the worker thread.
+
+        :param path: Explored path
+        :return: Whether the path was queued, False if the search was cancelled
+        """
+
+        while not self.cancelled.is_set():
+            try:
+                self.paths.put(path, timeout=self.put_interval)
+                return True
+            except queue.Full:
+                pass
+
+        return False
+
+    def take(self) -> Path | None:
+        """
+        Take the next explored path, without waiting.
+
+        :return: Next path, or None if no path is waiting
+        """
+
+        try:
+            return self.paths.get_nowait()
+        except queue.Empty:
+            return None
+
+    def get_queued(self) -> int:
+        """
+        Get the number of explored paths waiting to be taken.
+
+        :return: Number of paths
+        """
+
+        return self.paths.qsize()
+
+    def cancel(self) -> None:
+        """
+        Stop the search between two paths. Returns right away, while the worker thread finishes in the background.
+
+        :return: None
+        """
+
+        self.cancelled.set()